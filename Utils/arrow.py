@@ -2,9 +2,19 @@
 # Programmer: Connor Fricke (cd.fricke23@gmail.com)
 # Last Revision:
 #   17-MAR-2024 --> Created, v1
+#   18-OCT-2026 --> draw() returns the rect it touched, see Utils/scene.py
+#   18-OCT-2026 --> added ArrowField, many arrows computed and drawn at once
+#   18-OCT-2026 --> Arrow.draw() uses the same head proportions as ArrowField
 
+import numpy as np
 import pygame
 
+from Utils.renderer import drawSegments
+
+# where the arrowhead lines end, as fractions of the arrow's length along it and to either side (see Arrow.draw())
+HEAD_ALONG = 0.8
+HEAD_ACROSS = 0.2
+
 # ARROW : class object for drawing arrows between positions on the screen.
 class Arrow:
     
@@ -23,7 +33,7 @@ class Arrow:
         self.tip = tip
         self.tail = tail
     
-    def draw(self, surface: pygame.Surface, color: pygame.Color, thickness: int) -> None:
+    def draw(self, surface: pygame.Surface, color: pygame.Color, thickness: int) -> pygame.Rect:
         """
         Arrow.draw(surface, color, thickness):
         parameters:
@@ -36,17 +46,19 @@ class Arrow:
         the currently defined method of drawing the arrow places the tip of the left and right lines of the "arrowhead" at a location that is 98%
         along the length of the arrow from tail to tip and a distance from the body of the arrow defined as 2% of the length of the arrow from
         tail to tip. As long as the percentanges add up to 1 (e.g. 98% + 2%), the arrowhead will make 45 degree angles with the body of the arrow.
+        Returns the rect of the surface that was drawn on.
         """
         length = (self.tip - self.tail).magnitude()
         direction = (self.tip - self.tail) / length
         perpendicular = pygame.Vector2(direction.y, -direction.x)
         # angled tip
-        leftAngled = self.tail + (0.8 * length * direction) + (0.2 * length * perpendicular)
-        rightAngled = self.tail + (0.8 * length * direction) + (-0.2 * length * perpendicular)
+        leftAngled = self.tail + (HEAD_ALONG * length * direction) + (HEAD_ACROSS * length * perpendicular)
+        rightAngled = self.tail + (HEAD_ALONG * length * direction) + (-HEAD_ACROSS * length * perpendicular)
         points = [leftAngled, self.tip, rightAngled]
-        pygame.draw.lines(surface=surface, color=color, closed=False, points=points, width=thickness)
+        head = pygame.draw.lines(surface=surface, color=color, closed=False, points=points, width=thickness)
         # central body
-        pygame.draw.line(surface=surface, color=color, start_pos=self.tail, end_pos=self.tip, width=thickness)
+        body = pygame.draw.line(surface=surface, color=color, start_pos=self.tail, end_pos=self.tip, width=thickness)
+        return head.union(body)
 
     
     def update(self, tail: pygame.Vector2, tip: pygame.Vector2) -> None:
@@ -60,4 +72,81 @@ class Arrow:
         It mirrors the __init__ constructor.
         """
         self.tip = tip
-        self.tail = tail
\ No newline at end of file
+        self.tail = tail
+
+
+# ARROWFIELD : class object for drawing many arrows at once, such as a vector field sampled on a Grid lattice.
+class ArrowField:
+
+    def __init__(self, tails: np.ndarray, tips: np.ndarray):
+        """
+        ArrowField.__init__(tails, tips):
+        parameters:
+          tails: locations of the tails of the arrows, an array of shape (N, 2).
+          tips: locations of the tips of the arrows, an array of shape (N, 2).
+        *************
+        The batched counterpart to Arrow. The arrowheads of every arrow are computed together with NumPy and all
+        the lines are drawn in one call to drawSegments() (see renderer.py), instead of two pygame.draw calls and a
+        few Vector2 operations per arrow.
+        """
+        self.update(tails, tips)
+
+    def update(self, tails: np.ndarray, tips: np.ndarray) -> None:
+        """
+        ArrowField.update(tails, tips):
+        parameters:
+          tails: the new locations of the tails of the arrows.
+          tips: the new locations of the tips of the arrows.
+        *************
+        Mirrors the __init__ constructor. The number of arrows may change.
+        """
+        self.tails = np.asarray(tails, dtype=float).reshape(-1, 2)
+        self.tips = np.asarray(tips, dtype=float).reshape(-1, 2)
+
+    def setVectors(self, origins: np.ndarray, vectors: np.ndarray, scale: float = 1.0, maxLength: float = None) -> None:
+        """
+        ArrowField.setVectors(origins, vectors, scale, maxLength):
+        parameters:
+          origins: locations of the tails of the arrows, an array of shape (N, 2).
+          vectors: the vector each arrow shows, an array of shape (N, 2), such as a velocity or an acceleration.
+          scale: px of arrow per unit of vector.
+          maxLength: arrows longer than this many px are shortened to it, keeping their direction. None for no limit.
+        *************
+        Points each arrow along its vector, for drawing a field whose strength varies a lot (such as gravity near a star).
+        """
+        scaled = np.asarray(vectors, dtype=float).reshape(-1, 2) * scale
+        if maxLength is not None:
+            lengths = np.sqrt(np.einsum("ij,ij->i", scaled, scaled))
+            scaled *= (maxLength / np.maximum(lengths, maxLength))[:, np.newaxis]
+        origins = np.asarray(origins, dtype=float).reshape(-1, 2)
+        self.update(origins, origins + scaled)
+
+    def heads(self):
+        """
+        ArrowField.heads():
+        parameters: none
+        *************
+        Returns (left, right), arrays of shape (N, 2) with the outer ends of the two arrowhead lines of every arrow,
+        placed as Arrow.draw() places them. The perpendicular is the arrow rotated by 90 degrees, so it already has
+        the arrow's length and no square root is needed.
+        """
+        delta = self.tips - self.tails
+        perpendicular = np.stack((delta[:, 1], -delta[:, 0]), axis=1)
+        base = self.tails + HEAD_ALONG * delta
+        return base + HEAD_ACROSS * perpendicular, base - HEAD_ACROSS * perpendicular
+
+    def draw(self, surface: pygame.Surface, color: pygame.Color, thickness: int = 1):
+        """
+        ArrowField.draw(surface, color, thickness):
+        parameters:
+          surface: the surface of the PyGame for the arrows to be drawn on, usually the screen.
+          color: the color of every arrow.
+          thickness: the width, in pixels, of the lines of the arrows.
+        *************
+        Draws the body and both arrowhead lines of every arrow as one batch of segments.
+        Returns the rect of the surface that was drawn on, or None if there are no arrows.
+        """
+        left, right = self.heads()
+        starts = np.concatenate((self.tails, left, right))
+        ends = np.concatenate((self.tips, self.tips, self.tips))
+        return drawSegments(surface, starts, ends, color, thickness)
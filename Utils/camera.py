@@ -0,0 +1,150 @@
+# File: camera.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, pan/zoom viewport with culling and level of detail
+#   18-OCT-2026 --> added toWorldArray()
+#
+# Class file for Camera. The simulations work in world coordinates, which used to be drawn 1:1 onto the screen.
+# A Camera maps world coordinates to the screen with a pan and a zoom, skips bodies outside the window, and when
+# zoomed far out draws the bodies as density tiles instead of one dot each, so drawing costs what is visible on
+# screen rather than what exists in the simulation.
+
+import numpy as np
+import pygame
+
+from Utils.renderer import drawPoints, drawDensity, drawTiles
+
+
+# *** CLASS DEFINITION ***
+
+# CAMERA: a pannable, zoomable view of the world.
+class Camera:
+
+    def __init__(self, screenSize, center: pygame.Vector2, zoom: float = 1.0, minZoom: float = 0.05, maxZoom: float = 50.0,
+                 lodZoom: float = 0.5, tileSize: int = 3):
+        """
+        Camera.__init__(screenSize, center, zoom, minZoom, maxZoom, lodZoom, tileSize):
+        parameters:
+          screenSize: (width, height) of the surface drawn on, in px.
+          center: the point of the screen the view zooms around, usually the scripts' center vector. The camera starts
+                  looking at the same point of the world, so with zoom 1 the world is drawn exactly as without a camera.
+          zoom: screen px per world px.
+          minZoom, maxZoom: limits for zooming with the mouse wheel or keyboard.
+          lodZoom: below this zoom, drawBodies() collapses bodies into density tiles.
+          tileSize: width of a density tile, in screen px.
+        """
+        self.width, self.height = screenSize
+        self.anchor = pygame.Vector2(center)
+        self.focus = pygame.Vector2(center)
+        self.zoom = zoom
+        self.minZoom = minZoom
+        self.maxZoom = maxZoom
+        self.lodZoom = lodZoom
+        self.tileSize = tileSize
+        self._home = (pygame.Vector2(center), zoom)
+
+    # *** COORDINATES ***
+
+    def toScreen(self, point) -> pygame.Vector2:
+        """
+        Screen location of a world point.
+        """
+        return (pygame.Vector2(point) - self.focus) * self.zoom + self.anchor
+
+    def toWorld(self, point) -> pygame.Vector2:
+        """
+        World location of a screen point, e.g. the mouse.
+        """
+        return (pygame.Vector2(point) - self.anchor) / self.zoom + self.focus
+
+    def toScreenArray(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Screen locations of an array of world positions of shape (N, 2).
+        """
+        return (positions - np.asarray(self.focus)) * self.zoom + np.asarray(self.anchor)
+
+    def toWorldArray(self, points: np.ndarray) -> np.ndarray:
+        """
+        World locations of an array of screen points of shape (N, 2).
+        """
+        return (points - np.asarray(self.anchor)) / self.zoom + np.asarray(self.focus)
+
+    def visible(self, positions: np.ndarray, margin: float = 0.0) -> np.ndarray:
+        """
+        Boolean mask of the world positions that land on screen, allowing margin screen px around the edges.
+        The test is done in world coordinates, so only the visible bodies ever need transforming.
+        """
+        low = self.toWorld((-margin, -margin))
+        high = self.toWorld((self.width + margin, self.height + margin))
+        x, y = positions[:, 0], positions[:, 1]
+        return (x >= low.x) & (x < high.x) & (y >= low.y) & (y < high.y)
+
+    # *** MOVING THE VIEW ***
+
+    def pan(self, screenDelta) -> None:
+        """
+        Moves the view by the given number of screen px (the world appears to move the opposite way).
+        """
+        self.focus += pygame.Vector2(screenDelta) / self.zoom
+
+    def zoomAt(self, factor: float, screenPoint=None) -> None:
+        """
+        Multiplies the zoom by factor, keeping the world point under screenPoint (the anchor by default) in place.
+        """
+        screenPoint = self.anchor if screenPoint is None else pygame.Vector2(screenPoint)
+        fixed = self.toWorld(screenPoint)
+        self.zoom = min(max(self.zoom * factor, self.minZoom), self.maxZoom)
+        self.focus += fixed - self.toWorld(screenPoint)
+
+    def reset(self) -> None:
+        """
+        Returns to the starting view.
+        """
+        focus, self.zoom = self._home
+        self.focus = pygame.Vector2(focus)
+
+    def handleEvent(self, event: pygame.event.Event) -> None:
+        """
+        Camera.handleEvent(event):
+        parameters:
+          event: any event from pygame.event.get().
+        *************
+        Mouse wheel zooms around the cursor, dragging with the left button pans, the arrow keys pan, + and - zoom
+        and Home resets the view. Other events are ignored, so every event of the game loop can be passed in.
+        """
+        if event.type == pygame.MOUSEWHEEL:
+            self.zoomAt(1.1 ** event.y, pygame.mouse.get_pos())
+        elif event.type == pygame.MOUSEMOTION and event.buttons[0]:
+            self.pan(-pygame.Vector2(event.rel))
+        elif event.type == pygame.KEYDOWN:
+            step = 0.1 * min(self.width, self.height)
+            moves = {pygame.K_LEFT: (-step, 0), pygame.K_RIGHT: (step, 0), pygame.K_UP: (0, -step), pygame.K_DOWN: (0, step)}
+            if event.key in moves:
+                self.pan(moves[event.key])
+            elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                self.zoomAt(1.25)
+            elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self.zoomAt(0.8)
+            elif event.key == pygame.K_HOME:
+                self.reset()
+
+    # *** DRAWING ***
+
+    def drawBodies(self, surface: pygame.Surface, positions: np.ndarray, color: pygame.Color, radius: float,
+                   density: bool = False) -> None:
+        """
+        Camera.drawBodies(surface, positions, color, radius, density):
+        parameters: as for ParticleSystem.draw(), with positions and radius in world px.
+        *************
+        Draws only the bodies inside the view. Below lodZoom the visible bodies are binned into tileSize x tileSize
+        density tiles (see drawTiles() in Utils/renderer.py). Otherwise they are drawn as circles scaled by the zoom,
+        with the radius rounded to half a pixel so only a few sprite sizes are ever rendered.
+        """
+        screenRadius = radius * self.zoom
+        onScreen = self.toScreenArray(positions[self.visible(positions, margin=screenRadius + 1)])
+        if self.zoom < self.lodZoom:
+            drawTiles(surface, onScreen, color, self.tileSize)
+        elif density:
+            drawDensity(surface, onScreen, color)
+        else:
+            drawPoints(surface, onScreen, color, radius if self.zoom == 1 else max(round(2 * screenRadius) / 2, 0.5))
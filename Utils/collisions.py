@@ -0,0 +1,177 @@
+# File: collisions.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, spatial hash collision detection and inelastic merging
+#   18-OCT-2026 --> neighbour search narrowed to two contiguous runs of the sorted keys
+#
+# Collisions between the bodies of a ParticleSystem without checking every pair. Bodies are binned into a
+# uniform grid of square cells at least one body diameter wide, so overlapping bodies are always in the same
+# or adjacent cells. The bodies are kept sorted by cell; since bodies move less than a cell per step, the order
+# from the previous step is already almost sorted and re-sorting it is close to linear.
+
+import numpy as np
+
+from Utils.particles import ParticleSystem
+
+# cell coordinates are packed into one int64 key: (x + _OFFSET) * _STRIDE + (y + _OFFSET), so cells
+# (x, y) and (x, y + 1) have consecutive keys, as do (x + 1, y - 1), (x + 1, y) and (x + 1, y + 1)
+_OFFSET = 1 << 20
+_STRIDE = 1 << 21
+
+
+# *** CLASS DEFINITIONS ***
+
+# SPATIALHASH: uniform grid of cells with the bodies sorted by cell.
+class SpatialHash:
+
+    def __init__(self, cellSize: float):
+        """
+        SpatialHash.__init__(cellSize):
+        parameters:
+          cellSize: width of a cell in px. Must be at least the largest sum of two radii, pairs() widens it if needed.
+        """
+        self.cellSize = cellSize
+        self._order = None
+
+    def _keys(self, positions: np.ndarray) -> np.ndarray:
+        cells = np.floor(positions / self.cellSize).astype(np.int64)
+        # bodies far outside the grid share its edge cells, which only costs a few extra distance checks
+        np.clip(cells, 1 - _OFFSET, _OFFSET - 2, out=cells)
+        return (cells[:, 0] + _OFFSET) * _STRIDE + (cells[:, 1] + _OFFSET)
+
+    def _sort(self, keys: np.ndarray) -> np.ndarray:
+        if self._order is None or len(self._order) != len(keys):
+            self._order = np.argsort(keys, kind="stable")
+        else:
+            # last step's order is nearly sorted, which the stable sort (timsort) handles in close to linear time
+            self._order = self._order[np.argsort(keys[self._order], kind="stable")]
+        return self._order
+
+    def remove(self, keep: np.ndarray) -> None:
+        """
+        Follows ParticleSystem.removeBodies(keep), so the sorted order survives bodies being removed.
+        """
+        if self._order is None:
+            return
+        newIndex = np.cumsum(keep) - 1
+        self._order = newIndex[self._order[keep[self._order]]]
+
+    def pairs(self, positions: np.ndarray, radii: np.ndarray):
+        """
+        SpatialHash.pairs(positions, radii):
+        parameters:
+          positions: array of shape (N, 2), in px.
+          radii: array of shape (N,), in px.
+        *************
+        Returns (i, j), two index arrays listing every pair of overlapping bodies once, with i < j.
+        """
+        count = len(positions)
+        if count < 2:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        diameter = 2.0 * float(radii.max())
+        if diameter > self.cellSize:
+            self.cellSize = diameter
+            self._order = None
+        keys = self._keys(positions)
+        order = self._sort(keys)
+        sortedKeys = keys[order]
+
+        # each body is checked against half of its 3x3 neighbourhood, so every pair comes up once: the bodies after
+        # it in its own cell and in cell (x, y + 1), which follow it directly in sorted order...
+        first, second = _expand(np.arange(1, count + 1), np.searchsorted(sortedKeys, sortedKeys + 1, side="right"))
+        # ...and the bodies of cells (x + 1, y - 1) to (x + 1, y + 1), which are one more contiguous run
+        nextFirst, nextSecond = _expand(np.searchsorted(sortedKeys, sortedKeys + (_STRIDE - 1), side="left"),
+                                        np.searchsorted(sortedKeys, sortedKeys + (_STRIDE + 1), side="right"))
+        i = order[np.concatenate((first, nextFirst))]
+        j = order[np.concatenate((second, nextSecond))]
+
+        separation = positions[i] - positions[j]
+        reach = radii[i] + radii[j]
+        overlapping = np.einsum("ij,ij->i", separation, separation) < reach * reach
+        i, j = i[overlapping], j[overlapping]
+        return np.minimum(i, j), np.maximum(i, j)
+
+
+def _expand(starts: np.ndarray, stops: np.ndarray):
+    # every pair (p, q) with starts[p] <= q < stops[p], as two flat arrays
+    lengths = np.maximum(stops - starts, 0)
+    total = int(lengths.sum())
+    first = np.repeat(np.arange(len(starts)), lengths)
+    offsets = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return first, np.repeat(starts, lengths) + offsets
+
+
+def _groups(count: int, i: np.ndarray, j: np.ndarray) -> np.ndarray:
+    # label every body with the smallest index of the bodies it is (transitively) touching
+    labels = np.arange(count)
+    while True:
+        updated = labels.copy()
+        np.minimum.at(updated, i, labels[j])
+        np.minimum.at(updated, j, labels[i])
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            return labels
+        labels = updated
+
+
+# COLLISIONS: merges touching bodies of a ParticleSystem and removes those that hit a central body.
+class Collisions:
+
+    def __init__(self, system: ParticleSystem, center, centralRadius: float):
+        """
+        Collisions.__init__(system, center, centralRadius):
+        parameters:
+          system: the ParticleSystem whose bodies collide. Bodies need radii, see ParticleSystem.addBodies().
+          center: location of the central body (e.g. the star), in px.
+          centralRadius: radius of the central body, in px.
+        *************
+        merges and absorbed count the bodies lost to mergers and to the central body since creation.
+        """
+        self.system = system
+        self.center = np.asarray(center, dtype=float)
+        self.centralRadius = centralRadius
+        radii = system.radii
+        self.hash = SpatialHash(2.0 * float(radii.max()) if len(radii) and radii.max() > 0 else 1.0)
+        self.merges = 0
+        self.absorbed = 0
+
+    def resolve(self) -> np.ndarray:
+        """
+        Collisions.resolve():
+        *************
+        Merges every group of overlapping bodies into one body at the group's center of mass, with the group's total
+        mass and momentum and the radius of a sphere of the total volume. Then removes every body touching the
+        central body. Returns the indices (after removal) of the merged bodies, whose accelerations are now stale.
+        """
+        system = self.system
+        count = system.count
+        i, j = self.hash.pairs(system.positions, system.radii)
+        keep = np.ones(count, dtype=bool)
+        merged = np.zeros(0, dtype=np.int64)
+
+        if len(i):
+            labels = _groups(count, i, j)
+            merged = np.unique(labels[i])
+            masses = system.masses
+            totalMass = np.bincount(labels, masses, count)[merged]
+            for array in (system.positions, system.velocities):
+                # mass-weighted mean of every group: center of mass, and momentum / mass
+                for axis in (0, 1):
+                    array[merged, axis] = np.bincount(labels, masses * array[:, axis], count)[merged] / totalMass
+            system.radii[merged] = np.cbrt(np.bincount(labels, system.radii ** 3, count)[merged])
+            system.masses[merged] = totalMass
+            keep = labels == np.arange(count)
+            self.merges += count - int(np.count_nonzero(keep))
+
+        offset = system.positions - self.center
+        reach = system.radii + self.centralRadius
+        inside = np.einsum("ij,ij->i", offset, offset) < reach * reach
+        self.absorbed += int(np.count_nonzero(inside & keep))
+        keep &= ~inside
+
+        if not keep.all():
+            merged = merged[keep[merged]]
+            merged = np.cumsum(keep)[merged] - 1
+            system.removeBodies(keep)
+            self.hash.remove(keep)
+        return merged
@@ -1,13 +1,20 @@
 # File: colors.py
 # Programmer: Connor Fricke (cd.fricke23@gmail.com)
 # Latest Revision: 5-MAR-2024 --> Created
+#                  18-OCT-2026 --> 256-entry palettes (lookup tables) built from the color functions
 #
 # Simple color functions for use in associating a pygame.Color
 # value with a floating point value. Useful for various color
 # associations and gradients.
 
+import numpy as np
 import pygame
 
+# number of entries in a palette
+PALETTE_SIZE = 256
+# palettes already built, keyed by color function
+_palettes = {}
+
 # ***** EXAMPLE COLOR FUNCTIONS *****
 # black -> purple
 def colorFunction1(x: float) -> pygame.Color:
@@ -39,4 +46,31 @@ def colorFunction4(x: float) -> pygame.Color:
     r = 255 - int(float(x) * 255)
     g = int(float(x) * 255)
     b = 0
-    return pygame.Color(r, g, b)
\ No newline at end of file
+    return pygame.Color(r, g, b)
+
+# ***** PALETTES *****
+def makePalette(colorFunc) -> np.ndarray:
+    """
+    Evaluates a color function once for each of PALETTE_SIZE evenly spaced values between 0 and 1 and returns
+    the results as an array of shape (PALETTE_SIZE, 3) of r,g,b values. Entry i holds the color of the middle of the
+    bin [i / PALETTE_SIZE, (i+1) / PALETTE_SIZE), so looking values up is accurate to one part in PALETTE_SIZE.
+    """
+    palette = np.zeros((PALETTE_SIZE, 3), dtype=np.uint8)
+    for i in range(PALETTE_SIZE):
+        color = pygame.Color(colorFunc((i + 0.5) / PALETTE_SIZE))
+        palette[i] = (color.r, color.g, color.b)
+    return palette
+
+def getPalette(colorFunc) -> np.ndarray:
+    """
+    Returns the palette of a color function, building it the first time it is asked for.
+    """
+    if colorFunc not in _palettes:
+        _palettes[colorFunc] = makePalette(colorFunc)
+    return _palettes[colorFunc]
+
+def paletteIndices(values: np.ndarray) -> np.ndarray:
+    """
+    Converts an array of floats between 0 and 1 to palette indices.
+    """
+    return np.clip((np.asarray(values) * PALETTE_SIZE).astype(np.intp), 0, PALETTE_SIZE - 1)
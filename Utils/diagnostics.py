@@ -0,0 +1,268 @@
+# File: diagnostics.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, vectorized conservation diagnostics and a drift monitor
+#   18-OCT-2026 --> drift kept per segment between changes in the number of bodies, n/a when never compared
+#
+# Energy and angular momentum of bodies around a fixed central body are conserved by the true motion, so how far
+# they drift from their starting values measures the error of the integrator and timestep. measure() computes the
+# total kinetic and potential energy, the angular momentum, the center of mass and every body's semi-major axis
+# and eccentricity from the same arrays of separations and speeds, in one pass over all bodies.
+# ConservationMonitor takes such a sample every so many steps (so the cost stays off the hot path) and raises an
+# alert when a drift passes a threshold, and largestSafeTimestep() uses the same measure to pick the largest step
+# that keeps the drift below it.
+#
+# Units are the simulations' screen units: px, px/s and kg, with mu the gravitational parameter of the central body
+# (see gravitationalParameter() in Utils/distributions.py). Energies are then in kg px^2/s^2. The simulations are
+# planar, so the angular momentum vector points along z and is given by its z component alone: positive for
+# counter-clockwise motion in array coordinates, as in Utils/kepler.py.
+
+import math
+
+import numpy as np
+
+
+def pairPotentialEnergy(positions: np.ndarray, masses: np.ndarray, grav: float, scale: float, softening: float = 0.0,
+                        chunkSize: int = 1024) -> float:
+    """
+    pairPotentialEnergy(positions, masses, grav, scale, softening, chunkSize):
+    parameters:
+      positions, masses: arrays of shape (N, 2) and (N,), in px and kg.
+      grav: the gravitational constant.
+      scale: the number of meters per px.
+      softening: length in px added in quadrature to every separation, as for the accelerations.
+      chunkSize: number of bodies handled per block, which bounds the temporary memory to chunkSize*N.
+    *************
+    Returns the potential energy of every pair of bodies, -sum over i < j of G m_i m_j / d_ij, by direct summation.
+    This is the potential of pairwiseAccelerations() in Utils/gravity.py and costs O(N^2).
+    """
+    positions = np.asarray(positions, dtype=float)
+    masses = np.asarray(masses, dtype=float)
+    gm = grav * masses / (scale * scale)
+    energy = 0.0
+    for start in range(0, len(positions), chunkSize):
+        stop = min(start + chunkSize, len(positions))
+        r = positions[start:stop, np.newaxis, :] - positions[np.newaxis, :, :]
+        distance = np.sqrt(np.einsum("ijk,ijk->ij", r, r) + softening * softening)
+        # each pair once: only the sources after each target, which also leaves out a body and itself
+        later = np.arange(len(positions))[np.newaxis, :] > np.arange(start, stop)[:, np.newaxis]
+        inverse = np.divide(1.0, distance, out=np.zeros_like(distance), where=later)
+        energy -= float(masses[start:stop] @ inverse @ gm)
+    return energy
+
+
+# *** CLASS DEFINITIONS ***
+
+# DIAGNOSTICSAMPLE: the conserved quantities of a set of bodies at one time.
+class DiagnosticSample:
+
+    def __init__(self, time: float, count: int, kinetic: float, potential: float, angularMomentum: float,
+                 centerOfMass: np.ndarray, semiMajorAxes: np.ndarray, eccentricities: np.ndarray):
+        """
+        DiagnosticSample.__init__(time, count, kinetic, potential, angularMomentum, centerOfMass, semiMajorAxes,
+                                  eccentricities):
+        parameters:
+          time: simulated time of the sample, in s.
+          count: the number of bodies.
+          kinetic, potential: total kinetic and potential energy, in kg px^2/s^2.
+          angularMomentum: z component of the total angular momentum about the central body, in kg px^2/s.
+          centerOfMass: location of the center of mass of the bodies, in px.
+          semiMajorAxes, eccentricities: arrays of shape (N,) of every body's orbit around the central body.
+                                         Unbound bodies have negative semi-major axes and eccentricities >= 1.
+        *************
+        Made by measure().
+        """
+        self.time = time
+        self.count = count
+        self.kinetic = kinetic
+        self.potential = potential
+        self.angularMomentum = angularMomentum
+        self.centerOfMass = centerOfMass
+        self.semiMajorAxes = semiMajorAxes
+        self.eccentricities = eccentricities
+
+    @property
+    def energy(self) -> float:
+        """Total energy, kinetic plus potential."""
+        return self.kinetic + self.potential
+
+
+def measure(positions, velocities, masses, center, mu: float, time: float = 0.0, pairPotential: float = 0.0) -> DiagnosticSample:
+    """
+    measure(positions, velocities, masses, center, mu, time, pairPotential):
+    parameters:
+      positions, velocities: arrays of shape (N, 2), in px and px/s. Any float precision, sums are taken in float64.
+      masses: array of shape (N,) or a single mass for every body, in kg.
+      center: location of the central body, in px. It is taken to be fixed.
+      mu: gravitational parameter of the central body.
+      time: simulated time of the state, stored in the sample.
+      pairPotential: potential energy between the bodies themselves, added to the potential, e.g. from
+                     pairPotentialEnergy() for self-gravitating systems.
+    *************
+    Returns the DiagnosticSample of the bodies. Separations, distances, speeds and the angular momentum of each body
+    are computed once and every quantity is derived from them.
+    """
+    positions = np.asarray(positions, dtype=float)
+    velocities = np.asarray(velocities, dtype=float)
+    masses = np.broadcast_to(np.asarray(masses, dtype=float), (len(positions),))
+    r = positions - np.asarray(center, dtype=float)
+    distance = np.hypot(r[:, 0], r[:, 1])
+    speedSquared = np.einsum("ij,ij->i", velocities, velocities)
+    # z component of r x v: twice the rate at which each body sweeps out area
+    areal = r[:, 0] * velocities[:, 1] - r[:, 1] * velocities[:, 0]
+
+    # specific orbital energy and angular momentum give each orbit's size and shape
+    specificEnergy = 0.5 * speedSquared - mu / distance
+    with np.errstate(divide="ignore"):
+        semiMajorAxes = -mu / (2 * specificEnergy)
+    eccentricities = np.sqrt(np.maximum(1 + 2 * specificEnergy * areal * areal / (mu * mu), 0.0))
+
+    totalMass = masses.sum()
+    return DiagnosticSample(
+        time=time, count=len(positions),
+        kinetic=0.5 * float(masses @ speedSquared),
+        potential=-mu * float(masses @ (1.0 / distance)) + pairPotential,
+        angularMomentum=float(masses @ areal),
+        centerOfMass=masses @ positions / totalMass if totalMass > 0 else np.full(2, np.nan),
+        semiMajorAxes=semiMajorAxes, eccentricities=eccentricities)
+
+
+def relativeDrift(value: float, reference: float) -> float:
+    """
+    How far value has moved from reference, as a fraction of reference (absolute when reference is 0).
+    """
+    return abs(value - reference) / abs(reference) if reference != 0 else abs(value - reference)
+
+
+def formatDrift(drift: float) -> str:
+    """A drift for printing, "n/a" for None (nothing was compared)."""
+    return "n/a" if drift is None else "{:.3g}".format(drift)
+
+
+# DRIFTALERT: a conserved quantity that drifted past the threshold.
+class DriftAlert:
+
+    def __init__(self, time: float, quantity: str, drift: float, threshold: float):
+        self.time = time
+        self.quantity = quantity
+        self.drift = drift
+        self.threshold = threshold
+
+    def __str__(self) -> str:
+        return "t = {:.6g} s: {} drifted by {:.3g} (threshold {:.3g})".format(self.time, self.quantity, self.drift, self.threshold)
+
+
+# CONSERVATIONMONITOR: samples a simulation's diagnostics every few steps and watches the drift.
+class ConservationMonitor:
+
+    def __init__(self, interval: int = 100, threshold: float = 1e-3, onAlert=None):
+        """
+        ConservationMonitor.__init__(interval, threshold, onAlert):
+        parameters:
+          interval: steps between samples. Sampling costs about as much as one star-only step of a belt (and a
+                    pair sum for self-gravitating ones), so a large interval keeps it off the hot path.
+          threshold: relative drift of the energy or angular momentum from the first sample at which to alert.
+          onAlert: if given, called with every DriftAlert as it is raised, e.g. print.
+        *************
+        Call sample() once before the run to take the reference, then pass the monitor as onStep to runHeadless()
+        or SimulationPipeline, or call it after every step. It works with anything that has a diagnostics() method
+        returning a DiagnosticSample, such as OrbitSimulation and BeltSimulation. Each quantity alerts once, when
+        it first passes the threshold; all alerts are kept in alerts.
+        When the number of bodies changes (collisions), the energy and angular momentum jump, so that sample starts
+        a new segment with itself as the reference and the change is recorded in rebaselines as (time, count
+        before, count after). maxDrift holds the largest drift of each quantity within any segment, or None while
+        no two samples of the same segment have been compared.
+        """
+        self.interval = interval
+        self.threshold = threshold
+        self.onAlert = onAlert
+        self.reference = None
+        self.latest = None
+        self.alerts = []
+        self.rebaselines = []
+        self.maxDrift = {"energy": None, "angular momentum": None}
+        self._steps = 0
+
+    def __call__(self, simulation) -> None:
+        self._steps += 1
+        if self.reference is None or self._steps >= self.interval:
+            self.sample(simulation)
+
+    def sample(self, simulation) -> DiagnosticSample:
+        """
+        Takes a sample now, checks its drift against the reference, and returns it. A second sample at the same
+        simulated time (e.g. a final sample right after the interval's) is not compared again.
+        """
+        self._steps = 0
+        latest = simulation.diagnostics()
+        if self.latest is not None and latest.time == self.latest.time:
+            return self.latest
+        self.latest = latest
+        if self.reference is None or self.reference.count != self.latest.count:
+            if self.reference is not None:
+                self.rebaselines.append((self.latest.time, self.reference.count, self.latest.count))
+            self.reference = self.latest
+            return self.latest
+        for quantity, value, reference in (("energy", self.latest.energy, self.reference.energy),
+                                           ("angular momentum", self.latest.angularMomentum, self.reference.angularMomentum)):
+            drift = relativeDrift(value, reference)
+            previous = self.maxDrift[quantity]
+            if drift > self.threshold and (previous is None or previous <= self.threshold):
+                alert = DriftAlert(self.latest.time, quantity, drift, self.threshold)
+                self.alerts.append(alert)
+                if self.onAlert is not None:
+                    self.onAlert(alert)
+            self.maxDrift[quantity] = drift if previous is None else max(previous, drift)
+        return self.latest
+
+    @property
+    def drift(self) -> float:
+        """The largest relative drift of either quantity so far, or None if nothing has been compared."""
+        drifts = [drift for drift in self.maxDrift.values() if drift is not None]
+        return max(drifts) if drifts else None
+
+    def summary(self) -> str:
+        """The largest drifts for printing, with the number of segments they were measured over."""
+        text = "Energy drift: {}, angular momentum drift: {}".format(
+            formatDrift(self.maxDrift["energy"]), formatDrift(self.maxDrift["angular momentum"]))
+        if self.rebaselines:
+            changes = len(self.rebaselines)
+            text += " (reference reset {} time{} as the number of bodies changed)".format(changes, "" if changes == 1 else "s")
+        return text
+
+
+def largestSafeTimestep(createSimulation, deltaTimes, duration: float, threshold: float = 1e-3, samples: int = 20):
+    """
+    largestSafeTimestep(createSimulation, deltaTimes, duration, threshold, samples):
+    parameters:
+      createSimulation: function of no arguments returning a fresh simulation with a diagnostics() method.
+      deltaTimes: the candidate timesteps.
+      duration: simulated time to run each candidate for, in s. Drift grows with time, so use about as long as
+                the runs the timestep is for.
+      threshold: the largest acceptable relative drift of the energy and angular momentum.
+      samples: how many times the drift is checked during each run.
+    *************
+    Tries the candidates from largest to smallest and returns (deltaTime, drift) of the first whose drift stays
+    below threshold for the whole duration, or (None, drift of the smallest) if none does. A run stops as soon as it
+    passes the threshold, so rejecting a large step is cheap. A run whose drift could not be measured (the number of
+    bodies changed between every pair of samples) is not safe, and its drift is None.
+    """
+    drift = None
+    for deltaTime in sorted(deltaTimes, reverse=True):
+        steps = max(1, math.ceil(duration / deltaTime))
+        monitor = ConservationMonitor(interval=max(1, steps // samples), threshold=threshold)
+        simulation = createSimulation()
+        monitor.sample(simulation)
+        for _ in range(steps):
+            simulation.step(deltaTime)
+            monitor(simulation)
+            if monitor.alerts:
+                break
+        else:
+            monitor.sample(simulation)
+        if hasattr(simulation, "close"):
+            simulation.close()
+        drift = monitor.drift
+        if drift is not None and drift <= threshold:
+            return deltaTime, drift
+    return None, drift
@@ -0,0 +1,152 @@
+# File: distributions.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, seeded vectorized initial conditions for the asteroid belt
+#   18-OCT-2026 --> Kepler's equation solved with Utils/kepler.py
+#
+# Random belt populations around a central body, generated as whole arrays instead of one asteroid at a time.
+# Every function takes a numpy.random.Generator (or a seed for one) and returns (positions, velocities), arrays
+# of shape (N, 2) in px and px/s that can be handed straight to ParticleSystem.addBodies() or BeltSimulation.
+# The same seed always gives the same samples.
+#
+# Orbits are counter-clockwise in array coordinates. mu is the gravitational parameter of the central body in
+# screen units, see gravitationalParameter(), so that circular speeds match centralAccelerations().
+
+import numpy as np
+
+from Utils.kepler import OrbitalElements, elementsToState
+
+
+def gravitationalParameter(mass: float, grav: float, scale: float) -> float:
+    """
+    Returns G M in px^3/s^2 for a central body of the given mass, with scale meters per px.
+    This is the mu for which centralAccelerations() gives |a| = mu / r^2 with r in px.
+    """
+    return grav * mass / (scale * scale)
+
+
+def circularSpeed(radius, mu: float):
+    """
+    Speed of a circular orbit at the given radius (float or array, in px), in px/s.
+    """
+    return np.sqrt(mu / np.asarray(radius, dtype=float))
+
+
+def _generator(rng) -> np.random.Generator:
+    # accept a Generator, a seed or None, the same way numpy.random.default_rng does
+    return rng if isinstance(rng, np.random.Generator) else np.random.default_rng(rng)
+
+
+def _fromPolar(center, radius: np.ndarray, angle: np.ndarray, speed: np.ndarray):
+    # positions on circles around center with tangential velocities of the given speed
+    cosine, sine = np.cos(angle), np.sin(angle)
+    positions = np.empty((len(radius), 2))
+    positions[:, 0] = center[0] + radius * cosine
+    positions[:, 1] = center[1] + radius * sine
+    velocities = np.empty((len(radius), 2))
+    velocities[:, 0] = -speed * sine
+    velocities[:, 1] = speed * cosine
+    return positions, velocities
+
+
+def gaussianRing(rng, count: int, center, radius: float, sigma: float, mu: float = None, speed: float = None,
+                 speedSigma: float = 0.0):
+    """
+    gaussianRing(rng, count, center, radius, sigma, mu, speed, speedSigma):
+    parameters:
+      rng: a numpy.random.Generator or a seed.
+      count: the number of asteroids.
+      center: location of the central body, in px.
+      radius, sigma: mean and standard deviation of the distance from center, in px.
+      mu: gravitational parameter of the central body, used for circular speeds when speed is None.
+      speed: mean orbital speed in px/s, the same at every radius. None for the circular speed at each radius.
+      speedSigma: standard deviation of the speed, in px/s.
+    *************
+    Asteroids spread uniformly in angle around a ring, moving tangentially. This is the original belt of
+    asteroid_belt.py.
+    """
+    rng = _generator(rng)
+    angle = rng.uniform(0, 2*np.pi, count)
+    radii = rng.normal(radius, sigma, count)
+    speeds = circularSpeed(radii, mu) if speed is None else np.full(count, float(speed))
+    if speedSigma:
+        speeds += rng.normal(0.0, speedSigma, count)
+    return _fromPolar(center, radii, angle, speeds)
+
+
+def powerLawDisk(rng, count: int, center, innerRadius: float, outerRadius: float, index: float, mu: float):
+    """
+    powerLawDisk(rng, count, center, innerRadius, outerRadius, index, mu):
+    parameters:
+      rng: a numpy.random.Generator or a seed.
+      count: the number of asteroids.
+      center: location of the central body, in px.
+      innerRadius, outerRadius: edges of the disk, in px.
+      index: the surface density falls off as r^-index (0 is a uniform disk).
+      mu: gravitational parameter of the central body.
+    *************
+    Asteroids on circular orbits filling a flat disk. Radii are drawn by inverting the cumulative distribution
+    of r^(1 - index) between the two edges.
+    """
+    rng = _generator(rng)
+    angle = rng.uniform(0, 2*np.pi, count)
+    u = rng.uniform(0, 1, count)
+    power = 2.0 - index
+    if abs(power) < 1e-12:
+        # density r^-2 has equal mass in every octave: sample log(r) uniformly
+        radii = innerRadius * (outerRadius / innerRadius) ** u
+    else:
+        inner, outer = innerRadius ** power, outerRadius ** power
+        radii = (inner + u * (outer - inner)) ** (1.0 / power)
+    return _fromPolar(center, radii, angle, circularSpeed(radii, mu))
+
+
+def keplerianBelt(rng, count: int, center, mu: float, semiMajorAxis: float, semiMajorSigma: float = 0.0,
+                  eccentricity: float = 0.0, eccentricitySigma: float = 0.0):
+    """
+    keplerianBelt(rng, count, center, mu, semiMajorAxis, semiMajorSigma, eccentricity, eccentricitySigma):
+    parameters:
+      rng: a numpy.random.Generator or a seed.
+      count: the number of asteroids.
+      center: location of the central body, in px.
+      mu: gravitational parameter of the central body.
+      semiMajorAxis, semiMajorSigma: mean and standard deviation of the semi-major axes, in px.
+      eccentricity, eccentricitySigma: mean and standard deviation of the eccentricities, clipped to [0, 0.99].
+    *************
+    Asteroids on eccentric Keplerian orbits with random orientations (argument of periapsis) and random positions
+    along their orbits (mean anomaly), so the belt is already in its steady state when the simulation starts.
+    """
+    rng = _generator(rng)
+    a = rng.normal(semiMajorAxis, semiMajorSigma, count)
+    e = np.clip(rng.normal(eccentricity, eccentricitySigma, count), 0.0, 0.99)
+    periapsisAngle = rng.uniform(0, 2*np.pi, count)
+    meanAnomaly = rng.uniform(0, 2*np.pi, count)
+
+    elements = OrbitalElements(a, e, periapsisAngle, meanAnomaly, np.ones(count), mu)
+    positions, velocities, _ = elementsToState(elements, center)
+    return positions, velocities
+
+
+def multipleRings(rng, count: int, center, radii, sigmas, weights, mu: float):
+    """
+    multipleRings(rng, count, center, radii, sigmas, weights, mu):
+    parameters:
+      rng: a numpy.random.Generator or a seed.
+      count: the total number of asteroids.
+      center: location of the central body, in px.
+      radii, sigmas: mean radius and radial spread of each ring, in px.
+      weights: relative number of asteroids in each ring.
+      mu: gravitational parameter of the central body.
+    *************
+    Several gaussianRing()s of circular orbits, with the asteroids shared out between them at random in
+    proportion to weights. Asteroids of the first ring come first in the returned arrays.
+    """
+    rng = _generator(rng)
+    weights = np.asarray(weights, dtype=float)
+    counts = rng.multinomial(count, weights / weights.sum())
+    positions, velocities = [], []
+    for ringCount, radius, sigma in zip(counts, radii, sigmas):
+        ringPositions, ringVelocities = gaussianRing(rng, ringCount, center, radius, sigma, mu)
+        positions.append(ringPositions)
+        velocities.append(ringVelocities)
+    return np.concatenate(positions), np.concatenate(velocities)
@@ -0,0 +1,97 @@
+# File: gravity.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, vectorized central-body gravity for particle arrays
+#   18-OCT-2026 --> getForceBetween moved here from asteroid_belt.py, added exact pairwise sums
+#   18-OCT-2026 --> added CentralField for use with the integrators
+#
+# Gravity laws shared by the orbital simulations. Functions here operate on NumPy arrays
+# of positions (shape (N, 2), measured in px) so that a whole population of bodies is
+# handled in one call instead of one Python call per body.
+
+import numpy as np
+
+from Utils.satellite import Satellite
+
+
+def getForceBetween(satellite1: Satellite, satellite2: Satellite, grav: float, scale: float):
+    """
+    Given two satellite objects, getForceBetween() returns a vector describing the
+    force vector ON the first parameter FROM the second parameter.
+    This is the exact pair law that every vectorized function in this file reproduces.
+    """
+    r = satellite1.position - satellite2.position
+    rHat = r / r.magnitude()
+    return -((grav * satellite1.MASS * satellite2.MASS) / (scale*r.magnitude() * scale*r.magnitude())) * rHat
+
+
+def centralAccelerations(positions: np.ndarray, center, mass: float, grav: float, scale: float) -> np.ndarray:
+    """
+    centralAccelerations(positions, center, mass, grav, scale):
+    parameters:
+      positions: array of shape (N, 2) holding the location of each body, in px.
+      center: location of the central body, in px. Any length-2 sequence (pygame.Vector2, tuple, array).
+      mass: mass of the central body, in kg.
+      grav: the gravitational constant to use, in N m^2 kg^-2.
+      scale: the number of meters per px.
+    *************
+    Returns an array of shape (N, 2) with the acceleration of every body towards the central body.
+    This is the same law as getForceBetween(body, star, grav, scale) / body.MASS:
+        a = -(G M / (scale*|r|)^2) * rHat
+    """
+    r = positions - np.asarray(center, dtype=positions.dtype)
+    rSquared = np.einsum("ij,ij->i", r, r)
+    # G M / (scale^2 |r|^3), so that multiplying by r gives the magnitude along rHat
+    factor = (grav * mass / (scale * scale)) / (rSquared * np.sqrt(rSquared))
+    return -factor[:, np.newaxis] * r
+
+
+# CENTRALFIELD: picklable acceleration function for a single fixed massive body.
+class CentralField:
+
+    def __init__(self, center, mass: float, grav: float, scale: float):
+        """
+        CentralField.__init__(center, mass, grav, scale):
+        parameters: as for centralAccelerations().
+        *************
+        Calling a CentralField with an array of positions returns centralAccelerations() for them, so it can be
+        passed anywhere an acceleration function is expected (see Utils/integrators.py). Unlike a lambda it
+        holds only a few numbers and can be sent to worker processes.
+        """
+        self.center = (float(center[0]), float(center[1]))
+        self.mass = mass
+        self.grav = grav
+        self.scale = scale
+
+    def __call__(self, positions: np.ndarray) -> np.ndarray:
+        return centralAccelerations(positions, self.center, self.mass, self.grav, self.scale)
+
+
+def pairwiseAccelerations(positions: np.ndarray, masses: np.ndarray, grav: float, scale: float,
+                          softening: float = 0.0, chunkSize: int = 1024) -> np.ndarray:
+    """
+    pairwiseAccelerations(positions, masses, grav, scale, softening, chunkSize):
+    parameters:
+      positions: array of shape (N, 2) holding the location of each body, in px.
+      masses: array of shape (N,) holding the mass of each body, in kg.
+      grav: the gravitational constant to use.
+      scale: the number of meters per px.
+      softening: length in px added in quadrature to every separation. 0 reproduces getForceBetween exactly.
+      chunkSize: number of bodies handled per block, which bounds the temporary memory to chunkSize*N.
+    *************
+    Returns the acceleration of every body due to every other body by direct summation over all pairs.
+    This costs O(N^2) and is meant as the exact reference for the Barnes-Hut approximation in quadtree.py.
+    """
+    accelerations = np.zeros_like(positions)
+    gm = grav * masses / (scale * scale)
+    for start in range(0, len(positions), chunkSize):
+        stop = min(start + chunkSize, len(positions))
+        # r points FROM each source TO each target in the block, shape (block, N, 2)
+        r = positions[start:stop, np.newaxis, :] - positions[np.newaxis, :, :]
+        distSquared = np.einsum("ijk,ijk->ij", r, r) + softening * softening
+        with np.errstate(divide="ignore", invalid="ignore"):
+            factor = gm[np.newaxis, :] / (distSquared * np.sqrt(distSquared))
+        # a body exerts no force on itself
+        factor[np.arange(stop - start), np.arange(start, stop)] = 0.0
+        accelerations[start:stop] = -np.einsum("ij,ijk->ik", factor, r)
+    return accelerations
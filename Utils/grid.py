@@ -4,11 +4,16 @@
 #   4-MAR-2024 --> Created, v1
 #   7-MAR-2024 --> added grid colors
 #   17-MAR-2024 --> added comments for documentation
+#   18-OCT-2026 --> Matrix stored as a NumPy array, rectangles drawn from a cached palette-mapped surface
+#   18-OCT-2026 --> drawing functions return the rect they touched, see Utils/scene.py
+#   18-OCT-2026 --> added centers(), a lattice for sampling vector fields
 #
 # ************************************************
 
+import numpy as np
 import pygame
-import random as rand
+
+from Utils.colors import getPalette, paletteIndices
 
 
 # *** CLASS DEFINITION ***
@@ -31,8 +36,9 @@ class Grid:
         numCols: defines the number of columns
         xticks: an array of pixel locations in the x-dimension marking the left and right edges of grid spaces.
         yticks: analogous to xticks, in the y-dimension.
-        Matrix: a two-dimensional list of randomized numbers, used by the colorFunction for each grid space to randomize the color of that space.
-        Matrix must be populated with float values from 0 to 1
+        Matrix: a two-dimensional NumPy array of shape (rows, columns), used by the colorFunction for each grid space to choose the color of that space.
+        Matrix must be populated with float values from 0 to 1. After changing Matrix directly (rather than through the
+        member functions of this class), call invalidate() so that the next drawRectangles() redraws it.
         """
         self.width = width
         self.height = height
@@ -41,10 +47,13 @@ class Grid:
         self.xticks = list(range(0, width + 1, int(width / columns)))
         self.yticks = list(range(0, height + 1, int(height / rows)))
         # initially, the matrix is populated with zeros
-        self.Matrix = [[0 for col in range(columns)] for row in range(rows)]
+        self.Matrix = np.zeros((rows, columns))
+        # drawRectangles() keeps the last image it made until the matrix or palette changes
+        self._cachedSurface = None
+        self._cachedKey = None
     
 
-    def drawLines(self, surface, color, thickness) -> None:
+    def drawLines(self, surface, color, thickness) -> pygame.Rect:
         """
         Grid.drawLines(surface, color, thickness):
         parameters:
@@ -55,18 +64,30 @@ class Grid:
         This function will draw equally spaced gridlines in both the x and y dimensions of the screen with color and thickness of
         gridlines defined as paramaters passed to the function. The spacing of the gridlines is determined by the width or height of the screen 
         divided by the number of columns or rows that the grid is made up of. (numRows and numCols are data members of this class)
+        Returns the rect of the surface that was drawn on.
         """
+        rects = []
         for tick in self.xticks:
             start = tick*pygame.Vector2(1,0)
             end = start + self.height*pygame.Vector2(0,1)
-            pygame.draw.line(surface=surface, color=color, start_pos=start, end_pos=end, width=thickness)
+            rects.append(pygame.draw.line(surface=surface, color=color, start_pos=start, end_pos=end, width=thickness))
         for tick in self.yticks:
             start = tick*pygame.Vector2(0,1)
             end = start + self.width*pygame.Vector2(1,0)
-            pygame.draw.line(surface=surface, color=color, start_pos=start, end_pos=end, width=thickness)
+            rects.append(pygame.draw.line(surface=surface, color=color, start_pos=start, end_pos=end, width=thickness))
+        return rects[0].unionall(rects[1:])
             
     
-    def drawRectangles(self, surface: pygame.Surface, colorFunc) -> None:
+    def invalidate(self) -> None:
+        """
+        Grid.invalidate()
+        parameters: none
+
+        Tells the grid that Matrix has changed, so that the next drawRectangles() rebuilds its image.
+        """
+        self._cachedSurface = None
+
+    def drawRectangles(self, surface: pygame.Surface, colorFunc) -> pygame.Rect:
         """
         Grid.drawRectangles(self, surface, colorFunc):
         parameters:
@@ -76,11 +97,33 @@ class Grid:
         This function colors each of the rectangles defined by the dimensions, numRows, and numCols attributes of the grid.
         Colors are currently randomly generated via a colorFunction which pulls float values from the Matrix attribute of the grid.
         Since the float values of the Matrix are RNG'd between 0 and 1, then the color of each grid space is also random.
+        The colorFunction is turned into a 256-entry palette (see colors.py) and the whole Matrix is looked up in it at once,
+        written into a surface with one pixel per grid space, and scaled up to the grid size. That image is kept and simply
+        blitted again on later calls until the Matrix (see invalidate()) or colorFunc changes.
+        Returns the rect of the surface that was drawn on.
+        """
+        key = (colorFunc, surface.get_size())
+        if self._cachedSurface is None or self._cachedKey != key:
+            palette = getPalette(colorFunc)
+            # surfarray images are indexed [x][y], so columns come first
+            image = palette[paletteIndices(self.Matrix)].transpose(1, 0, 2)
+            cells = pygame.surfarray.make_surface(image)
+            size = (int(self.width / self.numCols) * self.numCols, int(self.height / self.numRows) * self.numRows)
+            self._cachedSurface = pygame.transform.scale(cells, size).convert(surface)
+            self._cachedKey = key
+        return surface.blit(self._cachedSurface, (0, 0))
+
+    def centers(self) -> np.ndarray:
+        """
+        Grid.centers()
+        parameters: none
+
+        Returns an array of shape (rows * columns, 2) with the pixel location of the center of every grid space, row by row.
+        This is a lattice to sample a field on, e.g. the tails of an ArrowField (see arrow.py).
         """
-        for x in range(0, self.numCols):
-            for y in range(0, self.numRows):
-                rect = pygame.Rect(self.xticks[x], self.yticks[y], self.width / self.numCols, self.height / self.numRows)
-                pygame.draw.rect(surface, colorFunc(self.Matrix[y][x]), rect)
+        x = (np.arange(self.numCols) + 0.5) * int(self.width / self.numCols)
+        y = (np.arange(self.numRows) + 0.5) * int(self.height / self.numRows)
+        return np.stack(np.meshgrid(x, y), axis=-1).reshape(-1, 2)
 
     def verticalGradientMatrix(self) -> None:
         """
@@ -91,9 +134,8 @@ class Grid:
         These values are smaller near the "top" of the matrix, but increase for
         "lower" rows.
         """
-        for y in range(self.numRows):
-            for x in range(self.numCols):
-                self.Matrix[y][x] = float(y / self.numRows)
+        self.Matrix[:, :] = (np.arange(self.numRows) / self.numRows)[:, np.newaxis]
+        self.invalidate()
 
     def horizontalGradientMatrix(self) -> None:
         """
@@ -104,9 +146,8 @@ class Grid:
         These values are smaller near the left side of the matrix, but increase for
         further right columns.
         """
-        for y in range(self.numRows):
-            for x in range(self.numCols):
-                self.Matrix[y][x] = float(x / self.numCols)
+        self.Matrix[:, :] = (np.arange(self.numCols) / self.numCols)[np.newaxis, :]
+        self.invalidate()
 
     def randomizeMatrix(self) -> None:
         """
@@ -116,6 +157,5 @@ class Grid:
         This function populates the grid's matrix with values between 0 and 1.
         These values are randomized.
         """
-        for y in range(self.numRows):
-            for x in range(self.numCols):
-                self.Matrix[y][x] = rand.uniform(0, 1)
\ No newline at end of file
+        self.Matrix[:, :] = np.random.uniform(0, 1, size=(self.numRows, self.numCols))
+        self.invalidate()
@@ -0,0 +1,85 @@
+# File: integrators.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, Euler, leapfrog, RK4 and Yoshida integrators
+#
+# Time integrators for the orbital simulations. Every integrator has the same signature:
+#
+#     position, velocity, acceleration = integrator(position, velocity, acceleration, accelFunc, deltaTime)
+#
+# where acceleration must be accelFunc(position) on the way in and is accelFunc(new position) on the
+# way out, so that consecutive steps never evaluate the same acceleration twice. Only arithmetic
+# operators are used, so the same functions advance a single Satellite (pygame.Vector2 state) and a
+# whole ParticleSystem (NumPy array state).
+
+# Yoshida (1990) coefficients for a 4th order composition of three leapfrog steps
+_CBRT2 = 2 ** (1 / 3)
+YOSHIDA_W1 = 1 / (2 - _CBRT2)
+YOSHIDA_W0 = -_CBRT2 / (2 - _CBRT2)
+
+
+def euler(position, velocity, acceleration, accelFunc, deltaTime: float):
+    """
+    Semi-implicit (symplectic) Euler, the step Satellite.update() has always used. 1st order, 1 evaluation.
+    """
+    # v_f = v_0 + at
+    velocity = velocity + acceleration * deltaTime
+    # x_f = x_0 + vt
+    position = position + velocity * deltaTime
+    return position, velocity, accelFunc(position)
+
+
+def leapfrog(position, velocity, acceleration, accelFunc, deltaTime: float):
+    """
+    Velocity-Verlet (kick-drift-kick leapfrog). 2nd order and symplectic, 1 evaluation.
+    """
+    velocity = velocity + acceleration * (0.5 * deltaTime)
+    position = position + velocity * deltaTime
+    acceleration = accelFunc(position)
+    velocity = velocity + acceleration * (0.5 * deltaTime)
+    return position, velocity, acceleration
+
+
+def rk4(position, velocity, acceleration, accelFunc, deltaTime: float):
+    """
+    Classical 4th order Runge-Kutta. Not symplectic, so energy slowly drifts, but very accurate per step. 4 evaluations.
+    """
+    halfStep = 0.5 * deltaTime
+    k1x, k1v = velocity, acceleration
+    k2x = velocity + k1v * halfStep
+    k2v = accelFunc(position + k1x * halfStep)
+    k3x = velocity + k2v * halfStep
+    k3v = accelFunc(position + k2x * halfStep)
+    k4x = velocity + k3v * deltaTime
+    k4v = accelFunc(position + k3x * deltaTime)
+    position = position + (k1x + 2 * k2x + 2 * k3x + k4x) * (deltaTime / 6)
+    velocity = velocity + (k1v + 2 * k2v + 2 * k3v + k4v) * (deltaTime / 6)
+    return position, velocity, accelFunc(position)
+
+
+def yoshida4(position, velocity, acceleration, accelFunc, deltaTime: float):
+    """
+    Yoshida's 4th order symplectic integrator, built from three leapfrog steps. 3 evaluations.
+    """
+    for weight in (YOSHIDA_W1, YOSHIDA_W0, YOSHIDA_W1):
+        position, velocity, acceleration = leapfrog(position, velocity, acceleration, accelFunc, weight * deltaTime)
+    return position, velocity, acceleration
+
+
+INTEGRATORS = {
+    "euler": euler,
+    "leapfrog": leapfrog,
+    "verlet": leapfrog,
+    "rk4": rk4,
+    "yoshida4": yoshida4,
+}
+
+
+def getIntegrator(name: str):
+    """
+    Returns the integrator function registered under name, one of the keys of INTEGRATORS.
+    """
+    try:
+        return INTEGRATORS[name]
+    except KeyError:
+        raise ValueError("Unknown integrator '{}', expected one of: {}".format(name, ", ".join(INTEGRATORS))) from None
@@ -0,0 +1,214 @@
+# File: kepler.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, closed-form two-body propagation
+#
+# The two-body problem solved exactly instead of integrated. A body's position and velocity around a fixed
+# central body are converted to orbital elements once; its state at any later time then follows from Kepler's
+# equation, solved for every body at once with Newton's method. A step of any length costs the same and never
+# drifts, which suits bodies that only feel the central body (orbit.py, and the asteroid belt without
+# self-gravity).
+#
+# Orbits are planar and elliptical (bound). mu is the gravitational parameter of the central body in screen
+# units, see gravitationalParameter() in Utils/distributions.py.
+
+import numpy as np
+
+TWO_PI = 2 * np.pi
+
+
+def solveKepler(meanAnomaly, eccentricity, tolerance: float = 1e-12, maxIterations: int = 50, guess=None):
+    """
+    solveKepler(meanAnomaly, eccentricity, tolerance, maxIterations, guess):
+    parameters:
+      meanAnomaly, eccentricity: arrays (or floats) of the same shape, with 0 <= eccentricity < 1.
+      tolerance: stop once every correction is smaller than this, in radians.
+      maxIterations: upper bound on the Newton iterations.
+      guess: starting eccentric anomalies, e.g. the solution of the previous step, which is usually one or two
+             iterations away. None for a start that always converges.
+    *************
+    Solves Kepler's equation E - e sin(E) = M for the eccentric anomaly E of every orbit at once with Newton's method.
+    """
+    meanAnomaly = np.asarray(meanAnomaly, dtype=float)
+    eccentricity = np.asarray(eccentricity, dtype=float)
+    if guess is not None:
+        # the guess may be from before meanAnomaly wrapped around, bring it into the same revolution
+        anomaly = meanAnomaly + np.mod(guess - meanAnomaly + np.pi, TWO_PI) - np.pi
+    else:
+        # starting at pi for high eccentricities avoids overshooting near periapsis
+        anomaly = np.where(eccentricity < 0.8, meanAnomaly, np.pi)
+    for _ in range(maxIterations):
+        correction = (anomaly - eccentricity * np.sin(anomaly) - meanAnomaly) / (1.0 - eccentricity * np.cos(anomaly))
+        anomaly = anomaly - correction
+        if np.all(np.abs(correction) < tolerance):
+            break
+    return anomaly
+
+
+# *** CLASS DEFINITIONS ***
+
+# ORBITALELEMENTS: the shape, orientation and phase of many planar Keplerian orbits.
+class OrbitalElements:
+
+    def __init__(self, semiMajorAxis, eccentricity, periapsisAngle, meanAnomaly, direction, mu: float):
+        """
+        OrbitalElements.__init__(semiMajorAxis, eccentricity, periapsisAngle, meanAnomaly, direction, mu):
+        parameters:
+          semiMajorAxis: in px.
+          eccentricity: between 0 and 1.
+          periapsisAngle: direction of periapsis from the central body, in radians from the +x axis.
+          meanAnomaly: phase along the orbit at time 0, in radians, 0 at periapsis.
+          direction: +1 for counter-clockwise orbits (in array coordinates), -1 for clockwise ones.
+          mu: gravitational parameter of the central body.
+        *************
+        Every element is an array of shape (N,), or a float for a single orbit.
+        """
+        self.semiMajorAxis = semiMajorAxis
+        self.eccentricity = eccentricity
+        self.periapsisAngle = periapsisAngle
+        self.meanAnomaly = meanAnomaly
+        self.direction = direction
+        self.mu = mu
+
+    @property
+    def meanMotion(self):
+        """Average angular speed along the orbit, in radians/s."""
+        return np.sqrt(self.mu / self.semiMajorAxis ** 3)
+
+    @property
+    def period(self):
+        """Time for one revolution, in s."""
+        return TWO_PI / self.meanMotion
+
+    @property
+    def energy(self):
+        """Orbital energy per unit mass, in px^2/s^2 (negative for bound orbits)."""
+        return -self.mu / (2 * self.semiMajorAxis)
+
+    @property
+    def periapsis(self):
+        """Closest distance to the central body, in px."""
+        return self.semiMajorAxis * (1 - self.eccentricity)
+
+    @property
+    def apoapsis(self):
+        """Farthest distance from the central body, in px."""
+        return self.semiMajorAxis * (1 + self.eccentricity)
+
+
+def stateToElements(positions, velocities, center, mu: float) -> OrbitalElements:
+    """
+    stateToElements(positions, velocities, center, mu):
+    parameters:
+      positions, velocities: arrays of shape (N, 2) in px and px/s, or a single pair of numbers each.
+      center: location of the central body, in px.
+      mu: gravitational parameter of the central body.
+    *************
+    Returns the OrbitalElements of every body, with mean anomalies at the time of the given state.
+    Raises ValueError if any orbit is unbound (parabolic or hyperbolic).
+    """
+    single = np.ndim(positions) == 1
+    r = np.atleast_2d(np.asarray(positions, dtype=float)) - np.asarray(center, dtype=float)
+    v = np.atleast_2d(np.asarray(velocities, dtype=float))
+    x, y, vx, vy = r[:, 0], r[:, 1], v[:, 0], v[:, 1]
+    distance = np.hypot(x, y)
+    speedSquared = vx * vx + vy * vy
+    radialVelocity = x * vx + y * vy
+
+    energy = 0.5 * speedSquared - mu / distance
+    if np.any(energy >= 0):
+        raise ValueError("{} orbit(s) are not bound to the central body".format(int(np.count_nonzero(energy >= 0))))
+    a = -mu / (2 * energy)
+    # eccentricity vector: points at periapsis with length e
+    ex = ((speedSquared - mu / distance) * x - radialVelocity * vx) / mu
+    ey = ((speedSquared - mu / distance) * y - radialVelocity * vy) / mu
+    e = np.minimum(np.hypot(ex, ey), 1 - 1e-15)
+    omega = np.arctan2(ey, ex)
+    direction = np.where(x * vy - y * vx >= 0, 1.0, -1.0)
+
+    # position in the orbital frame (periapsis along +x, motion counter-clockwise), then the eccentric anomaly.
+    # This stays well defined for circular orbits, where omega is arbitrary and E becomes the true longitude.
+    cosW, sinW = np.cos(omega), np.sin(omega)
+    px = cosW * x + sinW * y
+    py = direction * (cosW * y - sinW * x)
+    E = np.arctan2(py / np.sqrt(1 - e * e), px + a * e)
+    M = np.mod(E - e * np.sin(E), TWO_PI)
+    if single:
+        return OrbitalElements(a[0], e[0], omega[0], M[0], direction[0], mu)
+    return OrbitalElements(a, e, omega, M, direction, mu)
+
+
+def elementsToState(elements: OrbitalElements, center, time: float = 0.0, guess=None):
+    """
+    elementsToState(elements, center, time, guess):
+    parameters:
+      elements: OrbitalElements of one or many orbits.
+      center: location of the central body, in px.
+      time: seconds after the time the elements describe.
+      guess: starting eccentric anomalies for solveKepler(), or None.
+    *************
+    Returns (positions, velocities, eccentricAnomalies) of every body at the given time, arrays of shape (N, 2)
+    (or (2,) for a single orbit) and (N,). Every body costs the same few operations no matter how far ahead time is.
+    """
+    a, e, direction = elements.semiMajorAxis, elements.eccentricity, elements.direction
+    meanAnomaly = np.mod(elements.meanAnomaly + elements.meanMotion * time, TWO_PI)
+    E = solveKepler(meanAnomaly, e, guess=guess)
+    cosE, sinE = np.cos(E), np.sin(E)
+    root = np.sqrt(1 - e * e)
+    # orbital frame
+    x = a * (cosE - e)
+    y = direction * a * root * sinE
+    rate = np.sqrt(elements.mu / a) / (1 - e * cosE)
+    vx = -rate * sinE
+    vy = direction * rate * root * cosE
+    # rotate to periapsisAngle
+    cosW, sinW = np.cos(elements.periapsisAngle), np.sin(elements.periapsisAngle)
+    positions = np.stack((center[0] + cosW * x - sinW * y, center[1] + sinW * x + cosW * y), axis=-1)
+    velocities = np.stack((cosW * vx - sinW * vy, sinW * vx + cosW * vy), axis=-1)
+    return positions, velocities, E
+
+
+# KEPLERPROPAGATOR: advances a ParticleSystem of non-interacting bodies around one central body exactly.
+class KeplerPropagator:
+
+    def __init__(self, system, center, mu: float):
+        """
+        KeplerPropagator.__init__(system, center, mu):
+        parameters:
+          system: the ParticleSystem to advance. Every body must be on a bound orbit.
+          center: location of the central body, in px.
+          mu: gravitational parameter of the central body.
+        *************
+        Stands in for the system in BeltSimulation: update() has the same call as ParticleSystem.update(),
+        but places every body on its exact orbit instead of integrating.
+        """
+        self.system = system
+        self.center = np.asarray(center, dtype=float)
+        self.mu = mu
+        self.refresh()
+
+    def refresh(self) -> None:
+        """
+        Recomputes the orbital elements from the system's current state. Call after changing bodies by other means
+        (collisions, restoring a snapshot).
+        """
+        self.elements = stateToElements(self.system.positions, self.system.velocities, self.center, self.mu)
+        self.elapsed = 0.0
+        self._count = self.system.count
+        self._anomalies = None
+
+    def update(self, deltaTime: float, accelFunc=None) -> None:
+        """
+        KeplerPropagator.update(deltaTime, accelFunc):
+        parameters:
+          deltaTime: the time to advance every body by, of any length.
+          accelFunc: if given, used to keep the system's accelerations current. Otherwise they are left alone.
+        """
+        if self.system.count != self._count:
+            self.refresh()
+        self.elapsed += deltaTime
+        positions, velocities, self._anomalies = elementsToState(self.elements, self.center, self.elapsed, self._anomalies)
+        self.system.positions[:] = positions
+        self.system.velocities[:] = velocities
+        if accelFunc is not None:
+            self.system.accelerations[:] = accelFunc(self.system.positions)
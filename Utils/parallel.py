@@ -0,0 +1,152 @@
+# File: parallel.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, multi-process force and update backend for ParticleSystem
+#   18-OCT-2026 --> update() takes an acceleration function and uses the system's integrator
+#   18-OCT-2026 --> shared arrays keep the system's precision
+#
+# Class file for ParallelBackend. The arrays of a ParticleSystem are moved into multiprocessing.shared_memory
+# blocks and every worker process owns a contiguous slice of the bodies. Each step only a short command
+# tuple is sent to the workers; the positions, velocities and accelerations themselves are never pickled.
+
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from Utils.gravity import centralAccelerations
+from Utils.integrators import getIntegrator
+from Utils.particles import ParticleSystem
+
+_FIELDS = (("positions", 2), ("velocities", 2), ("accelerations", 2), ("masses", 1))
+
+
+def _attach(names: list, dtypes: list, count: int):
+    """Opens the shared memory blocks by name and returns (blocks, arrays) in _FIELDS order."""
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    arrays = []
+    for block, dtype, (_, width) in zip(blocks, dtypes, _FIELDS):
+        shape = (count, width) if width > 1 else (count,)
+        arrays.append(np.ndarray(shape, dtype=dtype, buffer=block.buf))
+    return blocks, arrays
+
+
+def _worker(connection, names: list, dtypes: list, count: int, start: int, stop: int) -> None:
+    """
+    Main loop of a worker process. Waits for a command, applies it to bodies start:stop and
+    replies once the slice is done, until it receives None.
+    """
+    blocks, arrays = _attach(names, dtypes, count)
+    positions, velocities, accelerations, _ = (array[start:stop] for array in arrays)
+    while True:
+        message = connection.recv()
+        if message is None:
+            break
+        command, args = message
+        if command == "accelerate" or command == "step":
+            position, mass, grav, scale = args[:4]
+            accelerations[:] = centralAccelerations(positions, position, mass, grav, scale)
+        if command == "step":
+            deltaTime = args[4]
+            velocities += accelerations * deltaTime
+            positions += velocities * deltaTime
+        if command == "update":
+            deltaTime, accelFunc, integrator = args
+            if accelFunc is None:
+                velocities += accelerations * deltaTime
+                positions += velocities * deltaTime
+            else:
+                newPositions, newVelocities, newAccelerations = getIntegrator(integrator)(
+                    positions, velocities, accelerations, accelFunc, deltaTime)
+                positions[:] = newPositions
+                velocities[:] = newVelocities
+                accelerations[:] = newAccelerations
+        connection.send(True)
+    del positions, velocities, accelerations, arrays
+    for block in blocks:
+        block.close()
+
+
+# *** CLASS DEFINITION ***
+
+# PARALLELBACKEND: runs ParticleSystem.accelerateToward() and ParticleSystem.update() across worker processes.
+class ParallelBackend:
+
+    def __init__(self, system: ParticleSystem, workers: int):
+        """
+        ParallelBackend.__init__(system, workers):
+        parameters:
+          system: the ParticleSystem whose bodies should be shared between the workers.
+          workers: the number of worker processes to start, usually the number of cores.
+        *************
+        The system is rebound to shared memory in place, so drawing and any other code that reads
+        system.positions keeps working unchanged. The number of bodies is fixed while the backend is
+        running; call close() before adding or removing bodies.
+        """
+        self.system = system
+        self.count = system.count
+        self._blocks = []
+        arrays = []
+        dtypes = [getattr(system, name).dtype.str for name, _ in _FIELDS]
+        for dtype, (_, width) in zip(dtypes, _FIELDS):
+            block = shared_memory.SharedMemory(create=True, size=max(np.dtype(dtype).itemsize * width * self.count, 1))
+            shape = (self.count, width) if width > 1 else (self.count,)
+            self._blocks.append(block)
+            arrays.append(np.ndarray(shape, dtype=dtype, buffer=block.buf))
+        system.rebind(*arrays)
+
+        names = [block.name for block in self._blocks]
+        bounds = np.linspace(0, self.count, workers + 1).astype(int)
+        self._connections = []
+        self._processes = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            parentEnd, childEnd = multiprocessing.Pipe()
+            process = multiprocessing.Process(target=_worker, args=(childEnd, names, dtypes, self.count, start, stop), daemon=True)
+            process.start()
+            self._connections.append(parentEnd)
+            self._processes.append(process)
+
+    def _broadcast(self, command: str, args: tuple) -> None:
+        for connection in self._connections:
+            connection.send((command, args))
+        # wait for every slice so that the arrays are consistent when this returns
+        for connection in self._connections:
+            connection.recv()
+
+    def accelerateToward(self, position, mass: float, grav: float, scale: float) -> None:
+        """Parallel version of ParticleSystem.accelerateToward(), with the same parameters."""
+        self._broadcast("accelerate", (tuple(position), mass, grav, scale))
+
+    def addSelfGravity(self, grav: float, scale: float, theta: float = 0.5, softening: float = 0.0) -> None:
+        """Runs ParticleSystem.addSelfGravity() on the shared arrays in this process."""
+        self.system.addSelfGravity(grav, scale, theta, softening)
+
+    def update(self, deltaTime: float, accelFunc=None) -> None:
+        """
+        Parallel version of ParticleSystem.update(), with the same parameters and the system's integrator.
+        accelFunc is sent to every worker each step, so it must be small and picklable (e.g. a CentralField),
+        and each body's acceleration may only depend on its own position since a worker only sees its slice.
+        """
+        self._broadcast("update", (deltaTime, accelFunc, self.system.integrator))
+
+    def step(self, position, mass: float, grav: float, scale: float, deltaTime: float) -> None:
+        """
+        accelerateToward() followed by update() in a single round trip to the workers.
+        """
+        self._broadcast("step", (tuple(position), mass, grav, scale, deltaTime))
+
+    def close(self) -> None:
+        """
+        Stops the workers and moves the system back into ordinary process-local arrays.
+        """
+        for connection in self._connections:
+            connection.send(None)
+        for process in self._processes:
+            process.join()
+        self.system.rebind(*(np.empty_like(getattr(self.system, name)) for name, _ in _FIELDS))
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._connections = []
+        self._processes = []
+        self._blocks = []
@@ -0,0 +1,204 @@
+# File: particles.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, structure-of-arrays container for many-bodied simulations
+#   18-OCT-2026 --> added self-gravity through a Barnes-Hut quadtree
+#   18-OCT-2026 --> added rebind() so storage can live in shared memory
+#   18-OCT-2026 --> pluggable integrators in update()
+#   18-OCT-2026 --> draw() renders every body in one batched call
+#   18-OCT-2026 --> per-body radii and removeBodies() for collisions
+#   18-OCT-2026 --> optional camera in draw()
+#   18-OCT-2026 --> selectable float64, float32 or mixed precision storage
+#   18-OCT-2026 --> bytesPerBody also right for an empty system
+#
+# Class file for ParticleSystem. Where a Satellite stores one body as a set of pygame.Vector2 objects,
+# a ParticleSystem stores every body of a population in contiguous NumPy arrays so that forces and
+# updates for the whole population are computed in a handful of batched operations.
+#
+# Storage costs 64 bytes per body in float64, 32 in float32 and 48 in mixed precision, where positions and
+# velocities (the state that accumulates step after step) stay float64 and the quantities recomputed every step
+# (accelerations) or set once (masses, radii) are float32.
+
+import numpy as np
+import pygame
+
+from Utils.gravity import centralAccelerations
+from Utils.integrators import getIntegrator
+from Utils.quadtree import barnesHutAccelerations
+from Utils.renderer import drawPoints, drawDensity
+
+# storage dtypes of (positions and velocities, accelerations, masses and radii) for every precision
+PRECISIONS = {
+    "float64": (np.float64, np.float64, np.float64),
+    "float32": (np.float32, np.float32, np.float32),
+    "mixed": (np.float64, np.float32, np.float32),
+}
+
+class ParticleSystem:
+    """
+    Batched counterpart to Satellite, used for large populations such as the asteroid belt.
+    """
+    def __init__(self, capacity: int = 0, integrator: str = "euler", precision: str = "float64"):
+        """
+        ParticleSystem.__init__(capacity, integrator, precision):
+        parameters:
+          capacity: the number of bodies to preallocate storage for. Storage grows automatically if exceeded.
+          integrator: name of the integrator used by update() when it is given an acceleration function.
+          precision: "float64", "float32" or "mixed", see PRECISIONS.
+        *************
+        positions, velocities and accelerations are arrays of shape (count, 2), masses and radii are arrays of
+        shape (count,). These attributes are always views of exactly the bodies currently in the system.
+        """
+        if precision not in PRECISIONS:
+            raise ValueError("unknown precision '{}', expected one of {}".format(precision, ", ".join(PRECISIONS)))
+        stateType, accelerationType, propertyType = PRECISIONS[precision]
+        self.count = 0
+        self.integrator = integrator
+        self.precision = precision
+        self._positions = np.zeros((capacity, 2), dtype=stateType)
+        self._velocities = np.zeros((capacity, 2), dtype=stateType)
+        self._accelerations = np.zeros((capacity, 2), dtype=accelerationType)
+        self._masses = np.zeros(capacity, dtype=propertyType)
+        self._radii = np.zeros(capacity, dtype=propertyType)
+        self._refreshViews()
+
+    @property
+    def bytesPerBody(self) -> int:
+        """Storage used by one body, in bytes."""
+        # from the dtypes and per-body widths rather than the strides, which NumPy reports as 0 for empty arrays
+        return sum(array.dtype.itemsize * int(np.prod(array.shape[1:]))
+                   for array in (self._positions, self._velocities, self._accelerations, self._masses, self._radii))
+
+    def _refreshViews(self) -> None:
+        self.positions = self._positions[:self.count]
+        self.velocities = self._velocities[:self.count]
+        self.accelerations = self._accelerations[:self.count]
+        self.masses = self._masses[:self.count]
+        self.radii = self._radii[:self.count]
+
+    def _reserve(self, capacity: int) -> None:
+        if capacity <= len(self._masses):
+            return
+        capacity = max(capacity, 2 * len(self._masses))
+        for name in ("_positions", "_velocities", "_accelerations", "_masses", "_radii"):
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+
+    def rebind(self, positions: np.ndarray, velocities: np.ndarray, accelerations: np.ndarray, masses: np.ndarray) -> None:
+        """
+        ParticleSystem.rebind(positions, velocities, accelerations, masses):
+        parameters:
+          positions, velocities, accelerations: preallocated arrays of shape (capacity, 2).
+          masses: preallocated array of shape (capacity,).
+        *************
+        Copies the current bodies into the given arrays and uses them as storage from now on. This is how the
+        parallel backend moves a system into shared memory without the rest of the program noticing.
+        capacity must be at least count, and each array should have the dtype of the storage it replaces.
+        """
+        for name, array in (("_positions", positions), ("_velocities", velocities),
+                            ("_accelerations", accelerations), ("_masses", masses)):
+            array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        self._refreshViews()
+
+    def addBodies(self, positions, velocities, masses, radii=0.0) -> None:
+        """
+        ParticleSystem.addBodies(positions, velocities, masses, radii):
+        parameters:
+          positions: array-like of shape (n, 2), initial positions in px.
+          velocities: array-like of shape (n, 2), initial velocities in px/s.
+          masses: scalar or array-like of shape (n,), masses in kg.
+          radii: scalar or array-like of shape (n,), collision radii in px.
+        *************
+        Appends n bodies to the end of the system. Accelerations of new bodies start at zero.
+        """
+        positions = np.asarray(positions, dtype=float).reshape(-1, 2)
+        n = len(positions)
+        self._reserve(self.count + n)
+        new = slice(self.count, self.count + n)
+        self._positions[new] = positions
+        self._velocities[new] = np.asarray(velocities, dtype=float).reshape(-1, 2)
+        self._accelerations[new] = 0
+        self._masses[new] = masses
+        self._radii[new] = radii
+        self.count += n
+        self._refreshViews()
+
+    def removeBodies(self, keep: np.ndarray) -> None:
+        """
+        ParticleSystem.removeBodies(keep):
+        parameters:
+          keep: boolean array of shape (count,), False for every body to be removed.
+        *************
+        Removes bodies by compacting the survivors, in their original order, to the front of the storage.
+        Body i becomes body np.cumsum(keep)[i] - 1. Storage is never reallocated.
+        """
+        kept = int(np.count_nonzero(keep))
+        for name in ("_positions", "_velocities", "_accelerations", "_masses", "_radii"):
+            array = getattr(self, name)
+            array[:kept] = array[:self.count][keep]
+        self.count = kept
+        self._refreshViews()
+
+    def accelerateToward(self, position, mass: float, grav: float, scale: float) -> None:
+        """
+        ParticleSystem.accelerateToward(position, mass, grav, scale):
+        parameters:
+          position: location of the attracting body, in px.
+          mass: mass of the attracting body, in kg.
+          grav: the gravitational constant.
+          scale: the number of meters per px.
+        *************
+        Sets the acceleration of every body to the gravitational acceleration towards a single massive body.
+        This replaces calling getForceBetween(asteroid, star) / ASTEROID_MASS once per asteroid.
+        """
+        self.accelerations[:] = centralAccelerations(self.positions, position, mass, grav, scale)
+
+    def addSelfGravity(self, grav: float, scale: float, theta: float = 0.5, softening: float = 0.0) -> None:
+        """
+        ParticleSystem.addSelfGravity(grav, scale, theta, softening):
+        parameters:
+          grav: the gravitational constant.
+          scale: the number of meters per px.
+          theta: Barnes-Hut opening angle, see QuadTree.accelerations(). 0 is the exact pairwise sum.
+          softening: length in px added in quadrature to every separation, which keeps close pairs finite.
+        *************
+        Adds the gravitational acceleration of every body due to every other body to the current accelerations.
+        Call after accelerateToward() so that each body feels both the star and the rest of the system.
+        """
+        self.accelerations += barnesHutAccelerations(self.positions, self.masses, grav, scale, theta, softening)
+
+    def update(self, deltaTime: float, accelFunc=None) -> None:
+        """
+        Calculates instantaneous velocity and position change of every body based on its acceleration.
+        Follows Satellite.update(): without accelFunc this is a semi-implicit Euler step with the current
+        accelerations, with accelFunc (positions array -> accelerations array) the system's integrator is used.
+        The arithmetic runs in the dtype of the positions, so in mixed precision every update accumulates in float64.
+        """
+        if accelFunc is not None:
+            step = getIntegrator(self.integrator)
+            positions, velocities, accelerations = step(self.positions, self.velocities, self.accelerations, accelFunc, deltaTime)
+            # write back in place, the arrays may be shared with other processes
+            self.positions[:] = positions
+            self.velocities[:] = velocities
+            self.accelerations[:] = accelerations
+            return
+        # v_f = v_0 + at
+        self.velocities += self.accelerations * deltaTime
+        # x_f = x_0 + vt
+        self.positions += self.velocities * deltaTime
+
+    def draw(self, surface: pygame.Surface, color: pygame.Color, radius: float, density: bool = False, camera=None) -> None:
+        """
+        Renders every body in the system as a circle of the given radius, see Utils/renderer.py.
+        With density=True, overlapping bodies add up to brighter pixels instead.
+        With a Camera (Utils/camera.py), only bodies in view are drawn, see Camera.drawBodies().
+        """
+        if camera is not None:
+            camera.drawBodies(surface, self.positions, color, radius, density)
+        elif density:
+            drawDensity(surface, self.positions, color)
+        else:
+            drawPoints(surface, self.positions, color, radius)
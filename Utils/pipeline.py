@@ -0,0 +1,150 @@
+# File: pipeline.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, simulation on its own thread with interpolated drawing
+#
+# Class file for SimulationPipeline. Normally a game loop steps the simulation, draws and flips one after the
+# other, so the physics stalls while the frame is drawn and the CPU sits idle while flip() and clock.tick() wait
+# on the display. A pipeline moves the stepping to a thread that keeps its own fixed real-time pace. After every
+# step the state the renderer needs is copied into a back buffer, which is swapped in as the newest completed
+# state; the game loop only ever reads completed states and draws them interpolated between the last two, so
+# motion stays smooth whether the display runs faster or slower than the physics.
+#
+# NumPy, SDL's flip and clock.tick() release the GIL while they work, which is the time the two threads overlap.
+
+import threading
+import time
+
+import numpy as np
+
+
+def _copy(state: dict, buffers: dict) -> dict:
+    """
+    Copies the arrays of a captured state into buffers (a state of the same keys from an earlier copy) where the
+    shapes and dtypes still match, and into new arrays where they do not. Other values are kept as they are.
+    """
+    copied = {}
+    for key, value in state.items():
+        if isinstance(value, np.ndarray):
+            old = buffers.get(key) if buffers is not None else None
+            if old is not None and old.shape == value.shape and old.dtype == value.dtype:
+                np.copyto(old, value)
+                copied[key] = old
+            else:
+                copied[key] = np.array(value)
+        else:
+            copied[key] = value
+    return copied
+
+
+def _interpolate(previous, current, alpha: float):
+    # arrays of floats that kept their shape blend linearly; anything else (including bodies that merged
+    # since the previous state) is drawn as it is now
+    if not isinstance(current, np.ndarray):
+        return current
+    if isinstance(previous, np.ndarray) and previous.shape == current.shape and current.dtype.kind == "f":
+        return previous + alpha * (current - previous)
+    return current.copy()
+
+
+# *** CLASS DEFINITION ***
+
+# SIMULATIONPIPELINE: steps a simulation on a worker thread while the game loop draws.
+class SimulationPipeline:
+
+    def __init__(self, simulation, stepSize: float, deltaTime: float, capture, onStep=None, maxSteps: int = 10):
+        """
+        SimulationPipeline.__init__(simulation, stepSize, deltaTime, capture, onStep, maxSteps):
+        parameters:
+          simulation: anything with a step(deltaTime) method, e.g. OrbitSimulation or BeltSimulation.
+          stepSize: the real time between two steps, in seconds, as for FixedTimestep.
+          deltaTime: the simulated time of one step. May be changed while the pipeline runs.
+          capture: function of the simulation returning a dict of what the renderer needs, e.g.
+                   {"positions": simulation.satellites.positions}. Arrays are copied, so views are fine.
+          onStep: if given, called with the simulation after every step, on the worker thread.
+          maxSteps: if the physics falls this many steps behind real time, the backlog is dropped instead of piling
+                    up (and the simulation runs slower than real time), as for FixedTimestep.
+        *************
+        Nothing runs until start(). The simulation belongs to the worker thread from start() until stop(); the
+        game loop should only read the states returned by frame().
+        """
+        self.simulation = simulation
+        self.stepSize = stepSize
+        self.deltaTime = deltaTime
+        self.capture = capture
+        self.onStep = onStep
+        self.maxSteps = maxSteps
+        self.steps = 0
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._thread = None
+        self._error = None
+        self._current = _copy(capture(simulation), None)
+        self._previous = _copy(self._current, None)
+        self._back = None
+        self._published = time.perf_counter()
+
+    def start(self) -> None:
+        """
+        Starts stepping the simulation on a worker thread.
+        """
+        if self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops the worker thread after the step in progress, after which the simulation may be used directly again
+        (e.g. to save it). Raises any exception the simulation raised on the worker thread.
+        """
+        if self._thread is not None:
+            self._stopping.set()
+            self._thread.join()
+            self._thread = None
+        self._raise()
+
+    def _raise(self) -> None:
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise RuntimeError("the simulation thread stopped with an error") from error
+
+    def _run(self) -> None:
+        try:
+            due = time.perf_counter()
+            while not self._stopping.is_set():
+                now = time.perf_counter()
+                if now < due:
+                    # waiting on the event releases the GIL, and stop() ends the wait at once
+                    self._stopping.wait(due - now)
+                    continue
+                behind = int((now - due) / self.stepSize)
+                if behind > self.maxSteps:
+                    self.dropped += behind
+                    due += behind * self.stepSize
+                self.simulation.step(self.deltaTime)
+                self.steps += 1
+                if self.onStep is not None:
+                    self.onStep(self.simulation)
+                # fill the back buffer without the lock, the game loop never reads it
+                back = _copy(self.capture(self.simulation), self._back)
+                with self._lock:
+                    self._back = self._previous
+                    self._previous, self._current = self._current, back
+                    self._published = time.perf_counter()
+                due += self.stepSize
+        except BaseException as error:
+            self._error = error
+
+    def frame(self) -> dict:
+        """
+        Returns the state to draw now: the captured dict with every array interpolated between the last two
+        completed steps, so what is drawn trails the simulation by up to one step. The arrays are the caller's to
+        keep. Raises if the simulation failed on the worker thread.
+        """
+        self._raise()
+        with self._lock:
+            alpha = min(max((time.perf_counter() - self._published) / self.stepSize, 0.0), 1.0)
+            return {key: _interpolate(self._previous.get(key), value, alpha) for key, value in self._current.items()}
@@ -0,0 +1,199 @@
+# File: profiler.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, per-phase frame timing with an on-screen overlay and file export
+#   18-OCT-2026 --> draw() returns the rect it touched, see Utils/scene.py
+#
+# Class file for FrameProfiler. The game loops wrap each phase of a frame (events, physics, drawing, flip) in a
+# named scope; at the end of every frame the time spent in each scope goes into a rolling window from which
+# percentiles are read. The numbers can be drawn over the simulation with Utils.text.Text and streamed to a CSV
+# file or to a trace-event file (.json) that chrome://tracing and Perfetto open.
+#
+# A disabled profiler hands out one shared do-nothing scope, so the instrumentation can stay in the loops.
+
+import contextlib
+import json
+import time
+
+import numpy as np
+import pygame
+
+from Utils.text import Text
+
+# returned by scope() while the profiler is disabled
+_NULL_SCOPE = contextlib.nullcontext()
+
+
+# _SCOPE: times one named phase, reused for every frame.
+class _Scope:
+
+    def __init__(self, profiler, name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.profiler._add(self.name, self.start, time.perf_counter_ns())
+
+
+# *** CLASS DEFINITION ***
+
+# FRAMEPROFILER: rolling per-phase timings of a game loop.
+class FrameProfiler:
+
+    def __init__(self, enabled: bool = True, window: int = 300, output: str = None, overlay: bool = False):
+        """
+        FrameProfiler.__init__(enabled, window, output, overlay):
+        parameters:
+          enabled: whether scopes are timed at all. A disabled profiler costs one method call per scope.
+          window: the number of most recent frames that percentiles are taken over.
+          output: file every frame is appended to, a .csv table (one column per phase, in ms) or a .json trace
+                  (trace-event format). None for no file.
+          overlay: whether draw() shows anything. Toggled with F3 by handleEvent().
+        """
+        self.enabled = enabled
+        self.window = window
+        self.overlay = overlay
+        self.frames = 0
+        self._scopes = {}
+        self._current = {}
+        self._events = []
+        self._history = {}
+        self._frameStart = time.perf_counter_ns()
+        self._origin = self._frameStart
+        self._lines = []
+        self._output = output
+        self._file = None
+        self._columns = None
+
+    def scope(self, name: str):
+        """
+        Context manager timing the code inside it as part of the named phase of this frame:
+            with profiler.scope("physics"):
+                simulation.step(dt)
+        A phase entered several times in one frame adds up.
+        """
+        if not self.enabled:
+            return _NULL_SCOPE
+        scope = self._scopes.get(name)
+        if scope is None:
+            scope = self._scopes[name] = _Scope(self, name)
+        return scope
+
+    def _add(self, name: str, start: int, stop: int) -> None:
+        self._current[name] = self._current.get(name, 0) + (stop - start)
+        if self._output is not None:
+            self._events.append((name, start, stop))
+
+    def endFrame(self) -> None:
+        """
+        Closes the current frame: its phase times (and the whole frame, as "frame") go into the rolling window
+        and the output file. Call once per loop iteration, after the last scope.
+        """
+        if not self.enabled:
+            return
+        now = time.perf_counter_ns()
+        self._current["frame"] = now - self._frameStart
+        slot = self.frames % self.window
+        for name, duration in self._current.items():
+            if name not in self._history:
+                self._history[name] = np.full(self.window, np.nan)
+            self._history[name][slot] = duration / 1e6
+        for name, history in self._history.items():
+            if name not in self._current:
+                history[slot] = 0.0
+        if self._output is not None:
+            self._write(self._frameStart, now)
+        self._current = {}
+        self._events = []
+        self._frameStart = now
+        self.frames += 1
+
+    def percentiles(self, name: str, quantiles=(50, 95, 99)) -> np.ndarray:
+        """
+        The given percentiles of a phase over the rolling window, in ms.
+        """
+        history = self._history.get(name)
+        if history is None or self.frames == 0:
+            return np.zeros(len(quantiles))
+        return np.nanpercentile(history, quantiles)
+
+    def summary(self) -> dict:
+        """
+        Returns a dict from every phase name (and "frame") to its 50th, 95th and 99th percentile, in ms.
+        """
+        return {name: tuple(self.percentiles(name)) for name in self._history}
+
+    # *** OUTPUT ***
+
+    def _write(self, frameStart: int, frameEnd: int) -> None:
+        if self._file is None:
+            self._file = open(self._output, "w")
+            if not self._output.endswith(".csv"):
+                # the trace-event format allows the closing bracket to be missing, so a crashed run still loads
+                self._file.write("[")
+        if self._output.endswith(".csv"):
+            if self._columns is None:
+                # the phases seen in the first frame fix the columns
+                self._columns = [name for name in self._current if name != "frame"]
+                self._file.write(",".join(["frame", "total"] + self._columns) + "\n")
+            values = [self._current.get(name, 0) / 1e6 for name in ["frame"] + self._columns]
+            self._file.write("{},".format(self.frames) + ",".join("{:.4f}".format(value) for value in values) + "\n")
+        else:
+            events = [("frame", frameStart, frameEnd)] + self._events
+            for name, start, stop in events:
+                event = {"name": name, "ph": "X", "pid": 0, "tid": 0,
+                         "ts": (start - self._origin) / 1e3, "dur": (stop - start) / 1e3}
+                self._file.write(("\n" if self.frames == 0 and name == "frame" else ",\n") + json.dumps(event))
+
+    def close(self) -> None:
+        """
+        Finishes and closes the output file, if any.
+        """
+        if self._file is None:
+            return
+        if not self._output.endswith(".csv"):
+            self._file.write("\n]\n")
+        self._file.close()
+        self._file = None
+
+    # *** OVERLAY ***
+
+    def handleEvent(self, event: pygame.event.Event) -> None:
+        """
+        F3 toggles the overlay (and turns the profiler on with it). Other events are ignored.
+        """
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.overlay = not self.overlay
+            if self.overlay and not self.enabled:
+                self.enabled = True
+                self._frameStart = time.perf_counter_ns()
+
+    def draw(self, surface: pygame.Surface, location: pygame.Vector2, every: int = 15):
+        """
+        FrameProfiler.draw(surface, location, every):
+        parameters:
+          surface: the pygame surface to draw on, usually the screen.
+          location: top left corner of the overlay.
+          every: the numbers are refreshed every this many frames, so the text stays readable and cheap.
+        *************
+        Renders one line per phase with its 50th, 95th and 99th percentile frame time.
+        Returns the rect of the surface that was drawn on, or None if the overlay is hidden.
+        """
+        if not (self.enabled and self.overlay):
+            return None
+        if self.frames % every == 0 or len(self._lines) != len(self._history):
+            summary = self.summary()
+            while len(self._lines) < len(summary):
+                line = Text()
+                line.set_font("consolas", 12, False, False, "green")
+                self._lines.append(line)
+            for line, (name, (p50, p95, p99)) in zip(self._lines, summary.items()):
+                line.text("{:<10} p50 {:6.2f}  p95 {:6.2f}  p99 {:6.2f} ms".format(name, p50, p95, p99))
+        location = pygame.Vector2(location)
+        rects = [line.render(surface, location + pygame.Vector2(0, 14 * index)) for index, line in enumerate(self._lines)]
+        return rects[0].unionall(rects[1:]) if rects else None
@@ -0,0 +1,185 @@
+# File: renderer.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, bulk point rendering for large particle systems
+#   18-OCT-2026 --> added drawTiles() for zoomed-out views
+#   18-OCT-2026 --> added drawSegments() for many straight lines at once
+#
+# Drawing thousands of bodies with one pygame.draw.circle call each costs one Python -> C call per body.
+# The functions here draw a whole array of positions at once: small bodies are scattered straight into the
+# surface's pixel buffer through pygame.surfarray, larger ones are blitted from a pre-rendered sprite with a
+# single Surface.blits call, and the density mode accumulates how many bodies land on each pixel.
+# Line segments (e.g. an ArrowField in Utils/arrow.py) are rasterized the same way as scattered points.
+
+import numpy as np
+import pygame
+
+# pixel offsets covered by pygame.draw.circle(radius=1) around int(center): a 2x2 block up and to the left
+_RADIUS_ONE_STAMP = ((-1, -1), (-1, 0), (0, -1), (0, 0))
+
+# sprites already rendered, keyed by (color, radius)
+_sprites = {}
+
+
+def _pixelCoordinates(positions: np.ndarray):
+    """Returns integer x and y pixel coordinates of the positions, like pygame does when drawing."""
+    return positions[:, 0].astype(np.intp), positions[:, 1].astype(np.intp)
+
+
+def _canScatter(surface: pygame.Surface) -> bool:
+    # surfarray.pixels2d only supports 8, 16 and 32 bit surfaces
+    return surface.get_bytesize() in (1, 2, 4)
+
+
+def getSprite(color: pygame.Color, radius: float) -> pygame.Surface:
+    """
+    Returns a transparent surface with a single circle of the given color and radius drawn at its center.
+    Sprites are rendered once and reused.
+    """
+    key = (tuple(pygame.Color(color)), radius)
+    if key not in _sprites:
+        size = int(2 * radius) + 2
+        sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(surface=sprite, color=color, center=(size // 2, size // 2), radius=radius)
+        _sprites[key] = sprite
+    return _sprites[key]
+
+
+def drawPoints(surface: pygame.Surface, positions: np.ndarray, color: pygame.Color, radius: float = 1) -> None:
+    """
+    drawPoints(surface, positions, color, radius):
+    parameters:
+      surface: the pygame surface to draw on, usually the screen.
+      positions: array of shape (N, 2) with the center of each body, in px.
+      color: color of every body.
+      radius: radius of every body, in px.
+    *************
+    Draws every body as a circle, looking the same as calling pygame.draw.circle once per body.
+    Bodies with radius 1 or less are written directly into the pixel buffer in one vectorized assignment.
+    Larger bodies are blitted from a cached sprite with a single Surface.blits call, once per occupied pixel.
+    Bodies outside the surface are skipped.
+    """
+    if len(positions) == 0:
+        return
+    if radius <= 1 and _canScatter(surface):
+        x, y = _pixelCoordinates(positions)
+        width, height = surface.get_size()
+        mapped = surface.map_rgb(pygame.Color(color))
+        pixels = pygame.surfarray.pixels2d(surface)
+        for dx, dy in ((0, 0),) if radius < 1 else _RADIUS_ONE_STAMP:
+            px, py = x + dx, y + dy
+            inside = (px >= 0) & (px < width) & (py >= 0) & (py < height)
+            pixels[px[inside], py[inside]] = mapped
+        # the surface stays locked until the pixel array is released
+        del pixels
+    else:
+        sprite = getSprite(color, radius)
+        offset = np.array(sprite.get_size()) // 2
+        # bodies on the same pixel would blit the same sprite to the same place, so each pixel is drawn once
+        x, y = _pixelCoordinates(positions)
+        left, top = x.min(), y.min()
+        rows = y.max() - top + 1
+        pixels = np.unique((x - left) * rows + (y - top))
+        corners = (np.stack(np.divmod(pixels, rows), axis=1) + (left, top) - offset).tolist()
+        surface.blits([(sprite, corner) for corner in corners], doreturn=False)
+
+
+def drawSegments(surface: pygame.Surface, starts: np.ndarray, ends: np.ndarray, color: pygame.Color, width: int = 1):
+    """
+    drawSegments(surface, starts, ends, color, width):
+    parameters:
+      surface: the pygame surface to draw on, usually the screen.
+      starts, ends: arrays of shape (N, 2) with the two ends of each segment, in px.
+      color: color of every segment.
+      width: thickness of the segments, in px.
+    *************
+    Draws N straight lines, looking close to calling pygame.draw.line once per segment. Every segment is sampled
+    once per pixel along its longer axis, all segments at once, and the samples are written into the pixel buffer
+    in one vectorized assignment, so the cost follows the number of pixels drawn rather than the number of calls.
+    Pixels outside the surface are skipped. Returns the rect of the surface that was drawn on, or None for no segments.
+    """
+    starts = np.asarray(starts, dtype=float).reshape(-1, 2)
+    ends = np.asarray(ends, dtype=float).reshape(-1, 2)
+    if len(starts) == 0:
+        return None
+    if not _canScatter(surface):
+        rects = [pygame.draw.line(surface, color, start, end, width) for start, end in zip(starts.tolist(), ends.tolist())]
+        return rects[0].unionall(rects[1:])
+    # like pygame.draw.line: truncate the ends to whole pixels, then step one pixel at a time along the longer axis
+    starts, ends = np.floor(starts), np.floor(ends)
+    delta = ends - starts
+    samples = np.maximum(np.abs(delta[:, 0]), np.abs(delta[:, 1])).astype(np.intp) + 1
+    # every sample's step number along its own segment, and how far its segment moves per step
+    steps = np.arange(samples.sum()) - np.repeat(np.cumsum(samples) - samples, samples)
+    stride = delta / np.maximum(samples - 1, 1)[:, np.newaxis]
+    x = np.floor(np.repeat(starts[:, 0] + 0.5, samples) + steps * np.repeat(stride[:, 0], samples)).astype(np.intp)
+    y = np.floor(np.repeat(starts[:, 1] + 0.5, samples) + steps * np.repeat(stride[:, 1], samples)).astype(np.intp)
+    surfaceWidth, surfaceHeight = surface.get_size()
+    mapped = surface.map_rgb(pygame.Color(color))
+    pixels = pygame.surfarray.pixels2d(surface)
+    low = -((width - 1) // 2)
+    for dx in range(low, low + width):
+        for dy in range(low, low + width):
+            px, py = x + dx, y + dy
+            inside = (px >= 0) & (px < surfaceWidth) & (py >= 0) & (py < surfaceHeight)
+            pixels[px[inside], py[inside]] = mapped
+    del pixels
+    return pygame.Rect(int(x.min()) + low, int(y.min()) + low, int(x.max() - x.min()) + width, int(y.max() - y.min()) + width)
+
+
+def drawDensity(surface: pygame.Surface, positions: np.ndarray, color: pygame.Color, gain: float = 0.25) -> None:
+    """
+    drawDensity(surface, positions, color, gain):
+    parameters:
+      surface: the pygame surface to draw on, usually the screen.
+      positions: array of shape (N, 2) with the location of each body, in px.
+      color: the color of a fully saturated pixel.
+      gain: how quickly a pixel saturates. A pixel holding n bodies gets brightness 1 - exp(-gain * n).
+    *************
+    Counts how many bodies fall on each pixel and adds color scaled by that brightness to the surface,
+    so dense parts of the belt glow brighter instead of saturating at one body per pixel.
+    """
+    width, height = surface.get_size()
+    x, y = _pixelCoordinates(positions)
+    inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+    counts = np.bincount(x[inside] * height + y[inside], minlength=width * height)
+    # only pixels holding at least one body are touched
+    hit = np.flatnonzero(counts)
+    hx, hy = np.divmod(hit, height)
+    brightness = 1.0 - np.exp(-gain * counts[hit])
+    glow = brightness[:, np.newaxis] * np.array(pygame.Color(color)[:3], dtype=float)
+    pixels = pygame.surfarray.pixels3d(surface)
+    pixels[hx, hy] = np.minimum(pixels[hx, hy] + glow, 255).astype(np.uint8)
+    del pixels
+
+
+def drawTiles(surface: pygame.Surface, positions: np.ndarray, color: pygame.Color, tileSize: int, gain: float = 0.25) -> None:
+    """
+    drawTiles(surface, positions, color, tileSize, gain):
+    parameters:
+      surface: the pygame surface to draw on, usually the screen.
+      positions: array of shape (N, 2) with the location of each body, in px.
+      color: the color of a fully saturated tile.
+      tileSize: width of a square tile, in px.
+      gain: how quickly a tile saturates, as for drawDensity(), per body per pixel of the tile.
+    *************
+    Level-of-detail version of drawDensity(): bodies are counted per tile instead of per pixel and every occupied
+    tile is filled with one color. The cost after counting depends on the number of tiles on screen, not on N.
+    """
+    width, height = surface.get_size()
+    columns, rows = width // tileSize, height // tileSize
+    if len(positions) == 0 or columns == 0 or rows == 0:
+        return
+    tx = (positions[:, 0] // tileSize).astype(np.intp)
+    ty = (positions[:, 1] // tileSize).astype(np.intp)
+    inside = (tx >= 0) & (tx < columns) & (ty >= 0) & (ty < rows)
+    counts = np.bincount(tx[inside] * rows + ty[inside], minlength=columns * rows)
+    hit = np.flatnonzero(counts)
+    hx, hy = np.divmod(hit, rows)
+    brightness = 1.0 - np.exp(-gain * counts[hit] / (tileSize * tileSize))
+    glow = brightness[:, np.newaxis] * np.array(pygame.Color(color)[:3], dtype=float)
+    pixels = pygame.surfarray.pixels3d(surface)
+    # view the screen as (column, x in tile, row, y in tile, channel) so each tile is one index
+    tiles = pixels[:columns * tileSize, :rows * tileSize].reshape(columns, tileSize, rows, tileSize, 3)
+    tiles[hx, :, hy, :] = np.minimum(tiles[hx, :, hy, :] + glow[:, np.newaxis, np.newaxis, :], 255).astype(np.uint8)
+    del tiles, pixels
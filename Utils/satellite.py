@@ -1,28 +1,44 @@
 # Programmer: Connor Fricke
 # File: satellite.py
 # Latest Revision: 22-APR-2024 ---> Created
+#                  18-OCT-2026 ---> pluggable integrators in update()
+#                  18-OCT-2026 ---> optional camera in draw()
+#                  18-OCT-2026 ---> __slots__ instead of a per-instance __dict__
+#                  18-OCT-2026 ---> draw() returns the rect it touched, see Utils/scene.py
 #
 # Class file for Satellite. Primary object used in PyGame orbital simulations.
+# Satellites are for a handful of bodies; populations of thousands belong in a ParticleSystem (Utils/particles.py).
 
 import pygame
 
+from Utils.integrators import getIntegrator
+
 class Satellite:
     """
     Main orbitor object in simulation.
     """
-    def __init__(self, radius: float, mass: float):
+    # no per-instance __dict__, so only these attributes exist
+    __slots__ = ("RADIUS", "MASS", "integrator", "position", "velocity", "acceleration")
+
+    def __init__(self, radius: float, mass: float, integrator: str = "euler"):
         # constants
         self.RADIUS = radius
         self.MASS = mass
+        # name of the integrator used by update() when it is given an acceleration function
+        self.integrator = integrator
         # variables
         self.position = pygame.Vector2(0,0)
         self.velocity = pygame.Vector2(0,0)        
         self.acceleration = pygame.Vector2(0,0)
 
     # call draw() to automatically draw the circle with it's current attributes
-    def draw(self, surface: pygame.Surface, color: pygame.Color) -> None:
-        """Renders Satellite object as a circle"""
-        pygame.draw.circle(surface=surface, color=color, center=self.position, radius=self.RADIUS)
+    def draw(self, surface: pygame.Surface, color: pygame.Color, camera=None) -> pygame.Rect:
+        """Renders Satellite object as a circle, seen through a Camera (Utils/camera.py) if one is given.
+        Returns the rect of the surface that was drawn on."""
+        if camera is None:
+            return pygame.draw.circle(surface=surface, color=color, center=self.position, radius=self.RADIUS)
+        return pygame.draw.circle(surface=surface, color=color, center=camera.toScreen(self.position),
+                                  radius=max(self.RADIUS * camera.zoom, 1))
 
     def setPosition(self, pos: pygame.Vector2):
         self.position = pos
@@ -30,10 +46,18 @@ class Satellite:
     def setVelocity(self, vel: pygame.Vector2):
         self.velocity = vel
 
-    def update(self, deltaTime: float):
+    def update(self, deltaTime: float, accelFunc=None):
         """
-        Calculates instantaneous velocity and position change based on accelaration
+        Calculates instantaneous velocity and position change based on accelaration.
+        Without accelFunc, the current acceleration is used for a semi-implicit Euler step.
+        With accelFunc (a function of position returning an acceleration), the Satellite's integrator
+        is used instead and acceleration is refreshed to accelFunc(new position). The acceleration must
+        equal accelFunc(position) before the first such call. See Utils/integrators.py.
         """
+        if accelFunc is not None:
+            step = getIntegrator(self.integrator)
+            self.position, self.velocity, self.acceleration = step(self.position, self.velocity, self.acceleration, accelFunc, deltaTime)
+            return
         # v_f = v_0 + at
         self.velocity += self.acceleration * deltaTime
         # x_f = x_0 + vt
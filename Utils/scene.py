@@ -0,0 +1,113 @@
+# File: scene.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, dirty-rectangle drawing over a cached static layer
+#
+# Class file for Scene. A game loop that fills the screen, redraws everything and flips pays for the whole window
+# every frame, even when only a small orbitor and a line of text move. A Scene keeps the parts that do not change
+# (the background color, the gradient grid, the sun) pre-composited on one background surface. Each frame it
+# erases only the rects drawn in the previous frame by copying that background back over them, the loop draws the
+# moving parts again and hands their rects to add(), and present() sends only the previous and current rects to
+# the display with pygame.display.update(). What is filled and presented then scales with what moves.
+#
+# Every drawable's draw function returns the rect it touched (Satellite, Arrow, Trail, Text, Grid and
+# FrameProfiler), so it can be passed straight to add().
+
+import pygame
+
+# above this many dirty rects, or this fraction of the window, a single full update is cheaper
+MAX_RECTS = 64
+MAX_DIRTY_FRACTION = 0.5
+
+
+# *** CLASS DEFINITION ***
+
+# SCENE: a cached static layer plus the rects drawn over it this frame and the last.
+class Scene:
+
+    def __init__(self, screen: pygame.Surface, background: pygame.Color = "black", fullRedraw: bool = False):
+        """
+        Scene.__init__(screen, background, fullRedraw):
+        parameters:
+          screen: the display surface, from pygame.display.set_mode().
+          background: the color under everything.
+          fullRedraw: restore and present the whole window every frame, as a game loop without a Scene would.
+                      Useful for comparing, and for scenes where most of the window moves anyway.
+        *************
+        A frame is begin(), then drawing the moving parts onto the screen and passing each returned rect to add(),
+        then present() in place of pygame.display.flip().
+        """
+        self.screen = screen
+        self.color = background
+        self.fullRedraw = fullRedraw
+        self.background = pygame.Surface(screen.get_size()).convert(screen)
+        self.pixelsPresented = 0
+        self._static = []
+        self._stale = True
+        self._full = True
+        self._previous = []
+        self._current = []
+
+    def addStatic(self, drawFunc) -> None:
+        """
+        Adds a function of a surface that draws a part of the scene that does not change from frame to frame,
+        e.g. lambda surface: grid.drawRectangles(surface, colorFunction4). Static parts are drawn in the order they
+        were added, onto the background surface, only when the static layer is rebuilt.
+        """
+        self._static.append(drawFunc)
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        """
+        Rebuilds the static layer at the next begin(), and presents that frame in full. Call when something static
+        has changed, such as the camera moving or a Grid's matrix changing.
+        """
+        self._stale = True
+
+    def begin(self) -> None:
+        """
+        Starts a frame: erases everything drawn in the previous frame (or the whole screen, after invalidate()),
+        leaving the static layer on screen.
+        """
+        if self._stale:
+            self.background.fill(self.color)
+            for drawFunc in self._static:
+                drawFunc(self.background)
+            self._stale = False
+            self._full = True
+        if self._full or self.fullRedraw:
+            self.screen.blit(self.background, (0, 0))
+        else:
+            for rect in self._previous:
+                self.screen.blit(self.background, rect, rect)
+
+    def add(self, rect):
+        """
+        Records a rect that was drawn on this frame, e.g. scene.add(orbitor.draw(screen, "blue", camera)).
+        None (nothing drawn) is ignored. Returns rect.
+        """
+        if rect is not None:
+            # antialiased edges may spill a pixel past the rect a draw function reports
+            self._current.append(pygame.Rect(rect).inflate(2, 2))
+        return rect
+
+    def present(self) -> None:
+        """
+        Ends the frame: sends the rects drawn in this frame and the previous one (which were erased) to the display,
+        or the whole window when that is cheaper. pixelsPresented holds the number of pixels sent.
+        """
+        bounds = self.screen.get_rect()
+        full = self._full or self.fullRedraw
+        if not full:
+            dirty = [rect.clip(bounds) for rect in self._previous + self._current]
+            dirty = [rect for rect in dirty if rect.width and rect.height]
+            area = sum(rect.width * rect.height for rect in dirty)
+            full = len(dirty) > MAX_RECTS or area > MAX_DIRTY_FRACTION * bounds.width * bounds.height
+        if full:
+            pygame.display.flip()
+            self.pixelsPresented = bounds.width * bounds.height
+        else:
+            pygame.display.update(dirty)
+            self.pixelsPresented = area
+        self._previous, self._current = self._current, []
+        self._full = False
@@ -0,0 +1,418 @@
+# File: simulation.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, fixed-timestep simulation core shared by the windowed and headless runs
+#   18-OCT-2026 --> runHeadless() can call back after every step (e.g. for telemetry)
+#   18-OCT-2026 --> save() and restore() checkpoints, see Utils/snapshot.py
+#   18-OCT-2026 --> optional asteroid collisions in BeltSimulation, see Utils/collisions.py
+#   18-OCT-2026 --> --profile option for the windowed runs, see Utils/profiler.py
+#   18-OCT-2026 --> --frames option to close the window by itself, for benchmark.py
+#   18-OCT-2026 --> exact Kepler propagation, orbital period and elements from Utils/kepler.py
+#   18-OCT-2026 --> storage precision of the belt
+#   18-OCT-2026 --> --pipeline option to step on a separate thread, see Utils/pipeline.py
+#   18-OCT-2026 --> Utils/parallel.py (and multiprocessing) only imported when workers are used
+#   18-OCT-2026 --> diagnostics() for Utils/diagnostics.py, orbit angular momentum from the cross product
+#   18-OCT-2026 --> --diagnostics, --drift-threshold and --auto-dt options
+#   18-OCT-2026 --> unbound orbits allowed again outside kepler mode, elements and period are then None
+#   18-OCT-2026 --> BeltSimulation raises ValueError for physics options it cannot combine instead of dropping them
+#
+# The physics of orbit.py and asteroid_belt.py, separated from their game loops. A simulation only knows
+# how to take one step of a given length; the windowed scripts decide how many fixed steps fit in each
+# rendered frame with FixedTimestep, and runHeadless() simply takes N steps as fast as possible without
+# ever touching pygame.display.
+
+import argparse
+import math
+import time
+
+import numpy as np
+import pygame
+
+from Utils.satellite import Satellite
+from Utils.particles import ParticleSystem
+from Utils.gravity import CentralField
+from Utils.quadtree import barnesHutAccelerations
+from Utils.adaptive import BlockTimestepper, advanceSatellite
+from Utils.snapshot import Snapshot, saveSnapshot
+from Utils.collisions import Collisions
+from Utils.kepler import KeplerPropagator, stateToElements, elementsToState
+from Utils.distributions import gravitationalParameter
+from Utils.diagnostics import DiagnosticSample, ConservationMonitor, measure, pairPotentialEnergy, largestSafeTimestep, formatDrift
+
+
+# *** FIXED TIMESTEP ***
+
+# FIXEDTIMESTEP: turns variable frame times into a whole number of equal physics steps.
+class FixedTimestep:
+
+    def __init__(self, stepSize: float, maxSteps: int = 10):
+        """
+        FixedTimestep.__init__(stepSize, maxSteps):
+        parameters:
+          stepSize: the real time covered by one physics step, in seconds.
+          maxSteps: the most steps advance() will ask for in one frame. If the physics cannot keep up, the
+                    leftover time is dropped instead of piling up (and the simulation runs slower than real time).
+        """
+        self.stepSize = stepSize
+        self.maxSteps = maxSteps
+        self.accumulator = 0.0
+
+    def advance(self, frameTime: float) -> int:
+        """
+        Adds the real time of the last frame and returns how many physics steps should be taken now.
+        """
+        self.accumulator += frameTime
+        steps = int(self.accumulator / self.stepSize)
+        if steps > self.maxSteps:
+            steps = self.maxSteps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.stepSize
+        return steps
+
+    def alpha(self) -> float:
+        """
+        Fraction of a step left over in the accumulator, for interpolating between the last two states.
+        """
+        return self.accumulator / self.stepSize
+
+
+def headlessArguments(description: str, steps: int, deltaTime: float) -> argparse.ArgumentParser:
+    """
+    Returns an argument parser with the options shared by every simulation script:
+    --headless, --steps, --dt, --save, --load, --profile, --frames, --pipeline, --diagnostics, --drift-threshold and
+    --auto-dt. Scripts may add their own options before parsing.
+    """
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--headless", action="store_true", help="run without a window and print a summary")
+    parser.add_argument("--steps", type=int, default=steps, help="number of fixed steps to take when headless")
+    parser.add_argument("--dt", type=float, default=deltaTime, help="simulated time per step")
+    parser.add_argument("--save", default=None, help="write a snapshot of the final state to this file")
+    parser.add_argument("--load", default=None, help="continue from a snapshot file instead of the initial conditions")
+    parser.add_argument("--profile", default=None, help="record per-phase frame times to a .csv file or .json trace")
+    parser.add_argument("--frames", type=int, default=0, help="close the window after this many frames, 0 to run until closed")
+    parser.add_argument("--pipeline", action="store_true", help="step the simulation on its own thread and draw interpolated states")
+    parser.add_argument("--diagnostics", type=int, default=0, metavar="INTERVAL",
+                        help="when headless, check energy and angular momentum every INTERVAL steps, 0 for never")
+    parser.add_argument("--drift-threshold", type=float, default=1e-3, help="relative drift of energy or angular momentum to alert at")
+    parser.add_argument("--auto-dt", action="store_true",
+                        help="when headless, first find the largest step that stays below --drift-threshold over the run")
+    return parser
+
+
+def chooseTimestep(arguments: argparse.Namespace, createSimulation):
+    """
+    chooseTimestep(arguments, createSimulation):
+    parameters:
+      arguments: options from a headlessArguments() parser.
+      createSimulation: function of no arguments returning a fresh simulation to try steps on.
+    *************
+    Returns (steps, deltaTime) for a headless run: --steps and --dt as given, or with --auto-dt the largest power of
+    two times --dt (from 16 down to 1/64 times) whose drift over the same simulated time stays below
+    --drift-threshold (see largestSafeTimestep() in Utils/diagnostics.py), with the steps to cover that time.
+    Raises ValueError if no step is safe.
+    """
+    if not arguments.auto_dt:
+        return arguments.steps, arguments.dt
+    duration = arguments.steps * arguments.dt
+    deltaTime, drift = largestSafeTimestep(createSimulation, [arguments.dt * 2.0 ** power for power in range(4, -7, -1)],
+                                           duration, arguments.drift_threshold)
+    if deltaTime is None:
+        raise ValueError("no step down to {} s keeps the drift below {} (drift {})".format(
+            arguments.dt / 64, arguments.drift_threshold, formatDrift(drift)))
+    print("Largest safe step: {} s (drift {} over {} s)".format(deltaTime, formatDrift(drift), duration))
+    return math.ceil(duration / deltaTime - 1e-9), deltaTime
+
+
+def conservationMonitor(arguments: argparse.Namespace):
+    """
+    Returns a ConservationMonitor for --diagnostics and --drift-threshold that prints its alerts, or None without
+    --diagnostics.
+    """
+    if arguments.diagnostics <= 0:
+        return None
+    return ConservationMonitor(arguments.diagnostics, arguments.drift_threshold, onAlert=lambda alert: print("Alert:", alert))
+
+
+def runHeadless(simulation, steps: int, deltaTime: float, onStep=None) -> float:
+    """
+    Takes the given number of fixed steps of the simulation, as fast as the CPU allows.
+    If given, onStep(simulation) is called after every step.
+    Returns the wall-clock time taken, in seconds.
+    """
+    start = time.perf_counter()
+    for _ in range(steps):
+        simulation.step(deltaTime)
+        if onStep is not None:
+            onStep(simulation)
+    return time.perf_counter() - start
+
+
+# *** SIMULATIONS ***
+
+# ORBITSIMULATION: a single orbitor around a fixed sun (orbit.py).
+class OrbitSimulation:
+
+    def __init__(self, center, sunMass: float, orbitorMass: float, initialPosition, initialVelocity, grav: float,
+                 integrator: str = "leapfrog", adaptive: bool = True, kepler: bool = False):
+        """
+        OrbitSimulation.__init__(center, sunMass, orbitorMass, initialPosition, initialVelocity, grav, integrator, adaptive,
+                                 kepler):
+        parameters:
+          center: location of the sun, in px (1 px = 1 m).
+          sunMass, orbitorMass: masses in kg.
+          initialPosition, initialVelocity: starting state of the orbitor.
+          grav: the gravitational constant.
+          integrator: name of the orbitor's integrator, see Utils/integrators.py.
+          adaptive: subdivide steps where the orbit curves sharply, see Utils/adaptive.py.
+          kepler: place the orbitor on its exact two-body orbit instead of integrating, see Utils/kepler.py.
+        """
+        self.grav = grav
+        self.adaptive = adaptive
+        self.kepler = kepler
+        self.sun = Satellite(mass=sunMass, radius=20.0)
+        self.sun.setPosition(pygame.Vector2(center))
+        self.orbitor = Satellite(mass=orbitorMass, radius=10.0, integrator=integrator)
+        self.orbitor.position = pygame.Vector2(initialPosition)
+        self.orbitor.velocity = pygame.Vector2(initialVelocity)
+        self.orbitor.acceleration = self.gravity(self.orbitor.position)
+        self.time = 0.0
+        self.steps = 0
+        self._startKepler()
+
+    @property
+    def elements(self):
+        """
+        OrbitalElements of the orbitor's current state (semi-major axis, eccentricity, period, energy...), see Utils/kepler.py.
+        None while the orbitor is not bound to the sun (moving at or above escape speed).
+        """
+        try:
+            return stateToElements(tuple(self.orbitor.position), tuple(self.orbitor.velocity), tuple(self.sun.position),
+                                   self.grav * self.sun.MASS)
+        except ValueError:
+            return None
+
+    @property
+    def angularMomentum(self) -> float:
+        """
+        Angular momentum of the orbitor about the sun, m (r x v), in kg m^2/s. Planar, so only its z component.
+        """
+        return self.orbitor.MASS * (self.orbitor.position - self.sun.position).cross(self.orbitor.velocity)
+
+    def diagnostics(self) -> DiagnosticSample:
+        """
+        Energy, angular momentum and orbit of the orbitor now, see Utils/diagnostics.py.
+        """
+        return measure(np.array([self.orbitor.position]), np.array([self.orbitor.velocity]), self.orbitor.MASS,
+                       self.sun.position, self.grav * self.sun.MASS, self.time)
+
+    @property
+    def period(self) -> float:
+        """
+        Orbital period of the orbitor, in s, from its current state. None while the orbitor is not bound.
+        """
+        elements = self.elements
+        return None if elements is None else float(elements.period)
+
+    def _startKepler(self) -> None:
+        # in kepler mode the orbit as it is now (at time _epoch) is the one propagated from then on
+        self._epoch = self.time
+        self._anomaly = None
+        self._elements = None
+        if self.kepler:
+            self._elements = self.elements
+            if self._elements is None:
+                raise ValueError("kepler mode needs the orbitor on a bound orbit")
+
+    def gravity(self, position: pygame.Vector2) -> pygame.Vector2:
+        """
+        Acceleration towards the sun at the given position.
+        """
+        # force points from circle position to the center
+        radius = (position - self.sun.position)
+        rhat = radius / radius.magnitude()
+        # a = GM/r^2
+        return -((self.grav * self.sun.MASS) / (radius.magnitude() * radius.magnitude())) * rhat
+
+    def step(self, deltaTime: float) -> None:
+        """
+        Advances the orbitor by deltaTime (NOT the sun... assuming Keplerian Limit M >> m).
+        """
+        if self.kepler:
+            position, velocity, self._anomaly = elementsToState(self._elements, tuple(self.sun.position),
+                                                                self.time + deltaTime - self._epoch, self._anomaly)
+            self.orbitor.position = pygame.Vector2(*position)
+            self.orbitor.velocity = pygame.Vector2(*velocity)
+            self.orbitor.acceleration = self.gravity(self.orbitor.position)
+        elif self.adaptive:
+            advanceSatellite(self.orbitor, self.gravity, deltaTime)
+        else:
+            self.orbitor.update(deltaTime, self.gravity)
+        self.time += deltaTime
+        self.steps += 1
+
+    def save(self, path: str, rng=None) -> None:
+        """
+        Writes a snapshot with the sun as body 0 and the orbitor as body 1.
+        """
+        bodies = (self.sun, self.orbitor)
+        saveSnapshot(path, np.array([tuple(body.position) for body in bodies]), np.array([tuple(body.velocity) for body in bodies]),
+                     np.array([body.MASS for body in bodies]), self.time, self.steps, rng, {"simulation": "orbit"})
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """
+        Continues from a snapshot written by save().
+        """
+        if snapshot.metadata.get("simulation") != "orbit":
+            raise ValueError("snapshot was not written by OrbitSimulation")
+        for index, body in enumerate((self.sun, self.orbitor)):
+            body.position = pygame.Vector2(*snapshot.positions[index])
+            body.velocity = pygame.Vector2(*snapshot.velocities[index])
+            body.MASS = float(snapshot.masses[index])
+        self.orbitor.acceleration = self.gravity(self.orbitor.position)
+        self.time = snapshot.time
+        self.steps = snapshot.steps
+        self._startKepler()
+
+
+# BELTSIMULATION: many asteroids around a fixed star (asteroid_belt.py).
+class BeltSimulation:
+
+    def __init__(self, positions, velocities, center, starMass: float, asteroidMass: float, grav: float, scale: float,
+                 integrator: str = "euler", selfGravity: bool = False, theta: float = 0.5, softening: float = 0.0,
+                 workers: int = 1, adaptive: bool = False, collisions: bool = False, asteroidRadius: float = 0.5,
+                 kepler: bool = False, precision: str = "float64"):
+        """
+        BeltSimulation.__init__(positions, velocities, center, starMass, asteroidMass, grav, scale, integrator,
+                                selfGravity, theta, softening, workers, adaptive, collisions, asteroidRadius, kepler,
+                                precision):
+        parameters:
+          positions, velocities: arrays of shape (N, 2) with the starting state of the asteroids, in px and px/s.
+          center: location of the star, in px.
+          starMass, asteroidMass: masses in kg. asteroidMass may also be an array of shape (N,).
+          grav: the gravitational constant.
+          scale: the number of meters per px.
+          integrator: name of the integrator, see Utils/integrators.py.
+          selfGravity, theta, softening: Barnes-Hut N-body mode, see ParticleSystem.addSelfGravity().
+          workers: worker processes for star-only runs, see Utils/parallel.py.
+          adaptive: per-asteroid block timesteps for star-only runs, see Utils/adaptive.py.
+          collisions: merge touching asteroids and remove those that hit the star, see Utils/collisions.py.
+                      The number of asteroids then shrinks over time. Not available with workers.
+          asteroidRadius: collision radius of every asteroid, in px. May also be an array of shape (N,).
+          kepler: move the asteroids along their exact orbits around the star instead of integrating, for star-only
+                  runs, see Utils/kepler.py. Every asteroid must start on a bound orbit.
+          precision: storage of the asteroids, "float64", "float32" or "mixed", see Utils/particles.py.
+        *************
+        At most one of kepler, adaptive and workers > 1 may be given, none of them with selfGravity, and workers
+        not with collisions. Other combinations raise ValueError rather than quietly running without an option.
+        """
+        requested = [name for name, wanted in (("kepler", kepler), ("adaptive", adaptive), ("workers", workers > 1)) if wanted]
+        if selfGravity and requested:
+            raise ValueError("{} cannot be combined with self-gravity".format(" and ".join(requested)))
+        if len(requested) > 1:
+            raise ValueError("only one of kepler, adaptive and workers can be used, got {}".format(" and ".join(requested)))
+        if collisions and workers > 1:
+            raise ValueError("workers cannot be combined with collisions, which change the number of asteroids")
+        self.star = Satellite(radius=20, mass=starMass)
+        self.star.setPosition(pygame.Vector2(center))
+        self.satellites = ParticleSystem(capacity=len(positions), integrator=integrator, precision=precision)
+        self.satellites.addBodies(positions=positions, velocities=velocities, masses=asteroidMass, radii=asteroidRadius)
+        self.grav = grav
+        self.scale = scale
+        self.selfGravity = selfGravity
+        self.theta = theta
+        self.softening = softening
+        self.time = 0.0
+        self.steps = 0
+
+        # same law as getForceBetween in Utils/gravity.py, for every satellite at once
+        self.starGravity = CentralField(self.star.position, starMass, grav, scale)
+        self.satellites.accelerations[:] = self.accelerations(self.satellites.positions)
+        self.collisions = Collisions(self.satellites, self.star.position, self.star.RADIUS) if collisions else None
+
+        # physics is whatever advances the satellites: the system itself, the exact Kepler solution, a block
+        # timestepper, or a pool of workers sharing its arrays (the options were checked above)
+        if kepler:
+            self.physics = KeplerPropagator(self.satellites, self.star.position, gravitationalParameter(starMass, grav, scale))
+        elif adaptive:
+            self.physics = BlockTimestepper(self.satellites)
+        elif workers > 1:
+            # imported here so that runs without workers never load multiprocessing
+            from Utils.parallel import ParallelBackend
+            self.physics = ParallelBackend(self.satellites, workers)
+        else:
+            self.physics = self.satellites
+
+    def accelerations(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Acceleration of the asteroids at the given positions, from the star and (in N-body mode) each other.
+        """
+        accelerations = self.starGravity(positions)
+        if self.selfGravity:
+            accelerations += barnesHutAccelerations(positions, self.satellites.masses, self.grav, self.scale,
+                                                    self.theta, self.softening)
+        return accelerations
+
+    def diagnostics(self) -> DiagnosticSample:
+        """
+        Energy, angular momentum, center of mass and orbits of the asteroids now, see Utils/diagnostics.py. In N-body
+        mode the potential includes every pair of asteroids, summed directly at O(N^2) cost.
+        """
+        positions, masses = self.satellites.positions, self.satellites.masses
+        pairPotential = 0.0
+        if self.selfGravity:
+            pairPotential = pairPotentialEnergy(positions, masses, self.grav, self.scale, self.softening)
+        return measure(positions, self.satellites.velocities, masses, self.star.position,
+                       gravitationalParameter(self.star.MASS, self.grav, self.scale), self.time, pairPotential)
+
+    def step(self, deltaTime: float) -> None:
+        """
+        Advances every asteroid at once by deltaTime with the selected integrator.
+        """
+        self.physics.update(deltaTime, self.accelerations if self.selfGravity else self.starGravity)
+        if self.collisions is not None:
+            merged = self.collisions.resolve()
+            # merged asteroids moved to their centers of mass; in N-body mode every asteroid felt the change
+            if self.selfGravity:
+                self.satellites.accelerations[:] = self.accelerations(self.satellites.positions)
+            elif len(merged):
+                self.satellites.accelerations[merged] = self.starGravity(self.satellites.positions[merged])
+        self.time += deltaTime
+        self.steps += 1
+
+    def save(self, path: str, rng=None) -> None:
+        """
+        Writes a snapshot of every asteroid and the simulation clock, plus the state of rng if given.
+        """
+        saveSnapshot(path, self.satellites.positions, self.satellites.velocities, self.satellites.masses, self.time,
+                     self.steps, rng, {"simulation": "belt", "star": list(self.star.position), "starMass": self.star.MASS},
+                     radii=self.satellites.radii)
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """
+        Continues from a snapshot written by save(). The simulation must hold the same number of asteroids;
+        to start a new run from a snapshot, pass snapshot.positions, snapshot.velocities and snapshot.masses to
+        the constructor and then call restore() for the clock.
+        """
+        if snapshot.metadata.get("simulation") != "belt":
+            raise ValueError("snapshot was not written by BeltSimulation")
+        if snapshot.count != self.satellites.count:
+            raise ValueError("snapshot holds {} asteroids, simulation holds {}".format(snapshot.count, self.satellites.count))
+        self.satellites.positions[:] = snapshot.positions
+        self.satellites.velocities[:] = snapshot.velocities
+        self.satellites.masses[:] = snapshot.masses
+        if snapshot.radii is not None:
+            self.satellites.radii[:] = snapshot.radii
+        self.satellites.accelerations[:] = self.accelerations(self.satellites.positions)
+        if isinstance(self.physics, KeplerPropagator):
+            self.physics.refresh()
+        self.time = snapshot.time
+        self.steps = snapshot.steps
+
+    def close(self) -> None:
+        """
+        Stops any worker processes. The simulation can still be read afterwards but not stepped in parallel.
+        """
+        if hasattr(self.physics, "close"):
+            self.physics.close()
+            self.physics = self.satellites
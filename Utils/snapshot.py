@@ -0,0 +1,136 @@
+# File: snapshot.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, binary checkpoint files for simulation state
+#   18-OCT-2026 --> optional radii array after the masses
+#
+# Checkpoints of a simulation: every body's position, velocity and mass, the simulation clock and the
+# random number generator state. The file has a fixed layout so the body arrays can be memory-mapped
+# straight out of it:
+#
+#   offset 0     64-byte header (see _HEADER_FORMAT)
+#   offset 64    metadata as UTF-8 JSON (RNG state and anything simulation specific), zero padded
+#   dataOffset   positions  (count x 2 float64)
+#                velocities (count x 2 float64)
+#                masses     (count float64)
+#                radii      (count float64, only if metadata["radii"] is true)
+#
+# All numbers are little-endian and dataOffset is a multiple of 64.
+
+import json
+import random
+import struct
+
+import numpy as np
+
+MAGIC = b"PGSNAP01"
+VERSION = 1
+# magic, version, count, time, steps, metadata length, data offset
+_HEADER_FORMAT = "<8sIQdQQQ"
+_HEADER_SIZE = 64
+_ALIGNMENT = 64
+_DTYPE = np.dtype("<f8")
+
+
+class Snapshot:
+    """
+    Contents of a snapshot file. positions, velocities, masses and radii are read-only memory maps when loaded with
+    mmap=True. radii is None if the snapshot was saved without them.
+    """
+    def __init__(self, positions: np.ndarray, velocities: np.ndarray, masses: np.ndarray, time: float, steps: int, metadata: dict,
+                 radii: np.ndarray = None):
+        self.positions = positions
+        self.velocities = velocities
+        self.masses = masses
+        self.radii = radii
+        self.time = time
+        self.steps = steps
+        self.metadata = metadata
+
+    @property
+    def count(self) -> int:
+        return len(self.masses)
+
+
+def rngState(rng) -> dict:
+    """
+    Returns the state of a random.Random or numpy.random.Generator as something that can be stored as JSON.
+    """
+    if isinstance(rng, np.random.Generator):
+        return {"type": "numpy", "state": rng.bit_generator.state}
+    version, internal, gaussNext = rng.getstate()
+    return {"type": "random", "state": [version, list(internal), gaussNext]}
+
+
+def restoreRng(state: dict):
+    """
+    Rebuilds the random.Random or numpy.random.Generator whose state was saved with rngState().
+    """
+    if state["type"] == "numpy":
+        bitGenerator = getattr(np.random, state["state"]["bit_generator"])()
+        bitGenerator.state = state["state"]
+        return np.random.Generator(bitGenerator)
+    version, internal, gaussNext = state["state"]
+    rng = random.Random()
+    rng.setstate((version, tuple(internal), gaussNext))
+    return rng
+
+
+def saveSnapshot(path: str, positions: np.ndarray, velocities: np.ndarray, masses: np.ndarray, time: float, steps: int,
+                 rng=None, metadata: dict = None, radii: np.ndarray = None) -> None:
+    """
+    saveSnapshot(path, positions, velocities, masses, time, steps, rng, metadata, radii):
+    parameters:
+      path: the file to write.
+      positions, velocities: arrays of shape (N, 2).
+      masses: array of shape (N,).
+      time, steps: the simulation clock.
+      rng: a random.Random or numpy.random.Generator whose state should be saved, or None.
+      metadata: any other JSON-serializable values to keep with the snapshot.
+      radii: array of shape (N,), or None.
+    *************
+    The body arrays are written directly from memory with ndarray.tofile(), without intermediate copies.
+    """
+    metadata = dict(metadata or {})
+    if rng is not None:
+        metadata["rng"] = rngState(rng)
+    metadata["radii"] = radii is not None
+    encoded = json.dumps(metadata).encode("utf-8")
+    dataOffset = -(-(_HEADER_SIZE + len(encoded)) // _ALIGNMENT) * _ALIGNMENT
+    header = struct.pack(_HEADER_FORMAT, MAGIC, VERSION, len(masses), float(time), int(steps), len(encoded), dataOffset)
+    with open(path, "wb") as file:
+        file.write(header.ljust(_HEADER_SIZE, b"\0"))
+        file.write(encoded.ljust(dataOffset - _HEADER_SIZE, b"\0"))
+        for array in (positions, velocities, masses) if radii is None else (positions, velocities, masses, radii):
+            np.ascontiguousarray(array, dtype=_DTYPE).tofile(file)
+
+
+def loadSnapshot(path: str, mmap: bool = True) -> Snapshot:
+    """
+    loadSnapshot(path, mmap):
+    parameters:
+      path: a file written by saveSnapshot().
+      mmap: map the body arrays from the file instead of reading them into memory.
+    *************
+    Returns a Snapshot. The RNG state, if one was saved, is in snapshot.metadata["rng"] (see restoreRng()).
+    """
+    with open(path, "rb") as file:
+        header = file.read(_HEADER_SIZE)
+        magic, version, count, time, steps, metadataLength, dataOffset = struct.unpack_from(_HEADER_FORMAT, header)
+        if magic != MAGIC:
+            raise ValueError("{} is not a snapshot file".format(path))
+        if version != VERSION:
+            raise ValueError("{} has snapshot version {}, expected {}".format(path, version, VERSION))
+        metadata = json.loads(file.read(metadataLength).decode("utf-8"))
+
+    hasRadii = metadata.get("radii", False)
+    size = (6 if hasRadii else 5) * count
+    if mmap:
+        data = np.memmap(path, dtype=_DTYPE, mode="r", offset=dataOffset, shape=(size,)) if count else np.zeros(0, _DTYPE)
+    else:
+        data = np.fromfile(path, dtype=_DTYPE, count=size, offset=dataOffset)
+    positions = data[:2 * count].reshape(count, 2)
+    velocities = data[2 * count:4 * count].reshape(count, 2)
+    masses = data[4 * count:5 * count]
+    radii = data[5 * count:] if hasRadii else None
+    return Snapshot(positions, velocities, masses, time, steps, metadata, radii)
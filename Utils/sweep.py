@@ -0,0 +1,271 @@
+# File: sweep.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, parameter sweeps of headless simulations over a process pool
+#   18-OCT-2026 --> energy and angular momentum drift from Utils/diagnostics.py
+#   18-OCT-2026 --> points resumed by simulation, parameters and seed together
+#
+# Exploring how the orbit or the belt depends on a constant used to mean editing orbit.py or asteroid_belt.py and
+# watching the window. A sweep instead runs the headless simulation once per point of a design (every combination
+# of a grid of values, or random samples from ranges) in a pool of worker processes and streams one line of JSON
+# per finished point to a results file:
+#   {"simulation": "belt", "index": 3, "seed": ..., "parameters": {...}, "metrics": {...}}
+# Rerunning the same sweep with the same results file skips the points already in it (the same simulation,
+# parameters and seed), so an interrupted sweep picks up where it stopped. Every point gets its own seed derived
+# from the sweep's seed and the point's index, so results do not depend on which worker ran a point or in what
+# order.
+#
+# The physical setups match the scripts: orbit.py for "orbit" and asteroid_belt.py for "belt". See ORBIT_DEFAULTS
+# and BELT_DEFAULTS for the parameters that can be swept.
+
+import concurrent.futures
+import itertools
+import json
+import os
+
+import numpy as np
+import pygame
+
+from Utils.simulation import OrbitSimulation, BeltSimulation, runHeadless
+from Utils.distributions import gravitationalParameter, gaussianRing, powerLawDisk, keplerianBelt, multipleRings
+from Utils.diagnostics import relativeDrift
+
+GRAV = 6.674E-11 # N m^2 kg^-2
+
+# orbit.py: an orbitor starting distance px to the right of the sun, moving straight down at speed px/s (1 px = 1 m)
+ORBIT_DEFAULTS = {
+    "sunMass": 6.5e15, "orbitorMass": 5.0, "distance": 250.0, "speed": 45.0,
+    "integrator": "leapfrog", "adaptive": True, "kepler": False, "dt": 0.005, "steps": 20000,
+}
+# asteroid_belt.py: count asteroids around a star, spread by distribution (ring, disk, kepler or rings)
+BELT_DEFAULTS = {
+    "stellarMass": 6.5e31, "asteroidMass": 1000.0, "scale": 1e8, "distance": 300.0, "sigma": 5.0, "speed": 37.0,
+    "speedSigma": 1.0, "count": 2000, "distribution": "ring", "integrator": "euler", "adaptive": False,
+    "collisions": False, "kepler": False, "precision": "float64", "dt": 0.1, "steps": 1000,
+}
+
+
+# *** DESIGNS ***
+
+def gridDesign(values: dict) -> list:
+    """
+    gridDesign(values):
+    parameters:
+      values: dict from parameter name to the list of values to try.
+    *************
+    Returns every combination of the values as a list of parameter dicts, the last parameter changing fastest.
+    """
+    names = list(values)
+    return [dict(zip(names, combination)) for combination in itertools.product(*(values[name] for name in names))]
+
+
+def randomDesign(ranges: dict, samples: int, seed: int = 0) -> list:
+    """
+    randomDesign(ranges, samples, seed):
+    parameters:
+      ranges: dict from parameter name to a (low, high) tuple, sampled uniformly, or a list of values, sampled
+              with equal probability.
+      samples: the number of points.
+      seed: seed of the draws, so the same call always gives the same design.
+    *************
+    Returns samples random parameter dicts.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, spread in ranges.items():
+        if isinstance(spread, tuple):
+            columns[name] = rng.uniform(spread[0], spread[1], samples).tolist()
+        else:
+            columns[name] = [spread[index] for index in rng.integers(0, len(spread), samples)]
+    return [{name: columns[name][index] for name in ranges} for index in range(samples)]
+
+
+def pointKey(simulation: str, parameters: dict, seed: int) -> str:
+    """
+    The identity of a point when resuming: its simulation, parameters and seed as canonical JSON. A results file
+    shared by sweeps of different simulations or seeds then never passes one point off as another.
+    """
+    return json.dumps({"simulation": simulation, "parameters": parameters, "seed": seed}, sort_keys=True)
+
+
+def pointSeed(seed: int, index: int) -> int:
+    """The seed of the point at index in a sweep seeded with seed, independent of every other point's."""
+    return int(np.random.SeedSequence([seed, index]).generate_state(1)[0])
+
+
+def _withDefaults(defaults: dict, parameters: dict) -> dict:
+    unknown = set(parameters) - set(defaults)
+    if unknown:
+        raise ValueError("unknown parameter(s) {}, expected some of {}".format(", ".join(sorted(unknown)), ", ".join(defaults)))
+    return dict(defaults, **parameters)
+
+
+# *** SIMULATIONS ***
+
+def runOrbit(parameters: dict, seed: int) -> dict:
+    """
+    runOrbit(parameters, seed):
+    parameters:
+      parameters: values overriding ORBIT_DEFAULTS.
+      seed: unused, the orbit has no random initial conditions.
+    *************
+    Runs orbit.py's simulation headless and returns its metrics: the orbital period, eccentricity and semi-major
+    axis at the end (None if the orbit is not bound), the relative drift of the orbitor's energy and angular
+    momentum, and steps per second.
+    """
+    p = _withDefaults(ORBIT_DEFAULTS, parameters)
+    center = pygame.Vector2(500, 360)
+    simulation = OrbitSimulation(center, p["sunMass"], p["orbitorMass"], center + pygame.Vector2(p["distance"], 0),
+                                 pygame.Vector2(0, p["speed"]), GRAV, integrator=p["integrator"], adaptive=p["adaptive"],
+                                 kepler=p["kepler"])
+    start = simulation.diagnostics()
+    elapsed = runHeadless(simulation, int(p["steps"]), p["dt"])
+    end = simulation.diagnostics()
+    metrics = {"energyDrift": relativeDrift(end.energy, start.energy),
+               "angularMomentumDrift": relativeDrift(end.angularMomentum, start.angularMomentum),
+               "stepsPerSecond": p["steps"] / elapsed}
+    elements = simulation.elements
+    if elements is None:
+        metrics.update(period=None, eccentricity=None, semiMajorAxis=None)
+    else:
+        metrics.update(period=float(elements.period), eccentricity=float(elements.eccentricity),
+                       semiMajorAxis=float(elements.semiMajorAxis))
+    return metrics
+
+
+def runBelt(parameters: dict, seed: int) -> dict:
+    """
+    runBelt(parameters, seed):
+    parameters:
+      parameters: values overriding BELT_DEFAULTS.
+      seed: seed of the random initial conditions.
+    *************
+    Runs asteroid_belt.py's simulation headless and returns its metrics: the mean distance of the asteroids from the
+    star and its spread (dispersion) at the end, how much the spread grew, the mean relative drift of each
+    asteroid's specific energy around the star and of the belt's total angular momentum (None if collisions changed
+    the asteroids), the surviving asteroids and steps per second.
+    """
+    p = _withDefaults(BELT_DEFAULTS, parameters)
+    rng = np.random.default_rng(seed)
+    center = pygame.Vector2(450, 450)
+    count, distance = int(p["count"]), p["distance"]
+    mu = gravitationalParameter(p["stellarMass"], GRAV, p["scale"])
+    # the same distributions as asteroid_belt.py, scaled to distance
+    if p["distribution"] == "ring":
+        positions, velocities = gaussianRing(rng, count, center, distance, p["sigma"], speed=p["speed"], speedSigma=p["speedSigma"])
+    elif p["distribution"] == "disk":
+        positions, velocities = powerLawDisk(rng, count, center, 0.5 * distance, 4 / 3 * distance, 1.5, mu)
+    elif p["distribution"] == "kepler":
+        positions, velocities = keplerianBelt(rng, count, center, mu, distance, 2 * p["sigma"], eccentricity=0.1,
+                                              eccentricitySigma=0.05)
+    elif p["distribution"] == "rings":
+        positions, velocities = multipleRings(rng, count, center, np.array([2, 3, 3.8]) * distance / 3, (4, 6, 3), (1, 2, 1), mu)
+    else:
+        raise ValueError("unknown distribution '{}'".format(p["distribution"]))
+    simulation = BeltSimulation(positions, velocities, center, p["stellarMass"], p["asteroidMass"], GRAV, p["scale"],
+                                integrator=p["integrator"], adaptive=p["adaptive"], collisions=p["collisions"], kepler=p["kepler"],
+                                precision=p["precision"])
+    satellites = simulation.satellites
+
+    def state():
+        radii = np.linalg.norm(satellites.positions - np.asarray(center), axis=1)
+        energies = 0.5 * np.einsum("ij,ij->i", satellites.velocities, satellites.velocities) - mu / radii
+        return radii, energies
+
+    startRadii, startEnergies = state()
+    startAngularMomentum = simulation.diagnostics().angularMomentum
+    elapsed = runHeadless(simulation, int(p["steps"]), p["dt"])
+    radii, energies = state()
+    conserved = satellites.count == count
+    metrics = {
+        "meanDistance": float(radii.mean()), "dispersion": float(radii.std()),
+        "dispersionGrowth": float(radii.std() - startRadii.std()),
+        "energyDrift": float(np.mean(np.abs(energies - startEnergies) / np.abs(startEnergies))) if conserved else None,
+        "angularMomentumDrift": relativeDrift(simulation.diagnostics().angularMomentum, startAngularMomentum) if conserved else None,
+        "survivors": satellites.count, "stepsPerSecond": p["steps"] / elapsed,
+    }
+    simulation.close()
+    return metrics
+
+
+# the simulations a sweep can run, by name
+SIMULATIONS = {"orbit": runOrbit, "belt": runBelt}
+
+
+def _runPoint(simulation: str, index: int, parameters: dict, seed: int) -> dict:
+    """Runs one point in a worker process and returns its line of the results file."""
+    record = {"simulation": simulation, "index": index, "seed": seed, "parameters": parameters}
+    try:
+        record["metrics"] = SIMULATIONS[simulation](parameters, seed)
+    except Exception as error:
+        # recorded but not counted as finished, so resuming tries the point again
+        record["error"] = "{}: {}".format(type(error).__name__, error)
+    return record
+
+
+# *** RUNNING ***
+
+def finishedPoints(path: str) -> set:
+    """
+    Returns the pointKey() of every point with metrics in a results file, or an empty set if there is no such file.
+    A line cut off by an interrupted run, or written before records named their simulation, is ignored.
+    """
+    finished = set()
+    if not os.path.exists(path):
+        return finished
+    with open(path) as file:
+        for line in file:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if "metrics" in record and "simulation" in record:
+                finished.add(pointKey(record["simulation"], record["parameters"], record["seed"]))
+    return finished
+
+
+def runSweep(simulation: str, design: list, output: str, workers: int = None, seed: int = 0, resume: bool = True,
+             onRecord=None) -> int:
+    """
+    runSweep(simulation, design, output, workers, seed, resume, onRecord):
+    parameters:
+      simulation: "orbit" or "belt", see SIMULATIONS.
+      design: list of parameter dicts, e.g. from gridDesign() or randomDesign().
+      output: results file, one JSON object per line. Appended to.
+      workers: the number of worker processes, the number of cores by default. 1 runs every point in this process.
+      seed: the sweep's seed, from which every point's seed is derived (see pointSeed()).
+      resume: skip the points whose metrics are already in output. Otherwise output is started over.
+      onRecord: if given, called with every record as it is written, e.g. to print progress.
+    *************
+    Runs every point of the design and writes each record as soon as its point finishes, so a sweep can be stopped at
+    any time. Points that raise are recorded with an "error" instead of "metrics". Returns the number of points run.
+    """
+    if simulation not in SIMULATIONS:
+        raise ValueError("unknown simulation '{}', expected one of {}".format(simulation, ", ".join(SIMULATIONS)))
+    finished = finishedPoints(output) if resume else set()
+    pending = [(index, parameters) for index, parameters in enumerate(design)
+               if pointKey(simulation, parameters, pointSeed(seed, index)) not in finished]
+    workers = workers or os.cpu_count() or 1
+    with open(output, "a" if resume else "w") as file:
+
+        def write(record: dict) -> None:
+            file.write(json.dumps(record) + "\n")
+            file.flush()
+            if onRecord is not None:
+                onRecord(record)
+
+        if workers == 1:
+            for index, parameters in pending:
+                write(_runPoint(simulation, index, parameters, pointSeed(seed, index)))
+        else:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_runPoint, simulation, index, parameters, pointSeed(seed, index))
+                           for index, parameters in pending]
+                try:
+                    for future in concurrent.futures.as_completed(futures):
+                        write(future.result())
+                except BaseException:
+                    # on Ctrl+C, don't start the queued points only to throw their results away
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
+    return len(pending)
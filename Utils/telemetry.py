@@ -0,0 +1,108 @@
+# File: telemetry.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, chunked columnar recording of per-step diagnostics
+#
+# Class file for TelemetryRecorder. Diagnostics recorded every step are kept in a fixed-size buffer and
+# appended to disk one chunk at a time, so memory use stays constant no matter how long a run lasts.
+# A recording is a directory holding header.json plus one raw binary file per column; readTelemetry()
+# maps the columns back into memory with numpy.memmap without loading them.
+
+import json
+import os
+
+import numpy as np
+
+_HEADER = "header.json"
+
+
+class TelemetryRecorder:
+
+    def __init__(self, directory: str, columns: list, bufferSize: int = 4096, decimation: int = 1, dtype=np.float64):
+        """
+        TelemetryRecorder.__init__(directory, columns, bufferSize, decimation, dtype):
+        parameters:
+          directory: where the recording is written. Created if missing. If it already holds a recording with the
+                     same columns, new rows are appended to it.
+          columns: the names of the values passed to every record() call, in order.
+          bufferSize: the number of rows kept in memory before they are written out.
+          decimation: only every decimation-th call to record() is kept.
+          dtype: the type every column is stored as.
+        """
+        self.directory = directory
+        self.columns = list(columns)
+        self.decimation = decimation
+        self.dtype = np.dtype(dtype)
+        self._buffer = np.empty((bufferSize, len(self.columns)), dtype=self.dtype)
+        self._filled = 0
+        self._calls = 0
+
+        os.makedirs(directory, exist_ok=True)
+        headerPath = os.path.join(directory, _HEADER)
+        if os.path.exists(headerPath):
+            with open(headerPath) as file:
+                header = json.load(file)
+            if header["columns"] != self.columns or header["dtype"] != self.dtype.str:
+                raise ValueError("{} already holds a recording with different columns or dtype".format(directory))
+        else:
+            with open(headerPath, "w") as file:
+                json.dump({"columns": self.columns, "dtype": self.dtype.str}, file)
+        self._files = [open(os.path.join(directory, column + ".bin"), "ab") for column in self.columns]
+
+    def record(self, *values) -> None:
+        """
+        Adds one row of values, in the order given by columns. Every bufferSize kept rows are written to disk.
+        """
+        self._calls += 1
+        if (self._calls - 1) % self.decimation:
+            return
+        self._buffer[self._filled] = values
+        self._filled += 1
+        if self._filled == len(self._buffer):
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Writes the buffered rows to disk, one contiguous block per column.
+        """
+        for index, file in enumerate(self._files):
+            file.write(np.ascontiguousarray(self._buffer[:self._filled, index]).tobytes())
+            file.flush()
+        self._filled = 0
+
+    def close(self) -> None:
+        """
+        Writes any buffered rows and closes the column files.
+        """
+        self.flush()
+        for file in self._files:
+            file.close()
+        self._files = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+
+def readTelemetry(directory: str) -> dict:
+    """
+    readTelemetry(directory):
+    parameters:
+      directory: a recording written by TelemetryRecorder.
+    *************
+    Returns a dict from column name to a read-only numpy.memmap of that column. Nothing is read from disk until the
+    values are used, so slicing a short window out of a multi-day recording is cheap.
+    """
+    with open(os.path.join(directory, _HEADER)) as file:
+        header = json.load(file)
+    dtype = np.dtype(header["dtype"])
+    data = {}
+    for column in header["columns"]:
+        path = os.path.join(directory, column + ".bin")
+        if os.path.getsize(path) == 0:
+            data[column] = np.zeros(0, dtype=dtype)
+        else:
+            data[column] = np.memmap(path, dtype=dtype, mode="r")
+    return data
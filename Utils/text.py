@@ -1,12 +1,38 @@
 # File: text.py
 # Programmer: Connor Fricke (cd.fricke23@gmail.com)
-# Last Revision: 
+# Last Revision:
 #   29-March-2024 --> created
+#   18-OCT-2026 --> shared font cache and cached rendered surfaces
+#   18-OCT-2026 --> render() returns the rect it touched, see Utils/scene.py
+#   18-OCT-2026 --> the font module is initialized on the first font lookup instead of by pygame.init()
 #
 # Class file designed as a wrapper aroung the PyGame font objects for writing text to the screen.
 
+from collections import OrderedDict
+
 import pygame
 
+# fonts already looked up, shared by every Text and keyed by (name, size, bold, italic)
+_fonts = {}
+# rendered strings shared by every Text, least recently used first
+_surfaces = OrderedDict()
+# the most rendered strings kept at once, which bounds memory for text that changes every frame
+SURFACE_CACHE_SIZE = 256
+
+
+def getFont(name: str, size: int, bold: bool, italic: bool) -> pygame.font.Font:
+    """
+    Returns the system font with the given properties. The system font lookup only happens the first time, and the
+    first lookup of all starts pygame's font module, so scripts that never show text never initialize it.
+    """
+    key = (name, size, bold, italic)
+    if key not in _fonts:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        _fonts[key] = pygame.font.SysFont(name=name, size=size, bold=bold, italic=italic)
+    return _fonts[key]
+
+
 class Text:
     def __init__(self):
         self.fontName = "consolas"
@@ -15,8 +41,12 @@ class Text:
         self.size = 12
         self.color = "white"
         self.txt = "UNINITIALIZED"
+        # rendered copy of txt, None until the next render() after a change
+        self._surface = None
 
     def set_font(self, fontName: str, size: int, bold: bool, italics: bool, color: pygame.Color) -> None:
+        if (fontName, size, bold, italics, color) != (self.fontName, self.size, self.bold, self.italic, self.color):
+            self._surface = None
         self.fontName = fontName
         self.size = size
         self.bold = bold
@@ -24,14 +54,23 @@ class Text:
         self.color = color
 
     def text(self, textString: str) -> None:
+        if textString != self.txt:
+            self._surface = None
         self.txt = textString
 
-    def render(self, surface: pygame.Surface, location: pygame.Vector2) -> None:
-        font = pygame.font.SysFont(name=self.fontName, size=self.size, bold=self.bold, italic=self.italic)
-        text = font.render(self.txt, True, self.color)
-        surface.blit(text, location)
-
-
-    
+    def _rasterize(self) -> pygame.Surface:
+        key = (self.fontName, self.size, self.bold, self.italic, tuple(pygame.Color(self.color)), self.txt)
+        if key in _surfaces:
+            _surfaces.move_to_end(key)
+            return _surfaces[key]
+        font = getFont(self.fontName, self.size, self.bold, self.italic)
+        rendered = font.render(self.txt, True, self.color)
+        _surfaces[key] = rendered
+        if len(_surfaces) > SURFACE_CACHE_SIZE:
+            _surfaces.popitem(last=False)
+        return rendered
 
-    
+    def render(self, surface: pygame.Surface, location: pygame.Vector2) -> pygame.Rect:
+        if self._surface is None:
+            self._surface = self._rasterize()
+        return surface.blit(self._surface, location)
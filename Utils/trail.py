@@ -2,9 +2,15 @@
 # Programmer: Connor Fricke (cd.fricke23@gmail.com)
 # Last Revision:
 #   27-MARCH-2024 --> created, used for drawing paths of orbitor objects in orbit simulation
+#   18-OCT-2026 --> points kept in a preallocated circular buffer, added TrailBatch for many bodies
+#   18-OCT-2026 --> optional camera when drawing
+#   18-OCT-2026 --> Trail.draw() and Trail.aadraw() return the rect they touched, see Utils/scene.py
 
+import numpy as np
 import pygame
 
+from Utils.renderer import drawPoints
+
 class Trail:
 
     # Trail.__init__(maxlength):
@@ -14,40 +20,126 @@ class Trail:
     # This constructor defines the maxlength data member of the trail class, which defines the max size of the points array
     # for optimization and indefinite simulation times. Without a max length, the array which stores the points that are used
     # to draw the trail would grow arbitrarily large, which is unnecessary. The length needed is to be determined by the user.
+    # The points live in a circular buffer that is allocated once. Every point is written twice, maxlength entries apart,
+    # so the newest points are always one contiguous slice of the buffer and can be drawn without copying.
     def __init__(self, maxlength: int):
-        self.pointArray = []
         self.maxlength = maxlength
-        
-    # Trail.aadraw(surface, color, blend):
+        self._buffer = np.zeros((2 * maxlength, 2))
+        self._next = 0
+        self.length = 0
+
+    # Trail.pointArray:
+    # The points of the trail from oldest to newest, as an array of shape (length, 2). This is a view into the
+    # circular buffer, so it is only valid until the next call to addPoint().
+    @property
+    def pointArray(self) -> np.ndarray:
+        end = self._next + self.maxlength
+        return self._buffer[end - self.length:end]
+
+    # Trail.screenPoints(camera):
+    # The points of the trail as seen through a Camera (Utils/camera.py), or pointArray itself without one.
+    def screenPoints(self, camera=None) -> np.ndarray:
+        return self.pointArray if camera is None else camera.toScreenArray(self.pointArray)
+
+    # Trail.aadraw(surface, color, blend, camera):
     # parameters:
     #   surface: the pygame surface for the lines to be drawn on, usually the screen.
     #   color: the color of the trail. Should be a pygame.Color type.
     #   blend: the blend of the line to be drawn, which is needed for the anti-aliasing.
+    #   camera: optional Camera the trail is seen through.
     # *************
-    # This function draws an anti-aliased line between each of the points in the pointArray stored by the class.
-    def aadraw(self, surface: pygame.Surface, color: pygame.Color, blend: int) -> None:
-        pygame.draw.aalines(surface=surface, color=color, closed=False, points=self.pointArray, blend=blend)
-    
-    # Trail.draw(surface, color, width):
+    # This function draws an anti-aliased line between each of the points in the pointArray stored by the class,
+    # and returns the rect of the surface that was drawn on.
+    def aadraw(self, surface: pygame.Surface, color: pygame.Color, blend: int, camera=None) -> pygame.Rect:
+        return pygame.draw.aalines(surface=surface, color=color, closed=False, points=self.screenPoints(camera), blend=blend)
+
+    # Trail.draw(surface, color, width, camera):
     # parameters:
     #   surface: the pygame surface for the lines to be drawn on, usually the screen.
     #   color: the color of the trail. Should be a pygame.Color type.
     #   width: the width of the line to be drawn, measured in pixels.
+    #   camera: optional Camera the trail is seen through.
     # *************
-    # This function draws a line between each of the points in the pointArray stored by the class.
-    def draw(self, surface: pygame.Surface, color: pygame.Color, width: int) -> None:
-        pygame.draw.lines(surface=surface, color=color, closed=False, points=self.pointArray, width=width)
+    # This function draws a line between each of the points in the pointArray stored by the class,
+    # and returns the rect of the surface that was drawn on.
+    def draw(self, surface: pygame.Surface, color: pygame.Color, width: int, camera=None) -> pygame.Rect:
+        return pygame.draw.lines(surface=surface, color=color, closed=False, points=self.screenPoints(camera), width=width)
 
     # Trail.addPoint(point):
     # parameters:
-    #   point: a pygame.Vector2 type object representing a location in 2D space which is to be added to the internal 
-    #          array of the class.
+    #   point: a pygame.Vector2 type object (or any pair of numbers) representing a location in 2D space which is to be
+    #          added to the trail.
     # *************
-    # This function appends a 2D vector to the end of the pointArray list of the Trail class. If the array length exceeds 
-    # the max length defined during the initialization stage of creating a trail, then the value at the beginning of the 
-    # list is removed, ensuring the array never exceeds the maximum length.
+    # This function copies a 2D location into the next slot of the circular buffer in O(1). Once the trail holds maxlength
+    # points, the new point overwrites the oldest one, ensuring the trail never exceeds the maximum length.
     def addPoint(self, point: pygame.Vector2) -> None:
-        self.pointArray.append(point)
-        # limit trail length to N points (N should be determined based on the orbit length)
-        if (len(self.pointArray) > self.maxlength):
-            self.pointArray.pop(0)
\ No newline at end of file
+        self._buffer[self._next] = point
+        self._buffer[self._next + self.maxlength] = point
+        self._next = (self._next + 1) % self.maxlength
+        self.length = min(self.length + 1, self.maxlength)
+
+
+class TrailBatch:
+
+    # TrailBatch.__init__(maxlength, count):
+    # parameters:
+    #   maxlength: the maximum number of points kept for each body
+    #   count: the number of bodies, e.g. ParticleSystem.count
+    # *************
+    # A Trail for every body of a ParticleSystem at once. All trails share one circular buffer of shape
+    # (2 * maxlength, count, 2), laid out like the buffer of a single Trail, so adding a point to every trail is
+    # one array assignment.
+    def __init__(self, maxlength: int, count: int):
+        self.maxlength = maxlength
+        self.count = count
+        self._buffer = np.zeros((2 * maxlength, count, 2))
+        self._next = 0
+        self.length = 0
+
+    # TrailBatch.pointArray:
+    # The points of every trail from oldest to newest, as a view of shape (length, count, 2).
+    # pointArray[:, i] is the trail of body i.
+    @property
+    def pointArray(self) -> np.ndarray:
+        end = self._next + self.maxlength
+        return self._buffer[end - self.length:end]
+
+    # TrailBatch.addPoints(positions):
+    # parameters:
+    #   positions: array of shape (count, 2), the current location of every body.
+    # *************
+    # Adds one point to every trail in O(count), overwriting the oldest points once the trails are full.
+    def addPoints(self, positions: np.ndarray) -> None:
+        self._buffer[self._next] = positions
+        self._buffer[self._next + self.maxlength] = positions
+        self._next = (self._next + 1) % self.maxlength
+        self.length = min(self.length + 1, self.maxlength)
+
+    # TrailBatch.draw(surface, color, camera):
+    # parameters:
+    #   surface: the pygame surface for the trails to be drawn on, usually the screen.
+    #   color: the color of the trails.
+    #   camera: optional Camera the trails are seen through. Points out of view are skipped.
+    # *************
+    # Draws every stored point of every trail as a single pixel in one batched call. When bodies move about a pixel
+    # per frame, as in the asteroid belt, the dots join up into lines.
+    def draw(self, surface: pygame.Surface, color: pygame.Color, camera=None) -> None:
+        points = self.pointArray.reshape(-1, 2)
+        if camera is not None:
+            points = camera.toScreenArray(points[camera.visible(points)])
+        drawPoints(surface, points, color, radius=0)
+
+    # TrailBatch.drawLines(surface, color, width, bodies):
+    # parameters:
+    #   surface: the pygame surface for the lines to be drawn on, usually the screen.
+    #   color: the color of the trails.
+    #   width: the width of the lines to be drawn, measured in pixels.
+    #   bodies: indices of the bodies whose trails should be drawn, all of them by default.
+    # *************
+    # Draws the selected trails as connected lines like Trail.draw(), one pygame.draw.lines call per body.
+    def drawLines(self, surface: pygame.Surface, color: pygame.Color, width: int, bodies=None) -> None:
+        if self.length < 2:
+            return
+        points = self.pointArray
+        for body in range(self.count) if bodies is None else bodies:
+            pygame.draw.lines(surface=surface, color=color, closed=False, points=points[:, body], width=width)
@@ -3,26 +3,49 @@
 # Last Revision:
 #   28-FEB-2024 ---> Created
 #   22-APR-2024 ---> Revised to be a many-bodied asteroid belt simulation
+#   18-OCT-2026 ---> Asteroids stored in a ParticleSystem and advanced in one batched step
+#   18-OCT-2026 ---> Optional self-gravitating N-body mode (Barnes-Hut)
+#   18-OCT-2026 ---> Optional multi-process force/update backend over shared memory
+#   18-OCT-2026 ---> Selectable integrator
+#   18-OCT-2026 ---> Optional adaptive per-asteroid block timesteps
+#   18-OCT-2026 ---> Physics moved to BeltSimulation with fixed timesteps, headless mode (--headless)
+#   18-OCT-2026 ---> Batched asteroid rendering, optional density mode
+#   18-OCT-2026 ---> Optional trails for every asteroid
+#   18-OCT-2026 ---> Snapshot save/restore (--save, --load)
+#   18-OCT-2026 ---> Vectorized, seeded initial conditions with a choice of distributions (--distribution)
+#   18-OCT-2026 ---> Optional collisions: asteroids merge and fall into the star (--collisions)
+#   18-OCT-2026 ---> Pan/zoom camera with culling and density tiles when zoomed out
+#   18-OCT-2026 ---> Per-phase frame profiler (--profile, F3 for the overlay)
+#   18-OCT-2026 ---> Optional exact Kepler propagation of the asteroids (--kepler)
+#   18-OCT-2026 ---> Selectable storage precision of the asteroids (--precision)
+#   18-OCT-2026 ---> Optional pipelined mode: physics on its own thread, interpolated drawing (--pipeline)
+#   18-OCT-2026 ---> Optional velocity arrows on every visible asteroid (--arrows)
+#   18-OCT-2026 ---> Importable: setup and game loop in functions, main() entry point, only the display initialized
+#   18-OCT-2026 ---> Conservation diagnostics and automatic timestep when headless (--diagnostics, --auto-dt)
+#   18-OCT-2026 ---> Headless rate counts only the steps of this run, not those restored by --load
+
+import argparse
+import sys
 
-# *** INITIALIZE ***
 import pygame as pg
-from random import uniform, gauss
-from math import sin, cos, pi
+import numpy as np
+
+# CLASS FILES
+from Utils.text import Text
+from Utils.trail import TrailBatch
+from Utils.simulation import BeltSimulation, FixedTimestep, headlessArguments, runHeadless, chooseTimestep, conservationMonitor
+from Utils.snapshot import loadSnapshot, restoreRng
+from Utils.distributions import gravitationalParameter, gaussianRing, powerLawDisk, keplerianBelt, multipleRings
+from Utils.camera import Camera
+from Utils.profiler import FrameProfiler
+from Utils.pipeline import SimulationPipeline
+from Utils.arrow import ArrowField
+
+# *** INITIALIZE ***
 WIDTH = 900
 HEIGHT = 900
-pg.init()
-screen = pg.display.set_mode((WIDTH+1, HEIGHT+1))
-clock = pg.time.Clock()
-running = True
-dt = 0
-frame = 0
-simulationTime = 0
 # ******************
 
-# CLASS FILES
-from Utils.text import *
-from Utils.satellite import *
-
 # *** COMMON VECTORS AND LOCATIONS ***
 center = pg.Vector2(WIDTH / 2, HEIGHT / 2)
 zero = pg.Vector2(0, 0)
@@ -33,94 +56,249 @@ yhat = pg.Vector2(0, 1)
 GRAV = 6.674E-11 # N m^2 kg^-2
 STELLAR_MASS = 6.5e31 # kg
 ASTEROID_MASS = 1000 # kg
+ASTEROID_RADIUS = 0.5 # px, only used for collisions
 SATELLITE_DISTANCE = 300 # px
 RATE = 10
 NUM_ASTEROIDS = 10000  
 SCALE = 1e8 # meters per px
 AU = 1.496e11 # meters per AU
+SELF_GRAVITY = False # asteroids also attract each other (Barnes-Hut N-body mode)
+THETA = 0.5 # Barnes-Hut opening angle, 0 is exact
+SOFTENING = 1 # px
+WORKERS = 1 # processes used for the force and update step (star-only runs), 1 runs everything in this process
+INTEGRATOR = "euler" # euler, leapfrog, rk4 or yoshida4, see Utils/integrators.py
+ADAPTIVE = False # per-asteroid power-of-two timesteps (star-only runs), see Utils/adaptive.py
+STEP = 0.01 # real seconds per fixed physics step, each step advances the belt by STEP * RATE
+SEED = 0 # seed for the random initial conditions
+DISTRIBUTION = "ring" # ring, disk, kepler or rings, see Utils/distributions.py
+KEPLER = False # move asteroids along their exact orbits instead of integrating (star-only runs), see Utils/kepler.py
+PRECISION = "float64" # float64, float32 or mixed (float64 positions and velocities), see Utils/particles.py
+COLLISIONS = False # merge touching asteroids and remove those that hit the star, see Utils/collisions.py
+DENSITY = False # draw asteroids as accumulated brightness instead of individual dots
+TRAIL_LENGTH = 0 # frames of trail drawn behind every asteroid, 0 for none
+ARROWS = False # draw every visible asteroid's velocity as an arrow, see Utils/arrow.py
+ARROW_SCALE = 0.3 # px of arrow per px/s of velocity
 
-# *** HELPER FUNCTIONS ***
 
-def toCartesian(radius: float, angle: float) -> pg.Vector2:
+def parseArguments(argv: list = None) -> argparse.Namespace:
     """
-    Converts a radius and angle to polar coordinates relative to a center-screen origin
+    Returns the options of asteroid_belt.py read from argv, the command line by default.
     """
-    return center + radius*cos(angle)*yhat - radius*sin(angle)*xhat
+    arguments = headlessArguments("Asteroid belt simulation.", steps=1000, deltaTime=STEP * RATE)
+    arguments.add_argument("--seed", type=int, default=SEED, help="seed for the random initial conditions")
+    arguments.add_argument("--distribution", choices=("ring", "disk", "kepler", "rings"), default=DISTRIBUTION,
+                           help="how the asteroids are spread around the star")
+    arguments.add_argument("--count", type=int, default=NUM_ASTEROIDS, help="number of asteroids")
+    arguments.add_argument("--collisions", action="store_true", default=COLLISIONS, help="merge colliding asteroids")
+    arguments.add_argument("--kepler", action="store_true", default=KEPLER, help="use the exact two-body solution instead of integrating")
+    arguments.add_argument("--arrows", action="store_true", default=ARROWS, help="draw the velocity of every visible asteroid")
+    arguments.add_argument("--precision", choices=("float64", "float32", "mixed"), default=PRECISION,
+                           help="storage precision of the asteroids")
+    return arguments.parse_args(argv)
 
-def getForceBetween(satellite1: Satellite, satellite2: Satellite) -> pg.Vector2:
+
+def createSimulation(seed: int = SEED, distribution: str = DISTRIBUTION, count: int = NUM_ASTEROIDS,
+                     collisions: bool = COLLISIONS, kepler: bool = KEPLER, precision: str = PRECISION, load: str = None):
     """
-    Given two satellite objects, getForceBetween() returns a vector describing the 
-    force vector ON the first parameter FROM the second parameter.
+    createSimulation(seed, distribution, count, collisions, kepler, precision, load):
+    parameters:
+      seed: seed for the random initial conditions.
+      distribution: "ring", "disk", "kepler" or "rings", see Utils/distributions.py.
+      count: the number of asteroids.
+      collisions, kepler, precision: as for BeltSimulation.
+      load: snapshot file to continue from (seed, distribution and count are then ignored), None to start anew.
+    *************
+    Returns (simulation, rng): the belt of this script, ready to step, and the random generator its initial
+    conditions were drawn from (to save along with it). Nothing is initialized in pygame, so it can be stepped
+    headless or from other code.
     """
-    r = satellite1.position - satellite2.position
-    rHat = r / r.magnitude()
-    return -((GRAV * satellite1.MASS * satellite2.MASS) / (SCALE*r.magnitude() * SCALE*r.magnitude())) * rHat
+    if load is not None:
+        # continue from a snapshot of an earlier run
+        snapshot = loadSnapshot(load)
+        rng = restoreRng(snapshot.metadata["rng"]) if "rng" in snapshot.metadata else np.random.default_rng(seed)
+        startPositions, startVelocities, asteroidMasses = snapshot.positions, snapshot.velocities, snapshot.masses
+    else:
+        rng = np.random.default_rng(seed)
+        mu = gravitationalParameter(STELLAR_MASS, GRAV, SCALE)
+        if distribution == "ring":
+            # the original belt: a narrow ring with speeds close to circular
+            startPositions, startVelocities = gaussianRing(rng, count, center, SATELLITE_DISTANCE, 5, speed=37, speedSigma=1)
+        elif distribution == "disk":
+            startPositions, startVelocities = powerLawDisk(rng, count, center, 150, 400, 1.5, mu)
+        elif distribution == "kepler":
+            startPositions, startVelocities = keplerianBelt(rng, count, center, mu, SATELLITE_DISTANCE, 10,
+                                                            eccentricity=0.1, eccentricitySigma=0.05)
+        else:
+            startPositions, startVelocities = multipleRings(rng, count, center, (200, 300, 380), (4, 6, 3), (1, 2, 1), mu)
+        asteroidMasses = ASTEROID_MASS
+    simulation = BeltSimulation(startPositions, startVelocities, center, STELLAR_MASS, asteroidMasses, GRAV, SCALE,
+                                integrator=INTEGRATOR, selfGravity=SELF_GRAVITY, theta=THETA, softening=SOFTENING,
+                                workers=WORKERS, adaptive=ADAPTIVE, collisions=collisions,
+                                asteroidRadius=ASTEROID_RADIUS, kepler=kepler, precision=precision)
+    if load is not None:
+        simulation.restore(snapshot)
+    return simulation, rng
+
 
-def getTangent(loc1: pg.Vector2, loc2: pg.Vector2) -> pg.Vector2:
+def runWindow(simulation: BeltSimulation, arguments: argparse.Namespace) -> None:
     """
-    returns a normalized vector tangent to the vector described by loc1 - loc2.
+    runWindow(simulation, arguments):
+    parameters:
+      simulation: the belt to show, e.g. from createSimulation().
+      arguments: the options from parseArguments().
+    *************
+    Opens the window and runs the game loop until the window is closed or arguments.frames frames have passed.
     """
-    vector = loc1 - loc2
-    return pg.Vector2(vector.y, -vector.x) / vector.magnitude()
-
-
-# ***** INITIAL CONDITIONS *****
-star = Satellite(radius=20, mass=STELLAR_MASS)
-star.setPosition(pos=center)
-satellites = []
-for i in range(NUM_ASTEROIDS):
-    asteroid = Satellite(radius=1, mass=ASTEROID_MASS)
-    # each asteroid gets a randomized position and velocity
-    randAngle = uniform(0, 2*pi)
-    randRadius = gauss(mu=SATELLITE_DISTANCE, sigma=5)
-    asteroid.setPosition(toCartesian(randRadius, randAngle))
-    randSpeed = gauss(mu=37, sigma=1)
-    tangentVel = randSpeed * getTangent(center, asteroid.position)
-    asteroid.setVelocity(vel=tangentVel)
-    satellites.append(asteroid)
-
-# TEXT
-numBodies = Text()
-numBodies.text("Number of Satellites: {}".format(NUM_ASTEROIDS))
-solarMasses = STELLAR_MASS / 1.989e30
-stellarMass = Text()
-stellarMass.text("Stellar Mass: {} kg or {} solar masses.".format(STELLAR_MASS, round(solarMasses,1)))
-avgRadii = Text()
-avgRadii.text("Average Satellite Distance: {} AU.".format(round(SCALE*SATELLITE_DISTANCE / AU, 4)))
-
-# ***** GAME LOOP *****
-while running:
-    # pg.QUIT means the user closed the window
-    for event in pg.event.get():
-        if event.type == pg.QUIT:
+    # only the display is started, fonts start with the first Text rendered (see Utils/text.py)
+    pg.display.init()
+    screen = pg.display.set_mode((WIDTH+1, HEIGHT+1))
+    clock = pg.time.Clock()
+    fixedStep = FixedTimestep(STEP)
+    # mouse wheel zooms, dragging pans, Home resets, see Utils/camera.py
+    camera = Camera((WIDTH+1, HEIGHT+1), center)
+    # F3 shows frame times per phase, see Utils/profiler.py
+    profiler = FrameProfiler(enabled=arguments.profile is not None, output=arguments.profile)
+    star = simulation.star
+    satellites = simulation.satellites
+    trails = TrailBatch(TRAIL_LENGTH, satellites.count) if TRAIL_LENGTH > 0 else None
+    velocityArrows = ArrowField(np.zeros((0, 2)), np.zeros((0, 2))) if arguments.arrows else None
+    # with --pipeline the belt steps on its own thread and the loop draws its latest states, see Utils/pipeline.py
+    pipeline = None
+    if arguments.pipeline:
+        pipeline = SimulationPipeline(simulation, STEP, STEP * RATE, lambda simulation: {
+            "positions": simulation.satellites.positions, "velocities": simulation.satellites.velocities})
+        pipeline.start()
+
+    # TEXT
+    numBodies = Text()
+    solarMasses = STELLAR_MASS / 1.989e30
+    stellarMass = Text()
+    stellarMass.text("Stellar Mass: {} kg or {} solar masses.".format(STELLAR_MASS, round(solarMasses,1)))
+    avgRadii = Text()
+    avgRadii.text("Average Satellite Distance: {} AU.".format(round(SCALE*SATELLITE_DISTANCE / AU, 4)))
+
+    # ***** GAME LOOP *****
+    running = True
+    dt = 0
+    frame = 0
+    simulationTime = 0
+    rate = RATE
+    while running:
+        # pg.QUIT means the user closed the window
+        with profiler.scope("events"):
+            for event in pg.event.get():
+                if event.type == pg.QUIT:
+                    running = False
+                camera.handleEvent(event)
+                profiler.handleEvent(event)
+
+        # the asteroids drawn this frame: the belt itself, or an interpolated copy from the pipeline
+        with profiler.scope("physics"):
+            if pipeline is None:
+                positions, velocities = satellites.positions, satellites.velocities
+            else:
+                state = pipeline.frame()
+                positions, velocities = state["positions"], state["velocities"]
+
+        with profiler.scope("draw"):
+            # wipe away anything from the previous frame
+            screen.fill("black")
+
+            # ***** RENDER THE GAME HERE *****
+            star.draw(surface=screen, color="yellow", camera=camera)
+
+            numBodies.text("Number of Satellites: {}".format(len(positions)))
+            numBodies.render(surface=screen, location=(5*xhat + 5*yhat))
+            stellarMass.render(surface=screen, location=(5*xhat + 20*yhat))
+            avgRadii.render(surface=screen, location=(5*xhat + 35*yhat))
+
+            if trails is not None:
+                if trails.count != len(positions):
+                    # asteroids merged or were lost, start the trails over for the survivors
+                    trails = TrailBatch(TRAIL_LENGTH, len(positions))
+                trails.addPoints(positions)
+                trails.draw(surface=screen, color="gray40", camera=camera)
+            if velocityArrows is not None:
+                shown = camera.visible(positions)
+                velocityArrows.setVectors(camera.toScreenArray(positions[shown]), velocities[shown], ARROW_SCALE * camera.zoom)
+                velocityArrows.draw(screen, "steelblue")
+            camera.drawBodies(screen, positions, "white", 1, DENSITY)
+            profiler.draw(surface=screen, location=(5*xhat + 55*yhat))
+
+        # advance every satellite at once, in as many fixed steps as fit in the last frame
+        if pipeline is None:
+            with profiler.scope("physics"):
+                for _ in range(fixedStep.advance(dt)):
+                    simulation.step(STEP * rate)
+
+        # flip() display to send work to the screen
+        with profiler.scope("flip"):
+            pg.display.flip()
+
+        # limit to 100 fps (dt ~ 0.01)
+        with profiler.scope("idle"):
+            dt = clock.tick(100) / 1000
+        profiler.endFrame()
+        simulationTime += dt
+        if (simulationTime > 30):
+            rate = 1
+            if pipeline is not None:
+                pipeline.deltaTime = STEP * rate
+        frame += 1
+        if frame == arguments.frames:
             running = False
-    
-    # wipe away anything from the previous frame
-    screen.fill("black")
 
-    # ***** RENDER THE GAME HERE *****
-    star.draw(surface=screen, color="yellow")
+    if pipeline is not None:
+        pipeline.stop()
+    profiler.close()
 
-    numBodies.render(surface=screen, location=(5*xhat + 5*yhat))
-    stellarMass.render(surface=screen, location=(5*xhat + 20*yhat))
-    avgRadii.render(surface=screen, location=(5*xhat + 35*yhat))
 
-    for asteroid in satellites:
-        asteroid.draw(surface=screen, color="white")
+def main(argv: list = None) -> int:
+    arguments = parseArguments(argv)
+    # ***** INITIAL CONDITIONS *****
+    simulation, rng = createSimulation(arguments.seed, arguments.distribution, arguments.count, arguments.collisions,
+                                       arguments.kepler, arguments.precision, arguments.load)
 
-    # calculate force on each satellite, then update
-    for asteroid in satellites:
-        asteroid.acceleration = getForceBetween(asteroid, star) / ASTEROID_MASS
-        asteroid.update(dt * RATE)
+    # *** HEADLESS RUN ***
+    if arguments.headless:
+        satellites = simulation.satellites
+        try:
+            steps, deltaTime = chooseTimestep(arguments, lambda: createSimulation(
+                arguments.seed, arguments.distribution, arguments.count, arguments.collisions, arguments.kepler,
+                arguments.precision, arguments.load)[0])
+        except ValueError as error:
+            print(error)
+            simulation.close()
+            return 1
+        # energy and angular momentum are checked every --diagnostics steps, see Utils/diagnostics.py
+        monitor = conservationMonitor(arguments)
+        if monitor is not None:
+            monitor.sample(simulation)
+        # after --load, simulation.steps also counts the snapshot's steps, which this run did not take
+        startSteps = simulation.steps
+        elapsed = runHeadless(simulation, steps, deltaTime, onStep=monitor)
+        taken = simulation.steps - startSteps
+        radii = np.linalg.norm(satellites.positions - np.asarray(center), axis=1)
+        print("{} steps of {} s for {} asteroids in {:.3f} s ({:.1f} steps/s)".format(
+            taken, deltaTime, satellites.count, elapsed, taken / elapsed))
+        if startSteps:
+            print("Resumed at step {}, now at step {} (t = {:.6f} s)".format(startSteps, simulation.steps, simulation.time))
+        print("Mean distance: {:.6f} px, spread: {:.6f} px".format(radii.mean(), radii.std()))
+        print("Storage: {} bytes per asteroid ({})".format(satellites.bytesPerBody, satellites.precision))
+        if simulation.collisions is not None:
+            print("Merged: {}, fell into the star: {}".format(simulation.collisions.merges, simulation.collisions.absorbed))
+        if monitor is not None:
+            sample = monitor.sample(simulation)
+            print("{}, center of mass: ({:.3f}, {:.3f}) px".format(monitor.summary(), *sample.centerOfMass))
+    else:
+        runWindow(simulation, arguments)
 
-    # flip() display to send work to the screen
-    pg.display.flip()
+    if arguments.save is not None:
+        simulation.save(arguments.save, rng)
+    simulation.close()
+    pg.quit()
+    return 0
 
-    # limit to 100 fps (dt ~ 0.01)
-    dt = clock.tick(100) / 1000
-    simulationTime += dt
-    if (simulationTime > 30):
-        RATE = 1
-    frame += 1
 
-pg.quit()
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+# File: benchmark.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, headless benchmarks for physics, rendering and the entry scripts
+#   18-OCT-2026 --> Kepler propagation of the belt and the orbit
+#   18-OCT-2026 --> float32 and mixed precision belts, storage per body
+#   18-OCT-2026 --> asteroid_belt.py with --pipeline
+#   18-OCT-2026 --> orbit.py and gradients.py with --full-redraw, for comparison with their dirty-rect drawing
+#   18-OCT-2026 --> ArrowField against one Arrow per vector
+#
+# Benchmark suite for the simulations. Runs without a window through SDL's dummy video driver, so it works on
+# machines with no display. Three groups of benchmarks:
+#   physics:   Satellite.update, getForceBetween, OrbitSimulation and BeltSimulation steps for 1k to 1M bodies
+#   render:    ParticleSystem.draw, Arrow and ArrowField, Trail and TrailBatch, Grid.drawRectangles and Text.render
+#   scripts:   asteroid_belt.py, orbit.py and gradients.py run end to end for a number of frames (--frames),
+#              timed with their own --profile output
+# Every random input is seeded, so two runs on the same machine measure the same work.
+#
+# Usage:
+#   python benchmark.py                          run everything and print a table
+#   python benchmark.py --quick                  smaller sweeps (up to 100k bodies)
+#   python benchmark.py --only render            only benchmarks whose name contains "render"
+#   python benchmark.py --save baseline.json     store the results as a baseline
+#   python benchmark.py --compare baseline.json  compare against a baseline, exit code 1 on a regression
+
+import argparse
+import csv
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+import numpy as np
+import pygame as pg
+
+from Utils.satellite import Satellite
+from Utils.gravity import getForceBetween, CentralField
+from Utils.particles import ParticleSystem
+from Utils.simulation import OrbitSimulation, BeltSimulation
+from Utils.distributions import gaussianRing
+from Utils.trail import Trail, TrailBatch
+from Utils.grid import Grid
+from Utils.arrow import Arrow, ArrowField
+from Utils.colors import colorFunction4
+from Utils.text import Text
+
+WIDTH = 900
+HEIGHT = 900
+SEED = 0
+# same physical setup as asteroid_belt.py and orbit.py
+GRAV = 6.674E-11
+STELLAR_MASS = 6.5e31
+SCALE = 1e8
+SUN_MASS = 6.5e15
+
+BODY_COUNTS = (1000, 10000, 100000, 1000000)
+TRAIL_LENGTHS = (100, 1000, 10000)
+GRID_SIZES = (10, 72, 360, 720)
+SCRIPT_FRAMES = 200
+
+
+# *** TIMING ***
+
+def measure(function, minTime: float = 0.2, repeat: int = 3) -> float:
+    """
+    measure(function, minTime, repeat):
+    parameters:
+      function: the code to time, called with no arguments.
+      minTime: each repetition calls function until at least this many seconds have passed.
+      repeat: the number of repetitions.
+    *************
+    Returns the best time per call over the repetitions, in seconds. The best rather than the mean is used
+    because slower repetitions are slowed by other work on the machine, not by the code being measured.
+    One untimed repetition comes first, so caches and NumPy's allocator are warm.
+    """
+    start = time.perf_counter()
+    while time.perf_counter() - start < minTime:
+        function()
+    best = float("inf")
+    for _ in range(repeat):
+        calls = 0
+        start = time.perf_counter()
+        while True:
+            function()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= minTime:
+                break
+        best = min(best, elapsed / calls)
+    return best
+
+
+def result(value: float, unit: str, higherIsBetter: bool) -> dict:
+    return {"value": value, "unit": unit, "higherIsBetter": higherIsBetter}
+
+
+def rate(seconds: float, unit: str = "steps/s") -> dict:
+    return result(1.0 / seconds, unit, True)
+
+
+def milliseconds(seconds: float) -> dict:
+    return result(1000.0 * seconds, "ms", False)
+
+
+def belt(count: int, **options) -> BeltSimulation:
+    """The asteroid belt of asteroid_belt.py with the given number of asteroids."""
+    center = (WIDTH / 2, HEIGHT / 2)
+    positions, velocities = gaussianRing(SEED, count, center, 300, 5, speed=37, speedSigma=1)
+    return BeltSimulation(positions, velocities, center, STELLAR_MASS, 1000, GRAV, SCALE, **options)
+
+
+# *** PHYSICS ***
+
+def physicsBenchmarks(counts) -> dict:
+    results = {}
+
+    star = Satellite(radius=20, mass=STELLAR_MASS)
+    star.setPosition(pg.Vector2(WIDTH / 2, HEIGHT / 2))
+    asteroid = Satellite(radius=1, mass=1000)
+    asteroid.setPosition(pg.Vector2(WIDTH / 2 + 300, HEIGHT / 2))
+    results["physics/getForceBetween"] = rate(measure(lambda: getForceBetween(asteroid, star, GRAV, SCALE)), "calls/s")
+
+    for integrator in ("euler", "leapfrog", "rk4"):
+        satellite = Satellite(radius=1, mass=1000, integrator=integrator)
+        satellite.setPosition(pg.Vector2(WIDTH / 2 + 300, HEIGHT / 2))
+        satellite.setVelocity(pg.Vector2(0, 37))
+        field = CentralField(star.position, STELLAR_MASS, GRAV, SCALE)
+        accelFunc = lambda position: pg.Vector2(*field(np.array([position]))[0])
+        satellite.acceleration = accelFunc(satellite.position)
+        results["physics/Satellite.update[{}]".format(integrator)] = rate(measure(lambda: satellite.update(0.1, accelFunc)))
+
+    center = pg.Vector2(WIDTH / 2, HEIGHT / 2)
+    for adaptive, kepler in ((False, False), (True, False), (False, True)):
+        orbit = OrbitSimulation(center, SUN_MASS, 5.0, center + pg.Vector2(250, 0), pg.Vector2(0, 45), GRAV, adaptive=adaptive,
+                                kepler=kepler)
+        results["physics/OrbitSimulation.step[{}]".format("kepler" if kepler else "adaptive={}".format(adaptive))] = \
+            rate(measure(lambda: orbit.step(0.005)))
+
+    for count in counts:
+        for integrator in ("euler", "leapfrog"):
+            simulation = belt(count, integrator=integrator)
+            results["physics/BeltSimulation.step[n={},{}]".format(count, integrator)] = rate(measure(lambda: simulation.step(0.1)))
+        for precision in ("float32", "mixed"):
+            simulation = belt(count, precision=precision)
+            results["physics/BeltSimulation.step[n={},euler,{}]".format(count, precision)] = rate(measure(lambda: simulation.step(0.1)))
+        simulation = belt(count, kepler=True)
+        results["physics/BeltSimulation.step[n={},kepler]".format(count)] = rate(measure(lambda: simulation.step(0.1)))
+        if count <= 100000:
+            # small enough that few asteroids merge, so the count (and the work) stays the same while measuring
+            simulation = belt(count, collisions=True, asteroidRadius=0.02)
+            results["physics/BeltSimulation.step[n={},collisions]".format(count)] = rate(measure(lambda: simulation.step(0.1)))
+    for precision in ("float64", "float32", "mixed"):
+        results["physics/ParticleSystem.bytesPerBody[{}]".format(precision)] = \
+            result(ParticleSystem(precision=precision).bytesPerBody, "bytes", False)
+    for count in counts:
+        if count <= 10000:
+            simulation = belt(count, selfGravity=True, softening=1)
+            results["physics/BeltSimulation.step[n={},barnes-hut]".format(count)] = rate(measure(lambda: simulation.step(0.1), repeat=1))
+    return results
+
+
+# *** RENDERING ***
+
+def renderBenchmarks(screen: pg.Surface, counts, trailLengths, gridSizes) -> dict:
+    results = {}
+    center = (WIDTH / 2, HEIGHT / 2)
+
+    for count in counts:
+        positions, velocities = gaussianRing(SEED, count, center, 300, 5, speed=37)
+        system = ParticleSystem(capacity=count)
+        system.addBodies(positions, velocities, 1000)
+        for radius, density in ((1, False), (3, False), (1, True)):
+            results["render/ParticleSystem.draw[n={},r={}{}]".format(count, radius, ",density" if density else "")] = \
+                milliseconds(measure(lambda: system.draw(screen, "white", radius, density)))
+
+    rng = np.random.default_rng(SEED)
+    for count in counts:
+        if count <= 100000:
+            # arrows of about the length of the belt's velocity arrows
+            tails = rng.uniform(0, WIDTH, (count, 2))
+            tips = tails + rng.normal(0, 8, (count, 2))
+            field = ArrowField(tails, tips)
+            results["render/ArrowField.draw[n={}]".format(count)] = milliseconds(measure(lambda: field.draw(screen, "white")))
+            if count <= 10000:
+                arrows = [Arrow(pg.Vector2(*tail), pg.Vector2(*tip)) for tail, tip in zip(tails.tolist(), tips.tolist())]
+                results["render/Arrow.draw[n={}]".format(count)] = \
+                    milliseconds(measure(lambda: [arrow.draw(screen, "white", 1) for arrow in arrows], repeat=1))
+    for length in trailLengths:
+        trail = Trail(length)
+        points = rng.uniform(0, WIDTH, (length, 2))
+        for point in points:
+            trail.addPoint(point)
+        point = pg.Vector2(center)
+        results["render/Trail.addPoint[len={}]".format(length)] = rate(measure(lambda: trail.addPoint(point)), "calls/s")
+        results["render/Trail.aadraw[len={}]".format(length)] = milliseconds(measure(lambda: trail.aadraw(screen, "white", 1)))
+        batch = TrailBatch(min(length, 1000), 1000)
+        positions = rng.uniform(0, WIDTH, (1000, 2))
+        for _ in range(batch.maxlength):
+            batch.addPoints(positions)
+        results["render/TrailBatch.draw[len={},n=1000]".format(batch.maxlength)] = \
+            milliseconds(measure(lambda: batch.draw(screen, "gray40")))
+
+    for size in gridSizes:
+        grid = Grid(rows=size, columns=size, width=WIDTH, height=HEIGHT)
+        grid.randomizeMatrix()
+        results["render/Grid.drawRectangles[{0}x{0}]".format(size)] = \
+            milliseconds(measure(lambda: grid.drawRectangles(surface=screen, colorFunc=colorFunction4)))
+
+        def changingGrid():
+            grid.randomizeMatrix()
+            grid.drawRectangles(surface=screen, colorFunc=colorFunction4)
+        results["render/Grid.drawRectangles[{0}x{0},changing]".format(size)] = milliseconds(measure(changingGrid))
+
+    text = Text()
+    text.text("Number of Satellites: 10000")
+    results["render/Text.render[same]"] = rate(measure(lambda: text.render(screen, (5, 5))), "calls/s")
+    counter = iter(range(10**9))
+
+    def changingText():
+        text.text("Frame {}".format(next(counter)))
+        text.render(screen, (5, 5))
+    results["render/Text.render[changing]"] = rate(measure(changingText), "calls/s")
+    return results
+
+
+# *** ENTRY SCRIPTS ***
+
+def scriptBenchmarks(frames: int) -> dict:
+    """
+    Runs every entry script windowed (on the dummy driver) for the given number of frames and reads back its
+    --profile output. The scripts cap themselves at 100 fps, so the time spent waiting in clock.tick() is
+    subtracted: what is reported is the time a frame needed.
+    """
+    results = {}
+    scripts = (("asteroid_belt.py", []), ("asteroid_belt.py", ["--pipeline"]), ("orbit.py", []), ("orbit.py", ["--full-redraw"]),
+               ("gradients.py", []), ("gradients.py", ["--full-redraw"]))
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for script, options in scripts:
+        with tempfile.TemporaryDirectory() as temporary:
+            output = os.path.join(temporary, "profile.csv")
+            subprocess.run([sys.executable, os.path.join(directory, script), "--frames", str(frames), "--profile", output] + options,
+                           cwd=directory, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           env=dict(os.environ, SDL_VIDEODRIVER="dummy"))
+            with open(output) as file:
+                rows = list(csv.DictReader(file))
+        # the first frames include start-up work such as font lookups
+        rows = rows[len(rows) // 10:]
+        work = np.array([float(row["total"]) - float(row.get("idle", 0)) for row in rows])
+        name = "scripts/" + " ".join([script] + options)
+        results[name + "[frame p50]"] = result(float(np.percentile(work, 50)), "ms", False)
+        results[name + "[frame p95]"] = result(float(np.percentile(work, 95)), "ms", False)
+        for phase in ("physics", "draw", "flip"):
+            if phase in rows[0]:
+                results[name + "[{} p50]".format(phase)] = result(float(np.percentile([float(row[phase]) for row in rows], 50)), "ms", False)
+
+        # the simulations' physics alone, through their own headless mode
+        if script != "gradients.py" and not options:
+            completed = subprocess.run([sys.executable, os.path.join(directory, script), "--headless", "--steps", "500"],
+                                       cwd=directory, check=True, capture_output=True, text=True)
+            line = next(line for line in completed.stdout.splitlines() if "steps/s" in line)
+            results[name + "[headless]"] = result(float(line.split("(")[-1].split()[0]), "steps/s", True)
+    return results
+
+
+# *** BASELINES ***
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Prints every benchmark next to its baseline and returns the names of those more than tolerance
+    (a fraction) worse than the baseline.
+    """
+    regressions = []
+    print("\n{:<60} {:>14} {:>14} {:>8}".format("benchmark", "baseline", "now", "change"))
+    for name, now in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print("{:<60} {:>14} {:>14.4g} {:>8}".format(name, "-", now["value"], "new"))
+            continue
+        ratio = now["value"] / before["value"]
+        # positive change is an improvement either way
+        change = ratio - 1 if now["higherIsBetter"] else 1 / ratio - 1
+        flag = "  REGRESSION" if change < -tolerance else ""
+        if flag:
+            regressions.append(name)
+        print("{:<60} {:>14.4g} {:>14.4g} {:>+7.1%}{}".format(name, before["value"], now["value"], change, flag))
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmarks for the PyGame simulations.")
+    parser.add_argument("--quick", action="store_true", help="smaller sweeps, up to 100k bodies")
+    parser.add_argument("--only", default="", help="only run benchmarks whose name contains this text")
+    parser.add_argument("--save", default=None, help="write the results to this baseline file")
+    parser.add_argument("--compare", default=None, help="compare the results against this baseline file")
+    parser.add_argument("--tolerance", type=float, default=0.1, help="allowed slowdown against the baseline, as a fraction")
+    parser.add_argument("--frames", type=int, default=SCRIPT_FRAMES, help="frames to run each entry script for")
+    arguments = parser.parse_args()
+
+    counts = BODY_COUNTS[:3] if arguments.quick else BODY_COUNTS
+    trailLengths = TRAIL_LENGTHS[:2] if arguments.quick else TRAIL_LENGTHS
+    gridSizes = GRID_SIZES[:3] if arguments.quick else GRID_SIZES
+
+    pg.init()
+    screen = pg.display.set_mode((WIDTH + 1, HEIGHT + 1))
+    results = {}
+    groups = (("physics", lambda: physicsBenchmarks(counts)),
+              ("render", lambda: renderBenchmarks(screen, counts, trailLengths, gridSizes)),
+              ("scripts", lambda: scriptBenchmarks(arguments.frames)))
+    for group, run in groups:
+        # a filter that names a group skips the others entirely, anything else filters benchmark names
+        if arguments.only in ("physics", "render", "scripts") and arguments.only != group:
+            continue
+        for name, value in run().items():
+            if arguments.only in name:
+                results[name] = value
+                print("{:<60} {:>14.4g} {}".format(name, value["value"], value["unit"]), flush=True)
+    pg.quit()
+
+    regressions = []
+    if arguments.compare is not None:
+        with open(arguments.compare) as file:
+            regressions = compare(results, json.load(file)["results"], arguments.tolerance)
+    if arguments.save is not None:
+        with open(arguments.save, "w") as file:
+            json.dump({"machine": {"python": platform.python_version(), "numpy": np.__version__,
+                                   "pygame": pg.version.ver, "platform": platform.platform(),
+                                   "processor": platform.processor(), "cpus": os.cpu_count()},
+                       "results": results}, file, indent=1)
+    if regressions:
+        print("\n{} regression(s) beyond {:.0%}".format(len(regressions), arguments.tolerance))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
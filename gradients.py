@@ -1,59 +1,116 @@
 # File: gradients.py
 # Programmer: Connor Fricke (cd.frick23@gmail.com)
 # Latest Revision: 26-APR-2024 --> Created
+#                  18-OCT-2026 --> per-phase frame profiler (F3 for the overlay)
+#                  18-OCT-2026 --> --profile and --frames options, for benchmark.py
+#                  18-OCT-2026 --> grid kept in a static layer, only changed rects presented (--full-redraw to compare)
+#                  18-OCT-2026 --> importable: setup and game loop in functions, main() entry point, only the display initialized
+
+import argparse
+import sys
 
 import pygame as pg
-from Utils.grid import *
-from Utils.colors import *
+from Utils.grid import Grid
+from Utils.colors import colorFunction1, colorFunction2, colorFunction3, colorFunction4
+from Utils.profiler import FrameProfiler
+from Utils.scene import Scene
 
 # *** INITIALIZE ***
 WIDTH = 720
 HEIGHT = 720
-pg.init()
-screen = pg.display.set_mode((WIDTH, HEIGHT))
-clock = pg.time.Clock()
-running = True
-dt = 0
-frame = 0
-runningTime = 0
 
 COLOR_FUNCTION = 4
 GRADIENT_TYPE = "random"
+PROFILE = None # file to record per-phase frame times to (.csv or .json trace), see Utils/profiler.py
 
-if (GRADIENT_TYPE == "horizontal"):
-    myGradient = Grid(columns=WIDTH, rows=1, width=WIDTH, height=HEIGHT)
-    myGradient.horizontalGradientMatrix()
-elif (GRADIENT_TYPE == "vertical"):
-    myGradient = Grid(columns=1, rows=HEIGHT, width=WIDTH, height=HEIGHT)
-    myGradient.verticalGradientMatrix()
-elif (GRADIENT_TYPE == "random"):
-    myGradient = Grid(columns=int(WIDTH/10), rows=int(HEIGHT/10), width=WIDTH, height=HEIGHT)
-    myGradient.randomizeMatrix()
-else:
-    print("Invalid gradient type selected.")
-    running = False
-
-while (running):
-    for event in pg.event.get():
-        if event.type == pg.QUIT:
-            running = False
 
-    # wipe away anything from the previous frame
-    screen.fill("black")
+def parseArguments(argv: list = None) -> argparse.Namespace:
+    """
+    Returns the options of gradients.py read from argv, the command line by default.
+    """
+    arguments = argparse.ArgumentParser(description="Color gradients drawn on a grid.")
+    arguments.add_argument("--profile", default=PROFILE, help="record per-phase frame times to a .csv file or .json trace")
+    arguments.add_argument("--frames", type=int, default=0, help="close the window after this many frames, 0 to run until closed")
+    arguments.add_argument("--full-redraw", action="store_true", help="redraw and present the whole window every frame")
+    return arguments.parse_args(argv)
+
+
+def createGradient(gradientType: str = GRADIENT_TYPE) -> Grid:
+    """
+    Returns the Grid of the given gradient type ("horizontal", "vertical" or "random") filling the window,
+    or None for an unknown type.
+    """
+    if (gradientType == "horizontal"):
+        myGradient = Grid(columns=WIDTH, rows=1, width=WIDTH, height=HEIGHT)
+        myGradient.horizontalGradientMatrix()
+    elif (gradientType == "vertical"):
+        myGradient = Grid(columns=1, rows=HEIGHT, width=WIDTH, height=HEIGHT)
+        myGradient.verticalGradientMatrix()
+    elif (gradientType == "random"):
+        myGradient = Grid(columns=int(WIDTH/10), rows=int(HEIGHT/10), width=WIDTH, height=HEIGHT)
+        myGradient.randomizeMatrix()
+    else:
+        return None
+    return myGradient
+
+
+def main(argv: list = None) -> int:
+    arguments = parseArguments(argv)
+    profiler = FrameProfiler(enabled=arguments.profile is not None, output=arguments.profile)
+
+    myGradient = createGradient(GRADIENT_TYPE)
+    if myGradient is None:
+        print("Invalid gradient type selected.")
+        return 1
 
     if (COLOR_FUNCTION == 1):
-        myGradient.drawRectangles(surface=screen, colorFunc=colorFunction1)
+        colorFunc = colorFunction1
     elif (COLOR_FUNCTION == 2):
-        myGradient.drawRectangles(surface=screen, colorFunc=colorFunction2)
+        colorFunc = colorFunction2
     elif (COLOR_FUNCTION == 3):
-        myGradient.drawRectangles(surface=screen, colorFunc=colorFunction3)
+        colorFunc = colorFunction3
     elif (COLOR_FUNCTION == 4):
-        myGradient.drawRectangles(surface=screen, colorFunc=colorFunction4)
-    
+        colorFunc = colorFunction4
+
+    # only the display is started, fonts start with the first Text rendered (see Utils/text.py)
+    pg.display.init()
+    screen = pg.display.set_mode((WIDTH, HEIGHT))
+    clock = pg.time.Clock()
+    running = True
+    dt = 0
+    frame = 0
+
+    # the grid does not change, so it is drawn once into the scene's static layer and only the overlay is redrawn
+    scene = Scene(screen, "black", fullRedraw=arguments.full_redraw)
+    scene.addStatic(lambda surface: myGradient.drawRectangles(surface=surface, colorFunc=colorFunc))
+
+    while (running):
+        with profiler.scope("events"):
+            for event in pg.event.get():
+                if event.type == pg.QUIT:
+                    running = False
+                profiler.handleEvent(event)
+
+        with profiler.scope("draw"):
+            # wipe away anything from the previous frame, leaving the grid
+            scene.begin()
+            scene.add(profiler.draw(screen, (5, 5)))
+
+        # send only what changed to the screen
+        with profiler.scope("flip"):
+            scene.present()
+
+        with profiler.scope("idle"):
+            dt = clock.tick(100) / 1000
+        profiler.endFrame()
+        frame += 1
+        if frame == arguments.frames:
+            running = False
 
-    # flip() display to send work to the screen
-    pg.display.flip()
+    profiler.close()
+    pg.quit()
+    return 0
 
-    dt = clock.tick(100) / 1000
 
-pg.quit()
+if __name__ == "__main__":
+    sys.exit(main())
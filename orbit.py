@@ -2,6 +2,22 @@
 # Programmer: Connor Fricke (cd.fricke23@gmail.com)
 # Last Revision:
 #   27-MARCH-2024 --> created
+#   18-OCT-2026 --> selectable integrator for the orbitor
+#   18-OCT-2026 --> optional adaptive substepping near periapsis
+#   18-OCT-2026 --> physics moved to OrbitSimulation with fixed timesteps, headless mode (--headless)
+#   18-OCT-2026 --> trail points are copied into the trail's own buffer
+#   18-OCT-2026 --> diagnostics streamed to an on-disk telemetry recording (--telemetry) instead of growing lists
+#   18-OCT-2026 --> snapshot save/restore (--save, --load)
+#   18-OCT-2026 --> pan/zoom camera
+#   18-OCT-2026 --> per-phase frame profiler (--profile, F3 for the overlay)
+#   18-OCT-2026 --> period and eccentricity computed from the orbital elements, optional exact propagation (--kepler)
+#   18-OCT-2026 --> optional pipelined mode: physics on its own thread, interpolated drawing (--pipeline)
+#   18-OCT-2026 --> sun kept in a static layer, only changed rects presented (--full-redraw to compare)
+#   18-OCT-2026 --> optional gravitational field drawn as arrows on a grid lattice (--field)
+#   18-OCT-2026 --> importable: setup and game loop in functions, main() entry point, only the display initialized
+#   18-OCT-2026 --> angular momentum from r x v, conservation diagnostics and automatic timestep when headless
+#   18-OCT-2026 --> "unbound" shown instead of the period once the orbitor escapes
+#   18-OCT-2026 --> headless rate counts only the steps of this run, not those restored by --load
 #
 # Python script for simulation of a Keplerian orbit. Mass units are kilograms, distance units are meters (1 px = 1 m)
 # TODO:
@@ -9,30 +25,30 @@
 #   - use real values (real gravitational constant, more realistic masses and separations)
 #   - create class for writing fonts and putting text to the screen
 
+import argparse
+import sys
+
+import numpy as np
 import pygame as pg
 
 # CLASS FILES
-from Utils.trail import *
-from Utils.arrow import *
-from Utils.text import *
-from Utils.satellite import *
+from Utils.satellite import Satellite
+from Utils.trail import Trail
+from Utils.arrow import Arrow, ArrowField
+from Utils.text import Text
+from Utils.simulation import OrbitSimulation, FixedTimestep, headlessArguments, runHeadless, chooseTimestep, conservationMonitor
+from Utils.telemetry import TelemetryRecorder
+from Utils.snapshot import loadSnapshot
+from Utils.camera import Camera
+from Utils.profiler import FrameProfiler
+from Utils.pipeline import SimulationPipeline
+from Utils.scene import Scene
+from Utils.grid import Grid
+from Utils.gravity import centralAccelerations
 
 # *** INITIALIZE ***
-times = []
-velocities = []
-momentums = []
 WIDTH = 1000
 HEIGHT = 720
-pg.init()
-screen = pg.display.set_mode((WIDTH+1, HEIGHT+1))
-clock = pg.time.Clock()
-running = True
-dt = 0
-frame = 0
-simulationTime = 0
-angularMomentum = 0
-halfPeriodCounter = 0
-period = 0
 # ******************
 
 # *** COMMON VECTORS AND LOCATIONS ***
@@ -47,89 +63,254 @@ GRAV = 6.674E-11 # N m^2 kg^-2
 SUN_MASS = 6.5e15 # kg
 INITIAL_POS = center + 250*xhat
 RATE = 0.5
+INTEGRATOR = "leapfrog" # euler, leapfrog, rk4 or yoshida4, see Utils/integrators.py
+ADAPTIVE = True # subdivide each frame's step by powers of two where the orbit curves sharply
+STEP = 0.01 # real seconds per fixed physics step, each step advances the orbit by STEP * RATE
+KEPLER = False # place the orbitor on its exact two-body orbit instead of integrating, see Utils/kepler.py
+FIELD = False # draw the sun's gravitational field as arrows on a lattice, see Utils/arrow.py
+FIELD_SPACING = 40 # px between the arrows of the field
 
-# ***** INITIAL CONDITIONS *****  
-sun = Satellite(mass=SUN_MASS, radius=20.0)
-sun.setPosition(center)
-orbitor = Satellite(mass=5.0, radius=10.0)
-orbitor.position = INITIAL_POS
-orbitor.velocity = 45*yhat
-
-# *** ARROWS + TRAILS ***
-orbitorTrail1 = Trail(1575)
-orbitorTrail1.addPoint(orbitor.position.copy())
-accelArrow = Arrow(orbitor.position, orbitor.position - xhat)
-
-# *** TEXT ***
-periodData = Text()
-periodData.set_font("consolas", 12, True, False, "white")
-sunText = Text()
-sunText.set_font("consolas", 12, True, False, "white")
-sunText.text("Hello World!")
-earthText = Text()
-earthText.set_font("consolas", 12, True, False, "red")
-earthText.text("Hello Sun!") 
-# ******************
+TELEMETRY_DECIMATION = 1 # keep every n-th sample of time, speed and angular momentum
+
+
+def parseArguments(argv: list = None) -> argparse.Namespace:
+    """
+    Returns the options of orbit.py read from argv, the command line by default.
+    """
+    arguments = headlessArguments("Keplerian orbit simulation.", steps=100000, deltaTime=STEP * RATE)
+    arguments.add_argument("--telemetry", default=None, help="directory to record time, speed and angular momentum to")
+    arguments.add_argument("--kepler", action="store_true", default=KEPLER, help="use the exact two-body solution instead of integrating")
+    arguments.add_argument("--field", action="store_true", default=FIELD, help="draw the gravitational field as arrows")
+    arguments.add_argument("--full-redraw", action="store_true", help="redraw and present the whole window every frame")
+    return arguments.parse_args(argv)
+
+
+def createSimulation(kepler: bool = KEPLER, load: str = None) -> OrbitSimulation:
+    """
+    createSimulation(kepler, load):
+    parameters:
+      kepler: place the orbitor on its exact two-body orbit instead of integrating.
+      load: snapshot file to continue from, None to start from INITIAL_POS.
+    *************
+    Returns the orbit of this script, ready to step. Nothing is initialized in pygame, so it can be stepped headless
+    or from other code.
+    """
+    simulation = OrbitSimulation(center, SUN_MASS, 5.0, INITIAL_POS, 45*yhat, GRAV, integrator=INTEGRATOR,
+                                 adaptive=ADAPTIVE, kepler=kepler)
+    if load is not None:
+        simulation.restore(loadSnapshot(load))
+    return simulation
+
+
+def describeOrbit(simulation: OrbitSimulation) -> str:
+    """
+    The period and eccentricity of the orbit as shown on screen, or that it is unbound.
+    """
+    elements = simulation.elements
+    if elements is None:
+        return "Orbital Period: none, the orbit is unbound"
+    return f"Orbital Period: {round(float(elements.period), 2)} seconds, eccentricity {round(float(elements.eccentricity), 3)}"
+
+
+def captureOrbit(simulation: OrbitSimulation) -> dict:
+    # what the loop draws, read on the pipeline thread after every step
+    return {"position": np.array(simulation.orbitor.position), "acceleration": np.array(simulation.orbitor.acceleration),
+            "orbit": describeOrbit(simulation)}
+
+
+def runWindow(simulation: OrbitSimulation, arguments: argparse.Namespace, record) -> None:
+    """
+    runWindow(simulation, arguments, record):
+    parameters:
+      simulation: the orbit to show, e.g. from createSimulation().
+      arguments: the options from parseArguments().
+      record: function of the simulation called after every frame, or after every step with --pipeline.
+    *************
+    Opens the window and runs the game loop until the window is closed or arguments.frames frames have passed.
+    """
+    # only the display is started, fonts start with the first Text rendered (see Utils/text.py)
+    pg.display.init()
+    screen = pg.display.set_mode((WIDTH+1, HEIGHT+1))
+    clock = pg.time.Clock()
+    fixedStep = FixedTimestep(STEP)
+    # mouse wheel zooms, dragging pans, Home resets, see Utils/camera.py
+    camera = Camera((WIDTH+1, HEIGHT+1), center)
+    # F3 shows frame times per phase, see Utils/profiler.py
+    profiler = FrameProfiler(enabled=arguments.profile is not None, output=arguments.profile)
+    sun = simulation.sun
+    orbitor = simulation.orbitor
+
+    # with --pipeline the orbit steps on its own thread and the loop draws its latest states, see Utils/pipeline.py.
+    # Telemetry is then recorded after every step instead of every frame.
+    pipeline = None
+    if arguments.pipeline:
+        pipeline = SimulationPipeline(simulation, STEP, STEP * RATE, captureOrbit, onStep=record)
+        pipeline.start()
+        # stands in for the orbitor when drawing, since the real one belongs to the pipeline thread
+        orbitor = Satellite(radius=orbitor.RADIUS, mass=orbitor.MASS)
+        orbitor.setPosition(pg.Vector2(simulation.orbitor.position))
+        orbitor.acceleration = pg.Vector2(simulation.orbitor.acceleration)
+
+    # *** ARROWS + TRAILS ***
+    orbitorTrail1 = Trail(1575)
+    orbitorTrail1.addPoint(orbitor.position)
+    accelArrow = Arrow(orbitor.position, orbitor.position - xhat)
+
+    # *** TEXT ***
+    periodData = Text()
+    periodData.set_font("consolas", 12, True, False, "white")
+    sunText = Text()
+    sunText.set_font("consolas", 12, True, False, "white")
+    sunText.text("Hello World!")
+    earthText = Text()
+    earthText.set_font("consolas", 12, True, False, "red")
+    earthText.text("Hello Sun!")
+    # ******************
+
+    # *** SCENE ***
+    # the sun and its label only move with the camera, so they are drawn into the scene's static layer, see Utils/scene.py
+    scene = Scene(screen, "black", fullRedraw=arguments.full_redraw)
+    if arguments.field:
+        # one arrow per grid space, at the same scale as the orbitor's acceleration arrow and never longer than the spacing
+        lattice = Grid(rows=HEIGHT // FIELD_SPACING, columns=WIDTH // FIELD_SPACING, width=WIDTH, height=HEIGHT).centers()
+        gravityField = ArrowField(lattice, lattice)
+
+        def drawField(surface: pg.Surface) -> None:
+            accelerations = centralAccelerations(camera.toWorldArray(lattice), sun.position, sun.MASS, GRAV, 1.0)
+            gravityField.setVectors(lattice, accelerations, 5 * camera.zoom, maxLength=0.8 * FIELD_SPACING)
+            gravityField.draw(surface, "gray35")
+        scene.addStatic(drawField)
+    scene.addStatic(lambda surface: sun.draw(surface, "yellow", camera))
+    scene.addStatic(lambda surface: sunText.render(surface, camera.toScreen(sun.position) + 20*xhat - 20*yhat))
+    view = None
+
+    # ***** GAME LOOP *****
+    running = True
+    dt = 0
+    frame = 0
+    while running:
+        # pg.QUIT means the user closed the window
+        with profiler.scope("events"):
+            for event in pg.event.get():
+                if event.type == pg.QUIT:
+                    running = False
+                camera.handleEvent(event)
+                profiler.handleEvent(event)
+
+        # a moved camera moves the static layer too
+        if view != (tuple(camera.focus), camera.zoom):
+            view = (tuple(camera.focus), camera.zoom)
+            scene.invalidate()
+        # wipe away anything from the previous frame, leaving the static layer
+        scene.begin()
 
-# ***** GAME LOOP *****
-while running:
-    # pg.QUIT means the user closed the window
-    for event in pg.event.get():
-        if event.type == pg.QUIT:
+        # add current position of the orbitor to the Trail Satellite array every frame
+        orbitorTrail1.addPoint(orbitor.position)
+
+        # advance the orbit in as many fixed steps as fit in the last frame, or pick up the pipeline's latest state
+        with profiler.scope("physics"):
+            if pipeline is None:
+                for _ in range(fixedStep.advance(dt)):
+                    simulation.step(STEP * RATE)
+                orbit = describeOrbit(simulation)
+            else:
+                state = pipeline.frame()
+                orbitor.setPosition(pg.Vector2(*state["position"]))
+                orbitor.acceleration = pg.Vector2(*state["acceleration"])
+                orbit = state["orbit"]
+
+        # orbitor.acceleration is kept up to date by the simulation, so we can decide how to draw the acceleration arrow
+        accelArrow.update(camera.toScreen(orbitor.position), camera.toScreen(orbitor.position) + orbitor.acceleration*5)
+
+        # ***** RENDER THE GAME HERE *****
+        with profiler.scope("draw"):
+            scene.add(orbitorTrail1.aadraw(screen, "white", 1, camera))
+            scene.add(orbitor.draw(screen, "blue", camera))
+            scene.add(accelArrow.draw(screen, "white", 3))
+
+            # Render text
+            periodData.text(orbit)
+            scene.add(periodData.render(screen, 20*xhat + 20*yhat))
+            scene.add(earthText.render(screen, camera.toScreen(orbitor.position) + 20*xhat - 20*yhat))
+            scene.add(profiler.draw(screen, 20*xhat + 40*yhat))
+
+        # send only what changed to the screen
+        with profiler.scope("flip"):
+            scene.present()
+
+        # limit fps
+        with profiler.scope("idle"):
+            dt = clock.tick(100) / 1000
+        profiler.endFrame()
+
+        frame += 1
+        if frame == arguments.frames:
             running = False
-    
-    # wipe away anything from the previous frame
-    screen.fill("black")
-
-    # add current position of the orbitor to the Trail Satellite array every frame
-    currentPosition1 = orbitor.position.copy()
-    orbitorTrail1.addPoint(currentPosition1)
-
-    # CALCULATE FORCES
-    # force points from circle position to the center
-    radius = (orbitor.position - sun.position)
-    rhat = radius / radius.magnitude()
-    # a = GM/r^2
-    orbitor.acceleration = -((GRAV * sun.MASS) / (radius.magnitude() * radius.magnitude())) * rhat
-
-    # L = mvr
-    angularMomentum = orbitor.MASS * orbitor.velocity.magnitude() * radius.magnitude()
-
-    # once we have the acceleration, we can decide how to draw the acceleration arrow
-    accelArrow.update(orbitor.position, orbitor.position + orbitor.acceleration*5)
-
-    # update acceleration, velocity, and position of each orbitor (NOT the sun... assuming Keplerian Limit M >> m)
-    vBefore = orbitor.velocity.copy()
-    orbitor.update(RATE*dt)
-    vAfter = orbitor.velocity.copy()
-    if (vBefore.x*vAfter.x < 0):
-        halfPeriodCounter += 1
-        period = simulationTime * 2 / halfPeriodCounter
-
-    # ***** RENDER THE GAME HERE *****
-    orbitorTrail1.aadraw(screen, "white", 1)
-    orbitor.draw(screen, "blue")
-    sun.draw(screen, "yellow")
-    accelArrow.draw(screen, "white", 3)
-
-    # Render text
-    periodData.text(f"Orbital Period: {round(period, 2)} seconds" + (" (Calculating...)" if period == 0 else ""))
-    periodData.render(screen, 20*xhat + 20*yhat)
-    sunText.render(screen, sun.position + 20*xhat - 20*yhat)
-    earthText.render(screen, orbitor.position + 20*xhat - 20*yhat)
-
-    # flip() display to send work to the screen
-    pg.display.flip()
-
-    # limit fps
-    dt = clock.tick(100) / 1000
-
-    simulationTime += dt * RATE
-    frame += 1
-    times.append(simulationTime)
-    velocities.append(orbitor.velocity.magnitude())
-    momentums.append(angularMomentum)
-
-pg.quit()
-# ******************
+        if pipeline is None:
+            record(simulation)
+
+    if pipeline is not None:
+        pipeline.stop()
+    profiler.close()
+
+
+def main(argv: list = None) -> int:
+    arguments = parseArguments(argv)
+    # ***** INITIAL CONDITIONS *****
+    simulation = createSimulation(arguments.kepler, arguments.load)
+
+    # *** TELEMETRY ***
+    telemetry = None
+    if arguments.telemetry is not None:
+        telemetry = TelemetryRecorder(arguments.telemetry, ["time", "velocity", "angularMomentum"], decimation=TELEMETRY_DECIMATION)
+
+    def recordTelemetry(simulation: OrbitSimulation) -> None:
+        if telemetry is not None:
+            telemetry.record(simulation.time, simulation.orbitor.velocity.magnitude(), simulation.angularMomentum)
+
+    # *** HEADLESS RUN ***
+    if arguments.headless:
+        try:
+            steps, deltaTime = chooseTimestep(arguments, lambda: createSimulation(arguments.kepler, arguments.load))
+        except ValueError as error:
+            print(error)
+            return 1
+        # energy and angular momentum are checked every --diagnostics steps, see Utils/diagnostics.py
+        monitor = conservationMonitor(arguments)
+        if monitor is not None:
+            monitor.sample(simulation)
+
+        def onStep(simulation: OrbitSimulation) -> None:
+            recordTelemetry(simulation)
+            if monitor is not None:
+                monitor(simulation)
+
+        # after --load, simulation.steps also counts the snapshot's steps, which this run did not take
+        startSteps = simulation.steps
+        elapsed = runHeadless(simulation, steps, deltaTime, onStep=onStep)
+        taken = simulation.steps - startSteps
+        print("{} steps of {} s in {:.3f} s ({:.1f} steps/s)".format(taken, deltaTime, elapsed, taken / elapsed))
+        if startSteps:
+            print("Resumed at step {}, now at step {} (t = {:.6f} s)".format(startSteps, simulation.steps, simulation.time))
+        elements = simulation.elements
+        if elements is None:
+            print("Orbit: unbound, final position: ({:.6f}, {:.6f})".format(simulation.orbitor.position.x, simulation.orbitor.position.y))
+        else:
+            print("Orbital period: {:.6f} s, eccentricity: {:.6f}, final position: ({:.6f}, {:.6f})".format(
+                elements.period, elements.eccentricity, simulation.orbitor.position.x, simulation.orbitor.position.y))
+        if monitor is not None:
+            monitor.sample(simulation)
+            print(monitor.summary())
+    else:
+        runWindow(simulation, arguments, recordTelemetry)
+
+    if telemetry is not None:
+        telemetry.close()
+    if arguments.save is not None:
+        simulation.save(arguments.save)
+    pg.quit()
+    return 0
+
 
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# File: sweep.py
+# Programmer: Connor Fricke (cd.fricke23@gmail.com)
+# Last Revision:
+#   18-OCT-2026 --> Created, parameter sweeps of the orbit and the belt over a process pool
+#   18-OCT-2026 --> progress counts done points by simulation, parameters and seed
+#
+# Runs the headless orbit or belt simulation for every point of a parameter design, several at a time in worker
+# processes, and appends one line of JSON per finished point to a results file (see Utils/sweep.py). Running the
+# same command again with the same results file only runs the points that are missing, so a sweep can be
+# interrupted with Ctrl+C and resumed.
+#
+# Parameters are the keys of ORBIT_DEFAULTS and BELT_DEFAULTS in Utils/sweep.py; anything not given keeps the
+# scripts' value.
+#
+# Usage:
+#   python sweep.py orbit --grid speed=40,45,50 distance=200,250,300
+#   python sweep.py orbit --grid integrator=euler,leapfrog,rk4 dt=0.005,0.05 adaptive=false
+#   python sweep.py belt --random stellarMass=3e31:1e32 speed=30:40 --samples 50 --grid count=5000 steps=2000
+#   python sweep.py belt --grid distribution=ring,kepler --output belt.jsonl --workers 4
+#   python sweep.py belt --grid count=1000 --restart   start the results file over instead of resuming it
+
+import argparse
+import os
+import sys
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from Utils.sweep import SIMULATIONS, gridDesign, randomDesign, pointKey, pointSeed, finishedPoints, runSweep
+
+
+def parseValue(text: str):
+    """A value from the command line as a bool, int, float or, failing those, str."""
+    if text.lower() in ("true", "false"):
+        return text.lower() == "true"
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parseAssignments(assignments: list, ranges: bool = False) -> dict:
+    """
+    Turns NAME=v1,v2,... assignments into a dict of lists of values. With ranges, NAME=low:high becomes a
+    (low, high) tuple instead.
+    """
+    parsed = {}
+    for assignment in assignments:
+        name, separator, values = assignment.partition("=")
+        if not separator or not values:
+            raise argparse.ArgumentTypeError("expected NAME=VALUES, got '{}'".format(assignment))
+        if ranges and ":" in values:
+            low, high = values.split(":")
+            parsed[name] = (float(low), float(high))
+        else:
+            parsed[name] = [parseValue(value) for value in values.split(",")]
+    return parsed
+
+
+def describe(record: dict) -> str:
+    parameters = " ".join("{}={}".format(name, value) for name, value in record["parameters"].items())
+    if "error" in record:
+        return "{} -> {}".format(parameters, record["error"])
+    metrics = " ".join("{}={:.6g}".format(name, value) if isinstance(value, float) else "{}={}".format(name, value)
+                       for name, value in record["metrics"].items())
+    return "{} -> {}".format(parameters, metrics)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Parameter sweeps of the orbit and asteroid belt simulations.")
+    parser.add_argument("simulation", choices=tuple(SIMULATIONS), help="which simulation to sweep")
+    parser.add_argument("--grid", nargs="+", default=[], metavar="NAME=V1,V2",
+                        help="values to try for a parameter, every combination is run")
+    parser.add_argument("--random", nargs="+", default=[], metavar="NAME=LOW:HIGH",
+                        help="ranges (or comma separated choices) to sample a parameter from, see --samples")
+    parser.add_argument("--samples", type=int, default=20, help="number of random points, with --random")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random design and of every point")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes, 1 runs in this process")
+    parser.add_argument("--output", default=None, help="results file, sweep_<simulation>.jsonl by default")
+    parser.add_argument("--restart", action="store_true", help="start the results file over instead of resuming")
+    arguments = parser.parse_args()
+
+    try:
+        grid = parseAssignments(arguments.grid)
+        ranges = parseAssignments(arguments.random, ranges=True)
+    except (argparse.ArgumentTypeError, ValueError) as error:
+        parser.error(str(error))
+    # random points, each combined with every point of the grid (fixed values are a grid of one)
+    design = gridDesign(grid)
+    if ranges:
+        design = [dict(point, **sample) for sample in randomDesign(ranges, arguments.samples, arguments.seed)
+                  for point in design]
+    output = arguments.output or "sweep_{}.jsonl".format(arguments.simulation)
+
+    # progress counts the points already in the results file as done
+    finished = set() if arguments.restart else finishedPoints(output)
+    done = [sum(pointKey(arguments.simulation, point, pointSeed(arguments.seed, index)) in finished
+                for index, point in enumerate(design))]
+
+    def report(record: dict) -> None:
+        done[0] += 1
+        print("[{}/{}] {}".format(done[0], len(design), describe(record)), flush=True)
+
+    print("{} points of {}, results in {}".format(len(design), arguments.simulation, output), flush=True)
+    try:
+        ran = runSweep(arguments.simulation, design, output, arguments.workers, arguments.seed,
+                       resume=not arguments.restart, onRecord=report)
+    except KeyboardInterrupt:
+        print("\nInterrupted, rerun the same command to resume")
+        return 130
+    print("{} points run, {} already in {}".format(ran, len(design) - ran, output))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())